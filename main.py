@@ -4,6 +4,7 @@ Pi Camera Integration System - Main Entry Point
 Handles continuous capture mode with health monitoring and graceful shutdown
 """
 
+import argparse
 import sys
 import os
 
@@ -20,10 +21,14 @@ from utils.file_manager import FileManager
 
 def main():
     """Main entry point for continuous capture mode"""
+    parser = argparse.ArgumentParser(description="Pi Camera continuous capture")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    args = parser.parse_args()
+    
     try:
         # Load configuration
         print("Loading configuration...")
-        config = Config()
+        config = Config(args.config)
         config_dict = config.get_all()
         
         # Print configuration summary
@@ -33,8 +38,164 @@ def main():
         print("\nInitializing system components...")
         logger = Logger(config_dict)
         file_manager = FileManager(config_dict, logger)
-        camera = CameraInterface(config_dict, logger)
-        health_check = HealthCheck(config_dict, logger, camera)
+        
+        # Scripted faults instead of hardware (failure simulations)
+        if config.get('simulation.enabled', False):
+            from app.fault_camera import FaultInjectionCamera
+            camera = FaultInjectionCamera(config_dict, logger)
+        else:
+            camera = CameraInterface(config_dict, logger)
+        
+        # Optional adaptive retry (latency-based timeouts, backoff, circuit breaker)
+        retry_policy = None
+        if config.get('retry.adaptive', False):
+            from app.retry_policy import RetryPolicy
+            retry_policy = RetryPolicy(config_dict, logger)
+        
+        # Optional load shedding (lower quality/resolution/rate under pressure)
+        load_shedder = None
+        if config.get('load_shedding.enabled', False):
+            from app.load_shedder import LoadShedder
+            load_shedder = LoadShedder(config_dict, logger, camera)
+        
+        # Optional calendar schedule (replaces the fixed capture interval)
+        scheduler = None
+        if config.get('schedule.enabled', False):
+            from app.scheduler import Scheduler
+            scheduler = Scheduler(config_dict, logger)
+        
+        # Optional persisted record of captured and missed slots
+        coverage = None
+        if config.get('coverage.enabled', False):
+            from app.coverage import CoverageIndex
+            coverage = CoverageIndex(config_dict, logger, scheduler)
+        
+        # Optional frame quality gate (blank, black or blown-out frames)
+        quality_gate = None
+        if config.get('frame_quality.enabled', False):
+            from app.quality_gate import QualityGate
+            quality_gate = QualityGate(config_dict, logger)
+        
+        health_check = HealthCheck(
+            config_dict,
+            logger,
+            camera,
+            circuit_breaker=retry_policy.breaker if retry_policy else None,
+            load_shedder=load_shedder,
+            coverage=coverage,
+            quality_gate=quality_gate
+        )
+        
+        # Optional components below are imported only when enabled (keeps startup fast)
+        
+        # Optional background uploader
+        uploader = None
+        if config.get('upload.enabled', False):
+            from app.uploader import Uploader
+            uploader = Uploader(config_dict, logger)
+        
+        # Optional live stream (one capture stream shared by all viewers)
+        frame_stream = None
+        stream_server = None
+        if config.get('stream.enabled', False):
+            from app.frame_stream import FrameStream
+            from app.stream_server import StreamServer
+            frame_stream = FrameStream(config_dict, logger, camera)
+            stream_server = StreamServer(config_dict, logger, frame_stream)
+        
+        # Optional pre/post-event buffer (needs the full-rate frame stream)
+        event_buffer = None
+        if config.get('events.enabled', False):
+            from app.event_buffer import EventBuffer
+            if frame_stream is None:
+                from app.frame_stream import FrameStream
+                frame_stream = FrameStream(config_dict, logger, camera)
+            event_buffer = EventBuffer(config_dict, logger, frame_stream)
+        
+        # High-rate capture takes its frames from the stream (fswebcam can't keep up)
+        if config.get('high_rate.enabled', False):
+            if frame_stream is None:
+                from app.frame_stream import FrameStream
+                frame_stream = FrameStream(config_dict, logger, camera)
+            frame_stream.fps = max(frame_stream.fps, config.get('high_rate.fps', 10))
+        
+        # Optional per-frame catalog
+        catalog = None
+        if config.get('catalog.enabled', False):
+            from utils.catalog import CaptureCatalog
+            catalog = CaptureCatalog(config_dict, logger)
+        
+        # Optional binary journal of every capture attempt
+        journal = None
+        if config.get('event_journal.enabled', False):
+            from utils.event_journal import EventJournal
+            journal = EventJournal(config_dict, logger)
+        
+        # Optional in-memory latest-frame cache with snapshot endpoint
+        frame_cache = None
+        snapshot_server = None
+        if config.get('snapshot.enabled', False):
+            from app.snapshot_server import SnapshotServer
+            from utils.frame_cache import FrameCache
+            frame_cache = FrameCache(config.get('snapshot.cache_frames', 3))
+            snapshot_server = SnapshotServer(config_dict, logger, frame_cache)
+        
+        # Optional fast start (reuse last successful validation)
+        validation_cache = None
+        if config.get('startup.fast_start', False):
+            from app.validation_cache import ValidationCache
+            validation_cache = ValidationCache(config_dict, logger)
+        
+        # Optional hotplug monitor (pause on removal, resume on reattach)
+        device_monitor = None
+        if config.get('hotplug.enabled', False):
+            from app.device_monitor import DeviceMonitor
+            device_monitor = DeviceMonitor(config_dict, logger, camera, health_check)
+        
+        # Optional extra renditions derived from each capture
+        renditions = None
+        if config.get('capture.outputs'):
+            from app.renditions import RenditionEncoder
+            renditions = RenditionEncoder(config_dict, logger)
+        
+        # Optional background tiering of aging captures
+        tiering = None
+        if config.get('tiering.enabled', False):
+            from app.tiering import StorageTiering
+            tiering = StorageTiering(config_dict, logger, uploader, catalog)
+        
+        # Optional fleet agent (metrics and catalog deltas to the fleet aggregator)
+        fleet_agent = None
+        if config.get('fleet.enabled', False):
+            from app.fleet_agent import FleetAgent
+            fleet_agent = FleetAgent(config_dict, logger, health_check, catalog)
+        
+        # Optional hot reload (SIGHUP or config file change)
+        config_reloader = None
+        if config.get('reload.enabled', False):
+            from app.config_reloader import ConfigReloader
+            config_reloader = ConfigReloader(config, logger, {
+                'camera': camera,
+                'file_manager': file_manager,
+                'logger': logger,
+                'health': health_check,
+                'scheduler': scheduler,
+                'renditions': renditions,
+                'load_shedder': load_shedder,
+                'coverage': coverage,
+                'quality_gate': quality_gate
+            })
+        
+        # Heartbeat and metrics for the supervisor (set when run as a supervised worker)
+        metrics_publisher = None
+        if os.environ.get('PICAM_METRICS_SHM'):
+            from app.shared_metrics import MetricsPublisher
+            metrics_publisher = MetricsPublisher(
+                os.environ['PICAM_METRICS_SHM'],
+                int(os.environ.get('PICAM_METRICS_SLOT', 0)),
+                health_check,
+                float(os.environ.get('PICAM_HEARTBEAT_INTERVAL', 5))
+            )
         
         # Create capture system
         capture_system = CaptureSystem(
@@ -42,7 +203,22 @@ def main():
             logger,
             camera,
             file_manager,
-            health_check
+            health_check,
+            uploader=uploader,
+            frame_stream=frame_stream,
+            frame_cache=frame_cache,
+            validation_cache=validation_cache,
+            device_monitor=device_monitor,
+            retry_policy=retry_policy,
+            config_reloader=config_reloader,
+            scheduler=scheduler,
+            renditions=renditions,
+            metrics_publisher=metrics_publisher,
+            load_shedder=load_shedder,
+            coverage=coverage,
+            quality_gate=quality_gate,
+            catalog=catalog,
+            journal=journal
         )
         
         # Validate system
@@ -57,8 +233,55 @@ def main():
         print("\nStarting continuous capture mode...")
         print("Press Ctrl+C to stop\n")
         
+        if uploader:
+            uploader.start()
+        
+        if frame_stream:
+            frame_stream.start()
+        
+        if stream_server:
+            stream_server.start()
+        
+        if event_buffer:
+            event_buffer.start()
+        
+        if snapshot_server:
+            snapshot_server.start()
+        
+        if device_monitor:
+            device_monitor.start()
+        
+        if tiering:
+            tiering.start()
+        
+        if fleet_agent:
+            fleet_agent.start()
+        
+        if config_reloader:
+            config_reloader.components['capture'] = capture_system
+            config_reloader.on_pending = capture_system.wake
+            config_reloader.start()
+        
         # Run continuous capture
-        capture_system.run_continuous()
+        try:
+            capture_system.run_continuous()
+        finally:
+            if event_buffer:
+                event_buffer.stop()
+            if stream_server:
+                stream_server.stop()
+            if frame_stream:
+                frame_stream.stop()
+            if snapshot_server:
+                snapshot_server.stop()
+            if device_monitor:
+                device_monitor.stop()
+            if tiering:
+                tiering.stop()
+            if fleet_agent:
+                fleet_agent.stop()
+            if config_reloader:
+                config_reloader.stop()
     
     except KeyboardInterrupt:
         print("\n\nShutdown requested by user")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Capture Store Audit
+Checks every stored JPEG's marker structure in parallel and reports corrupt files
+
+Usage: python3 scripts/audit_captures.py [--dir ./captures] [--workers 4] [--quarantine ./bad]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import time
+from collections import Counter
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.jpeg_validator import audit_files
+
+
+def find_jpegs(directory, recursive):
+    """Yield JPEG paths under a directory"""
+    if recursive:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.lower().endswith(('.jpg', '.jpeg')):
+                    yield os.path.join(root, name)
+    else:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(('.jpg', '.jpeg')):
+                    yield entry.path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit stored captures for corrupt JPEGs")
+    parser.add_argument('--dir', default='./captures', help="Capture directory")
+    parser.add_argument('--recursive', action='store_true', help="Include subdirectories")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument('--quarantine', default=None, help="Move corrupt files into this directory")
+    parser.add_argument('--quiet', action='store_true', help="Only print the summary")
+    args = parser.parse_args()
+    
+    if not os.path.isdir(args.dir):
+        print(f"Not a directory: {args.dir}")
+        sys.exit(1)
+    
+    if args.quarantine:
+        os.makedirs(args.quarantine, exist_ok=True)
+    
+    started = time.monotonic()
+    checked = 0
+    reasons = Counter()
+    
+    for path, valid, reason in audit_files(find_jpegs(args.dir, args.recursive), args.workers):
+        checked += 1
+        if valid:
+            continue
+        
+        reasons[reason] += 1
+        if not args.quiet:
+            print(f"CORRUPT  {path}  ({reason})")
+        
+        if args.quarantine:
+            shutil.move(path, os.path.join(args.quarantine, os.path.basename(path)))
+    
+    elapsed = time.monotonic() - started
+    corrupt = sum(reasons.values())
+    rate = checked / elapsed if elapsed > 0 else 0
+    
+    print(f"\nChecked {checked} files in {elapsed:.2f}s ({rate:.0f} files/s)")
+    print(f"Corrupt: {corrupt}")
+    for reason, count in reasons.most_common():
+        print(f"  {count:6d}  {reason}")
+    
+    sys.exit(1 if corrupt else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Ring Store Benchmark
+Compares the ring store against one-file-per-frame storage at steady state
+(keeping the last N frames, so every write also retires the oldest frame)
+
+Usage: python3 scripts/bench_ring_store.py [--dir /tmp/ringbench] [--frames 2000] [--keep 500] [--size-kb 200]
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+from collections import deque
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.ring_store import RingStore
+
+
+def summarize(label, samples, frames_bytes):
+    """Print throughput and latency percentiles"""
+    samples.sort()
+    total = sum(samples)
+    print(
+        f"{label:<22} {len(samples) / total:8.0f} frames/s  {frames_bytes / total / 1e6:7.1f} MB/s  "
+        f"p50 {statistics.median(samples) * 1e6:7.0f}us  "
+        f"p99 {samples[int(len(samples) * 0.99) - 1] * 1e6:7.0f}us"
+    )
+
+
+def bench_files(directory, frame, frames, keep, fsync):
+    """One file per frame, deleting the oldest beyond keep"""
+    os.makedirs(directory, exist_ok=True)
+    kept = deque()
+    samples = []
+    
+    for i in range(frames):
+        started = time.perf_counter()
+        
+        path = os.path.join(directory, f"img_{i:08d}.jpg")
+        with open(path, 'wb') as f:
+            f.write(frame)
+            if fsync:
+                os.fsync(f.fileno())
+        
+        kept.append(path)
+        if len(kept) > keep:
+            os.remove(kept.popleft())
+        
+        samples.append(time.perf_counter() - started)
+    
+    return samples
+
+
+def bench_ring(path, frame, frames, keep, slot_size, sync):
+    """Append into a preallocated ring of keep slots"""
+    ring = RingStore(path, keep, slot_size, sync=sync)
+    samples = []
+    
+    try:
+        for i in range(frames):
+            started = time.perf_counter()
+            ring.append(frame, f"img_{i:08d}.jpg")
+            samples.append(time.perf_counter() - started)
+    finally:
+        ring.close()
+    
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ring store vs file-per-frame")
+    parser.add_argument('--dir', default='/tmp/ringbench', help="Scratch directory (removed afterwards)")
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--keep', type=int, default=500, help="Frames retained")
+    parser.add_argument('--size-kb', type=int, default=200, help="Frame size")
+    parser.add_argument('--durable', action='store_true', help="fsync files / msync ring on every frame")
+    args = parser.parse_args()
+    
+    frame = os.urandom(args.size_kb * 1024)
+    frames_bytes = len(frame) * args.frames
+    slot_size = (args.size_kb + 64) * 1024
+    
+    shutil.rmtree(args.dir, ignore_errors=True)
+    os.makedirs(args.dir)
+    
+    try:
+        print(f"{args.frames} frames of {args.size_kb} KB, keeping {args.keep}, durable={args.durable}\n")
+        
+        samples = bench_files(os.path.join(args.dir, 'files'), frame, args.frames, args.keep, args.durable)
+        summarize("file per frame", samples, frames_bytes)
+        
+        # Preallocation happens once at startup and is not part of the per-frame cost
+        ring_path = os.path.join(args.dir, 'frames.ring')
+        started = time.perf_counter()
+        RingStore(ring_path, args.keep, slot_size).close()
+        print(f"{'ring preallocation':<22} {time.perf_counter() - started:8.3f}s (one time)")
+        
+        samples = bench_ring(ring_path, frame, args.frames, args.keep, slot_size, args.durable)
+        summarize("ring store", samples, frames_bytes)
+    
+    finally:
+        shutil.rmtree(args.dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
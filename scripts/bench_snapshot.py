@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Snapshot Endpoint Benchmark
+Hammers the snapshot endpoint with many concurrent pollers and reports
+requests/sec and latency percentiles
+
+Usage:
+  python3 scripts/bench_snapshot.py                       # in-process server, synthetic frame
+  python3 scripts/bench_snapshot.py --url http://127.0.0.1:8081/snapshot
+"""
+
+import argparse
+import http.client
+import os
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.snapshot_server import SnapshotServer
+from utils.frame_cache import FrameCache
+
+
+class _QuietLogger:
+    """Minimal logger for the in-process server"""
+    
+    def __getattr__(self, name):
+        return lambda message: None
+
+
+def poller(host, port, path, duration, conditional, results):
+    """Poll the endpoint on one keep-alive connection"""
+    conn = http.client.HTTPConnection(host, port, timeout=10)
+    etag = None
+    latencies = []
+    statuses = {}
+    deadline = time.perf_counter() + duration
+    
+    while time.perf_counter() < deadline:
+        headers = {'If-None-Match': etag} if (conditional and etag) else {}
+        started = time.perf_counter()
+        conn.request('GET', path, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status] = statuses.get(response.status, 0) + 1
+        etag = response.getheader('ETag', etag)
+    
+    conn.close()
+    results.append((latencies, statuses))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the snapshot endpoint")
+    parser.add_argument('--url', help="Existing endpoint (default: start an in-process server)")
+    parser.add_argument('--clients', type=int, default=50, help="Concurrent pollers")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds to run")
+    parser.add_argument('--frame-kb', type=int, default=150, help="Synthetic frame size")
+    parser.add_argument('--no-etag', action='store_true', help="Disable If-None-Match")
+    args = parser.parse_args()
+    
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port, path = parts.hostname, parts.port or 80, parts.path
+    else:
+        cache = FrameCache(1)
+        cache.put(b'\xff\xd8' + os.urandom(args.frame_kb * 1024) + b'\xff\xd9', 'synthetic.jpg')
+        server = SnapshotServer({'snapshot': {'port': 0}}, _QuietLogger(), cache)
+        server.start()
+        host, port, path = '127.0.0.1', server.server_port(), '/snapshot'
+    
+    results = []
+    threads = [
+        threading.Thread(
+            target=poller,
+            args=(host, port, path, args.duration, not args.no_etag, results)
+        )
+        for _ in range(args.clients)
+    ]
+    
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    
+    latencies = sorted(l for lat, _ in results for l in lat)
+    statuses = {}
+    for _, counts in results:
+        for status, count in counts.items():
+            statuses[status] = statuses.get(status, 0) + count
+    
+    def percentile(p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+    
+    print("="*50)
+    print("Snapshot Benchmark")
+    print("="*50)
+    print(f"Clients: {args.clients}  Duration: {elapsed:.1f}s  ETag: {not args.no_etag}")
+    print(f"Requests: {len(latencies)}  Statuses: {statuses}")
+    print(f"Requests/sec: {len(latencies) / elapsed:.0f}")
+    print(f"Latency p50: {percentile(0.50):.2f} ms  p99: {percentile(0.99):.2f} ms  "
+          f"max: {latencies[-1] * 1000:.2f} ms")
+    print("="*50)
+    
+    if server:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - High-Rate Capture Benchmark
+Measures the per-frame cost of the real capture path (naming, verification,
+logging, catalog, optional quality gate) and runs the fixed-rate loop at a
+target frame rate. Frames come from an in-memory source standing in for the
+live stream, so only the system's own overhead is measured.
+
+Usage: python3 scripts/benchmark_high_rate.py [--fps 30] [--seconds 10] [--frames 2000]
+                                              [--quality-gate] [--dir path] [--profile]
+"""
+
+import argparse
+import copy
+import io
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from PIL import Image
+
+from app.capture import CaptureSystem
+from app.config import Config
+from app.fault_camera import FaultInjectionCamera
+from app.health_check import HealthCheck
+from utils.catalog import CaptureCatalog
+from utils.file_manager import FileManager
+from utils.logger import Logger
+
+
+class SyntheticStream:
+    """Stands in for FrameStream: every capture writes the same encoded frame at once"""
+    
+    def __init__(self, size, quality):
+        image = Image.linear_gradient('L').resize(size).convert('RGB')
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=quality)
+        self.frame = buffer.getvalue()
+    
+    def is_running(self):
+        return True
+    
+    def capture_image(self, output_path, timeout=None):
+        with open(output_path, 'wb') as f:
+            f.write(self.frame)
+        return (True, None)
+
+
+def build_config(args, root):
+    """High-rate config pointing every path at a scratch directory"""
+    config = copy.deepcopy(Config(args.config).get_all())
+    
+    config['files']['capture_dir'] = os.path.join(root, 'captures')
+    config['files']['log_dir'] = os.path.join(root, 'logs')
+    config['files']['storage'] = 'files'
+    config['camera']['warmup_delay'] = 0
+    config['camera']['warmup_mode'] = 'delay'
+    config['capture'].pop('outputs', None)
+    config['logging']['console_output'] = False
+    config['simulation'] = {'faults': [], 'realtime': False, 'base_latency': 0}
+    config['high_rate'] = dict(config.get('high_rate') or {}, enabled=True, fps=args.fps)
+    config['catalog'] = dict(config.get('catalog') or {}, enabled=True)
+    config['frame_quality'] = dict(config.get('frame_quality') or {}, enabled=args.quality_gate)
+    
+    return config
+
+
+def build_system(config, stream):
+    """Capture system wired like main.py for high-rate mode"""
+    logger = Logger(config)
+    camera = FaultInjectionCamera(config, logger)
+    file_manager = FileManager(config, logger)
+    catalog = CaptureCatalog(config, logger)
+    
+    quality_gate = None
+    if config['frame_quality']['enabled']:
+        from app.quality_gate import QualityGate
+        quality_gate = QualityGate(config, logger)
+    
+    health = HealthCheck(config, logger, camera, quality_gate=quality_gate)
+    system = CaptureSystem(config, logger, camera, file_manager, health, frame_stream=stream,
+                           quality_gate=quality_gate, catalog=catalog)
+    return system, catalog
+
+
+def measure_overhead(system, frames, profile):
+    """Back-to-back captures: the cost of one frame with no pacing"""
+    if profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.enable()
+    
+    started = time.perf_counter()
+    for _ in range(frames):
+        system.capture_with_retry()
+    elapsed = time.perf_counter() - started
+    
+    if profile:
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(15)
+    
+    return elapsed / frames
+
+
+def run_paced(system, catalog, seconds):
+    """Run the real loop at the configured rate and read frame times back from the catalog"""
+    first_seq = system.file_manager.seq
+    timer = threading.Timer(seconds, system.stop)
+    timer.start()
+    
+    started = time.perf_counter()
+    system.run_continuous()
+    elapsed = time.perf_counter() - started
+    timer.join()
+    
+    times = [entry['time'] for entry in catalog.entries() if entry['seq'] > first_seq]
+    gaps = sorted(b - a for a, b in zip(times, times[1:]))
+    return elapsed, times, gaps
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark high-rate capture overhead")
+    parser.add_argument('--fps', type=float, default=30, help="Target frame rate for the paced run")
+    parser.add_argument('--seconds', type=float, default=10, help="Length of the paced run")
+    parser.add_argument('--frames', type=int, default=2000, help="Frames for the unpaced overhead run")
+    parser.add_argument('--size', default='1280x720', help="Synthetic frame size")
+    parser.add_argument('--quality-gate', action='store_true', help="Include the frame quality gate")
+    parser.add_argument('--profile', action='store_true', help="Profile the overhead run")
+    parser.add_argument('--dir', default=None, help="Scratch directory (default: RAM-backed temp dir)")
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch directory")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    args = parser.parse_args()
+    
+    root = args.dir or tempfile.mkdtemp(prefix='picam_rate_', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    config = build_config(args, root)
+    width, height = (int(v) for v in args.size.lower().split('x'))
+    stream = SyntheticStream((width, height), config['capture']['quality'])
+    
+    system, catalog = build_system(config, stream)
+    
+    try:
+        per_frame = measure_overhead(system, args.frames, args.profile)
+        print(f"Frame: {args.size}, {len(stream.frame) / 1024:.0f} KB"
+              f"{', quality gate on' if args.quality_gate else ''}")
+        print(f"Per-frame overhead: {per_frame * 1e6:.0f} us ({1 / per_frame:.0f} fps sustainable, "
+              f"{args.frames} frames)")
+        
+        elapsed, times, gaps = run_paced(system, catalog, args.seconds)
+        files = len(os.listdir(config['files']['capture_dir']))
+        
+        print(f"\nPaced run at {args.fps:g} fps for {elapsed:.1f}s:")
+        print(f"  frames        {len(times)} ({len(times) / elapsed:.1f} fps achieved)")
+        if gaps:
+            period = 1 / args.fps
+            print(f"  frame spacing median {gaps[len(gaps) // 2] * 1000:.1f} ms, "
+                  f"p99 {gaps[int(len(gaps) * 0.99)] * 1000:.1f} ms (target {period * 1000:.1f} ms)")
+        print(f"  late starts   {system.overruns}")
+        print(f"  files         {files} for {system.health.successful_captures} frames "
+              f"({system.file_manager.collisions} name collisions avoided)")
+    
+    finally:
+        catalog.close()
+        if not args.keep and not args.dir:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Coverage Report
+Answers "which scheduled captures were missed" from the coverage index
+
+Usage:
+  python3 scripts/coverage_report.py gaps    [--min 60] [--days 30] [--json]
+  python3 scripts/coverage_report.py summary [--days 30] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.config import Config
+from app.coverage import CoverageIndex
+
+
+class _QuietLogger:
+    """The index only logs at runtime; reports need no log files"""
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def stamp(value):
+    """Format a Unix time for display"""
+    return datetime.fromtimestamp(value).strftime('%Y-%m-%d %H:%M:%S') if value else 'now'
+
+
+def print_gaps(gaps):
+    """Human-readable gap list"""
+    if not gaps:
+        print("No gaps")
+        return
+    
+    for gap in gaps:
+        print(f"  {stamp(gap['start'])} -> {stamp(gap['end'])}  "
+              f"{timedelta(seconds=int(gap['seconds']))}  ({gap['missed']} slots missed)")
+    
+    total = sum(gap['seconds'] for gap in gaps)
+    print(f"\n{len(gaps)} gaps, {timedelta(seconds=int(total))} without a capture")
+
+
+def print_summary(index, since, days):
+    """Per-day and overall expected versus captured slots"""
+    midnight = datetime.fromtimestamp(time.time()).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    print(f"{'day':<12} {'expected':>9} {'captured':>9} {'missed':>7} {'coverage':>9}")
+    for offset in range(days - 1, -1, -1):
+        start = midnight - timedelta(days=offset)
+        day = index.summary(start.timestamp(), (start + timedelta(days=1)).timestamp())
+        if day['expected']:
+            print(f"{start:%Y-%m-%d}   {day['expected']:>9} {day['captured']:>9} "
+                  f"{day['missed']:>7} {day['coverage_percent']:>8}%")
+    
+    total = index.summary(since)
+    print(f"\n{'total':<12} {total['expected']:>9} {total['captured']:>9} "
+          f"{total['missed']:>7} {total['coverage_percent']:>8}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the capture coverage index")
+    parser.add_argument('command', choices=['gaps', 'summary'])
+    parser.add_argument('--min', type=float, default=60, help="Shortest gap to list, in seconds")
+    parser.add_argument('--days', type=int, default=30, help="How far back to look")
+    parser.add_argument('--index', default=None, help="Index file (default: from config)")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    parser.add_argument('--json', action='store_true', help="Print JSON")
+    args = parser.parse_args()
+    
+    config = Config(args.config).get_all()
+    if args.index:
+        config.setdefault('coverage', {})['index_file'] = args.index
+    
+    # Read-only: safe to run while the capture loop is recording
+    index = CoverageIndex(config, _QuietLogger(), readonly=True)
+    if not os.path.exists(index.index_file):
+        print(f"No coverage index at {index.index_file} (is coverage.enabled set?)")
+        sys.exit(1)
+    
+    since = time.time() - args.days * 86400
+    
+    if args.command == 'gaps':
+        started = time.perf_counter()
+        gaps = index.gaps(args.min, since)
+        elapsed = time.perf_counter() - started
+        
+        if args.json:
+            print(json.dumps(gaps, indent=2))
+            return
+        
+        print(f"Gaps of at least {args.min:g}s in the last {args.days} days "
+              f"({len(index.runs)} runs indexed, query {elapsed * 1000:.2f} ms):")
+        print_gaps(gaps)
+        return
+    
+    if args.json:
+        print(json.dumps(index.summary(since), indent=2))
+        return
+    
+    print_summary(index, since, args.days)
+
+
+if __name__ == "__main__":
+    main()
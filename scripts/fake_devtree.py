@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Fake sysfs/devfs Tree
+Builds a fake video4linux tree and simulates unplug/replug so hotplug
+handling can be tested without hardware
+
+Usage:
+  python3 scripts/fake_devtree.py create  --root /tmp/fakedev
+  python3 scripts/fake_devtree.py unplug  --root /tmp/fakedev [--node video0]
+  python3 scripts/fake_devtree.py replug  --root /tmp/fakedev [--node video2]
+  python3 scripts/fake_devtree.py measure --root /tmp/fakedev [--cycles 20]
+  
+Point the config at the tree with:
+  camera.device:       <root>/dev/video0
+  hotplug.sysfs_root:  <root>/sys/class/video4linux
+  hotplug.dev_root:    <root>/dev
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.device_monitor import DeviceMonitor
+
+
+USB_PORT = '1-1.2'
+BY_ID = 'usb-Fake_Camera_0001-video-index0'
+BY_PATH = 'platform-fd500000.pcie-usb-0:1.2:1.0-video-index0'
+
+
+def paths(root):
+    """Directory layout of the fake tree"""
+    return {
+        'class': os.path.join(root, 'sys', 'class', 'video4linux'),
+        'usb': os.path.join(root, 'sys', 'devices', 'usb1', USB_PORT),
+        'dev': os.path.join(root, 'dev'),
+        'by_id': os.path.join(root, 'dev', 'v4l', 'by-id'),
+        'by_path': os.path.join(root, 'dev', 'v4l', 'by-path')
+    }
+
+
+def create(root):
+    """Build the tree with the camera unplugged"""
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    
+    p = paths(root)
+    for key in ('class', 'dev', 'by_id', 'by_path'):
+        os.makedirs(p[key])
+    
+    os.makedirs(os.path.join(p['usb'], f"{USB_PORT}:1.0"))
+    for attr, value in (('idVendor', '046d'), ('idProduct', '0825'),
+                        ('serial', '0001'), ('authorized', '1')):
+        with open(os.path.join(p['usb'], attr), 'w') as f:
+            f.write(value + '\n')
+
+
+def replug(root, node='video0'):
+    """Attach the camera as /dev/<node>"""
+    p = paths(root)
+    sys_dir = os.path.join(p['class'], node)
+    os.makedirs(sys_dir, exist_ok=True)
+    
+    with open(os.path.join(sys_dir, 'name'), 'w') as f:
+        f.write('Fake Camera\n')
+    with open(os.path.join(sys_dir, 'index'), 'w') as f:
+        f.write('0\n')
+    
+    device_link = os.path.join(sys_dir, 'device')
+    if not os.path.islink(device_link):
+        os.symlink(os.path.join(p['usb'], f"{USB_PORT}:1.0"), device_link)
+    
+    for directory, name in ((p['by_id'], BY_ID), (p['by_path'], BY_PATH)):
+        link = os.path.join(directory, name)
+        if os.path.lexists(link):
+            os.remove(link)
+        os.symlink(os.path.join('..', '..', node), link)
+    
+    # The device node appears last, as udev creates it after sysfs is populated
+    with open(os.path.join(p['dev'], node), 'wb'):
+        pass
+
+
+def unplug(root, node='video0'):
+    """Detach the camera"""
+    p = paths(root)
+    
+    dev_node = os.path.join(p['dev'], node)
+    if os.path.exists(dev_node):
+        os.remove(dev_node)
+    
+    for directory in (p['by_id'], p['by_path']):
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+    
+    shutil.rmtree(os.path.join(p['class'], node), ignore_errors=True)
+
+
+class _Logger:
+    """Print-only logger for the measurement run"""
+    
+    def __getattr__(self, name):
+        return lambda message=None: None
+
+
+class _Camera:
+    """Just enough of CameraInterface for DeviceMonitor"""
+    
+    def __init__(self, device):
+        self.device = device
+
+
+def measure(root, cycles, method):
+    """Time from replug to the monitor reporting the camera present"""
+    create(root)
+    replug(root)
+    p = paths(root)
+    
+    config = {'hotplug': {'method': method, 'sysfs_root': p['class'], 'dev_root': p['dev']}}
+    monitor = DeviceMonitor(config, _Logger(), _Camera(os.path.join(p['dev'], 'video0')))
+    monitor.start()
+    time.sleep(0.2)
+    
+    detect = []
+    for i in range(cycles):
+        unplug(root, monitor.camera.device.rsplit('/', 1)[1])
+        while monitor.is_present():
+            time.sleep(0.001)
+        
+        # Alternate nodes to exercise by-id re-resolution
+        node = 'video0' if i % 2 else 'video2'
+        started = time.monotonic()
+        replug(root, node)
+        monitor.wait_for_device(timeout=5)
+        detect.append(time.monotonic() - started)
+    
+    monitor.stop()
+    
+    print("="*50)
+    print(f"Hotplug reconnect detection ({monitor.active_method}, {cycles} cycles)")
+    print("="*50)
+    print(f"Median: {statistics.median(detect) * 1000:.2f} ms")
+    print(f"Max:    {max(detect) * 1000:.2f} ms")
+    print(f"Final device: {monitor.camera.device}")
+    print("="*50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake sysfs/devfs tree for hotplug testing")
+    parser.add_argument('action', choices=['create', 'unplug', 'replug', 'measure'])
+    parser.add_argument('--root', default='/tmp/fakedev')
+    parser.add_argument('--node', default='video0')
+    parser.add_argument('--cycles', type=int, default=20)
+    parser.add_argument('--method', default='auto', help="Monitor method for measure")
+    args = parser.parse_args()
+    
+    if args.action == 'create':
+        create(args.root)
+        replug(args.root, args.node)
+    elif args.action == 'unplug':
+        unplug(args.root, args.node)
+    elif args.action == 'replug':
+        replug(args.root, args.node)
+    else:
+        measure(args.root, args.cycles, args.method)
+
+
+if __name__ == "__main__":
+    main()
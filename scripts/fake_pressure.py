@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Fake /proc and /sys Pressure Inputs
+Writes loadavg, PSI and thermal files so load shedding can be exercised
+without stressing the machine, and can replay a pressure scenario
+
+Usage:
+  python3 scripts/fake_pressure.py set    --root /tmp/fakepressure [--load 3.5] [--cpu-psi 70] [--temp 78]
+  python3 scripts/fake_pressure.py demo   --root /tmp/fakepressure
+  
+Point the config at the tree with:
+  load_shedding.proc_root:  <root>/proc
+  load_shedding.sys_root:   <root>/sys
+"""
+
+import argparse
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.load_shedder import LoadShedder
+
+
+def write(path, text):
+    """Write a file atomically, creating parents"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def psi(avg10):
+    """Format a /proc/pressure file"""
+    return (
+        f"some avg10={avg10:.2f} avg60={avg10:.2f} avg300={avg10:.2f} total=0\n"
+        f"full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    )
+
+
+def set_inputs(root, load=0.1, cpu_psi=0.0, io_psi=0.0, memory_psi=0.0, temp=45.0):
+    """Write every fake input (load is the total loadavg, not per CPU)"""
+    write(os.path.join(root, 'proc', 'loadavg'), f"{load:.2f} {load:.2f} {load:.2f} 1/100 1234\n")
+    write(os.path.join(root, 'proc', 'pressure', 'cpu'), psi(cpu_psi))
+    write(os.path.join(root, 'proc', 'pressure', 'io'), psi(io_psi))
+    write(os.path.join(root, 'proc', 'pressure', 'memory'), psi(memory_psi))
+    write(os.path.join(root, 'sys', 'class', 'thermal', 'thermal_zone0', 'temp'), f"{int(temp * 1000)}\n")
+
+
+class _Camera:
+    """Stand-in holding the attributes the shedder adjusts"""
+    quality = 85
+    resolution = '1920x1080'
+
+
+class _PrintLogger:
+    def __getattr__(self, name):
+        return lambda message, *args, **kwargs: print(f"    [{name}] {message}")
+
+
+def demo(root):
+    """Replay heat-up and cool-down with simulated time and show the levels"""
+    config = {
+        'capture': {'quality': 85},
+        'camera': {'resolution': '1920x1080'},
+        'files': {'capture_dir': root},
+        'load_shedding': {
+            'proc_root': os.path.join(root, 'proc'),
+            'sys_root': os.path.join(root, 'sys'),
+            'check_interval': 10,
+            'recover_after': 60,
+            'thresholds': {'disk_used_percent': [101, 101, 101]}
+        }
+    }
+    camera = _Camera()
+    shedder = LoadShedder(config, _PrintLogger(), camera)
+    
+    # (seconds, temperature) - heat up past 80C, hover at a threshold, cool down
+    scenario = [(0, 50), (60, 71), (120, 76), (180, 81), (240, 79), (300, 77),
+                (360, 72), (420, 74), (480, 68), (600, 60), (700, 60), (800, 60), (900, 50)]
+    
+    print(f"{'time':>6} {'temp':>5} {'level':>5} {'quality':>7} {'resolution':>10} {'interval x':>10}")
+    
+    for seconds, temp in scenario:
+        set_inputs(root, temp=temp)
+        # Feed the per-check samples between scenario points
+        for tick in range(seconds - (seconds % 10) - 50 if seconds else 0, seconds + 1, 10):
+            shedder.update(now=float(tick))
+        print(f"{seconds:>6} {temp:>5} {shedder.level:>5} {camera.quality:>7} "
+              f"{camera.resolution:>10} {shedder.interval_factor:>10}")
+    
+    # Live reload that drops levels while the deepest one is active
+    set_inputs(root, temp=85)
+    shedder.update(now=1000.0)
+    reloaded = dict(config, load_shedding=dict(config['load_shedding'], levels=[{'quality': 60}]))
+    shedder.apply_config(reloaded)
+    shedder.update(now=1010.0)
+    print(f"{'reload':>6} {85:>5} {shedder.level:>5} {camera.quality:>7} "
+          f"{camera.resolution:>10} {shedder.interval_factor:>10}  (one level left)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake /proc and /sys pressure inputs")
+    parser.add_argument('command', choices=['set', 'demo'])
+    parser.add_argument('--root', default='/tmp/fakepressure')
+    parser.add_argument('--load', type=float, default=0.1, help="1-minute loadavg (total)")
+    parser.add_argument('--cpu-psi', type=float, default=0.0)
+    parser.add_argument('--io-psi', type=float, default=0.0)
+    parser.add_argument('--memory-psi', type=float, default=0.0)
+    parser.add_argument('--temp', type=float, default=45.0, help="Degrees C")
+    args = parser.parse_args()
+    
+    if args.command == 'set':
+        set_inputs(args.root, args.load, args.cpu_psi, args.io_psi, args.memory_psi, args.temp)
+        print(f"Fake inputs written under {args.root}")
+    else:
+        demo(args.root)
+
+
+if __name__ == "__main__":
+    main()
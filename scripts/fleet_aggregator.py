@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Fleet Aggregator
+Receives fleet agent batches and answers fleet-wide queries
+
+Usage: python3 scripts/fleet_aggregator.py serve [--port 8090] [--udp-port 8091] [--data-dir ./logs/fleet]
+       python3 scripts/fleet_aggregator.py query nodes|fleet|series|frames [--metric NAME] [--node NODE] [--hours 24]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.config import Config
+from app.fleet_aggregator import FleetAggregator
+
+
+class _ConsoleLogger:
+    """Prints info and above (debug with --verbose)"""
+    
+    def __init__(self, verbose=False):
+        self.verbose = verbose
+    
+    def _print(self, level, message):
+        print(f"{datetime.now():%Y-%m-%d %H:%M:%S} [{level}] {message}")
+    
+    def debug(self, message):
+        if self.verbose:
+            self._print('DEBUG', message)
+    
+    def info(self, message):
+        self._print('INFO', message)
+    
+    def warning(self, message):
+        self._print('WARNING', message)
+    
+    def error(self, message):
+        self._print('ERROR', message)
+
+
+def serve(aggregator):
+    """Run until interrupted, printing a status line every minute"""
+    aggregator.start()
+    try:
+        while True:
+            time.sleep(60)
+            stats = aggregator.get_stats()
+            stale = aggregator.fleet()['stale']
+            print(f"nodes={stats['nodes']} stale={len(stale)} batches={stats['batches']} "
+                  f"duplicates={stats['duplicates']} rejected={stats['rejected']} received={stats['received_kb']} KB")
+    except KeyboardInterrupt:
+        aggregator.stop()
+
+
+def print_query(aggregator, args):
+    """Answer one query from the data directory"""
+    since = time.time() - args.hours * 3600 if args.hours else None
+    
+    if args.what == 'nodes':
+        result = aggregator.node_summaries()
+    elif args.what == 'fleet':
+        result = aggregator.fleet(args.metric)
+    elif args.what == 'series':
+        if not args.metric:
+            sys.exit("series needs --metric")
+        result = aggregator.series(args.metric, args.node, since)
+    else:
+        result = aggregator.frames(args.node, since, limit=args.limit)
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    
+    if args.what == 'nodes':
+        for node, summary in result.items():
+            age = f"{summary['age']:.0f}s ago" if summary['age'] is not None else "never"
+            print(f"{node:24} {'STALE' if summary['stale'] else 'ok':6} last seen {age}, "
+                  f"{summary['frames']} frames, {len(summary['latest'])} metrics")
+    elif args.what == 'fleet':
+        print(f"{result['nodes']} nodes, {len(result['stale'])} stale {result['stale'] or ''}")
+        for key, entry in result['metrics'].items():
+            print(f"  {key:32} min {entry['min']} ({entry['min_node']})  max {entry['max']} ({entry['max_node']})  "
+                  f"mean {entry['mean']}  sum {entry['sum']}")
+    elif args.what == 'series':
+        for node, points in result.items():
+            print(f"{node}:")
+            for timestamp, value in points:
+                print(f"  {datetime.fromtimestamp(timestamp):%Y-%m-%d %H:%M:%S}  {value}")
+    elif args.node:
+        for frame in result:
+            print(f"  {frame['seq']:>10}  {frame['name']:40} {frame['size']:>10}")
+    else:
+        for node, counts in result.items():
+            print(f"{node:24} {counts['frames']:>8} frames  {counts['bytes'] / (1024 * 1024):.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fleet aggregator service and queries")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    parser.add_argument('--data-dir', default=None, help="Aggregator data directory (default: from config)")
+    sub = parser.add_subparsers(dest='command', required=True)
+    
+    serve_parser = sub.add_parser('serve', help="Receive batches from fleet agents")
+    serve_parser.add_argument('--host', default=None)
+    serve_parser.add_argument('--port', type=int, default=None)
+    serve_parser.add_argument('--udp-port', type=int, default=None, help="0 disables UDP ingest")
+    serve_parser.add_argument('--token', default=None)
+    serve_parser.add_argument('--verbose', action='store_true')
+    
+    query_parser = sub.add_parser('query', help="Query stored fleet data")
+    query_parser.add_argument('what', choices=['nodes', 'fleet', 'series', 'frames'])
+    query_parser.add_argument('--metric', default=None)
+    query_parser.add_argument('--node', default=None)
+    query_parser.add_argument('--hours', type=float, default=None, help="Only the last N hours")
+    query_parser.add_argument('--limit', type=int, default=1000, help="Frames listed for one node")
+    query_parser.add_argument('--json', action='store_true')
+    args = parser.parse_args()
+    
+    config = Config(args.config).get_all()
+    settings = config.setdefault('fleet_aggregator', {})
+    if args.data_dir:
+        settings['data_dir'] = args.data_dir
+    
+    if args.command == 'serve':
+        for key in ('host', 'port', 'udp_port', 'token'):
+            if getattr(args, key) is not None:
+                settings[key] = getattr(args, key)
+        serve(FleetAggregator(config, _ConsoleLogger(args.verbose)))
+    else:
+        print_query(FleetAggregator(config, _ConsoleLogger()), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Event Journal Export
+Converts the binary capture event journal to JSON lines
+
+Usage: python3 scripts/journal_to_jsonl.py [--journal ./logs/capture_events.bin]
+                                           [--since "2026-01-01 00:00:00"] [--until ...] [--output events.jsonl] [--summary]
+"""
+
+import argparse
+import json
+import os
+import sys
+from collections import Counter
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.event_journal import JournalReader, event_to_dict
+
+
+def parse_time(value, end_of_day=False):
+    """'YYYY-MM-DD[ HH:MM:SS]' as Unix seconds (a bare date as --until means the whole day)"""
+    if value is None:
+        return None
+    if end_of_day and len(value) == 10:
+        value += ' 23:59:59.999'
+    return datetime.fromisoformat(value).timestamp()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the capture event journal as JSON lines")
+    parser.add_argument('--journal', default='./logs/capture_events.bin')
+    parser.add_argument('--since', default=None, help="'YYYY-MM-DD[ HH:MM:SS]'")
+    parser.add_argument('--until', default=None, help="'YYYY-MM-DD[ HH:MM:SS]'")
+    parser.add_argument('--output', default=None, help="Write to a file instead of stdout")
+    parser.add_argument('--summary', action='store_true', help="Print outcome and error counts only")
+    args = parser.parse_args()
+    
+    if not os.path.exists(args.journal):
+        print(f"No journal at {args.journal}")
+        sys.exit(1)
+    
+    since, until = parse_time(args.since), parse_time(args.until, end_of_day=True)
+    
+    with JournalReader(args.journal) as reader:
+        events = reader.events(since, until)
+        
+        if args.summary:
+            outcomes, errors = Counter(), Counter()
+            for event in events:
+                outcomes[event.outcome] += 1
+                if event.error:
+                    errors[event.error] += 1
+            
+            print(f"{len(reader)} events in {os.path.getsize(args.journal) / 1024:.1f} KB")
+            print("Outcomes: " + ", ".join(f"{k} {v}" for k, v in outcomes.most_common()))
+            print("Errors:   " + (", ".join(f"{k} {v}" for k, v in errors.most_common()) or "none"))
+            return
+        
+        out = open(args.output, 'w') if args.output else sys.stdout
+        try:
+            for event in events:
+                out.write(json.dumps(event_to_dict(event), separators=(',', ':')) + '\n')
+        finally:
+            if args.output:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
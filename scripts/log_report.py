@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Log Analytics Report
+Success-rate timeline, failure reasons, retry distribution and disconnect
+windows from the current, rotated and compressed capture logs
+
+Usage: python3 scripts/log_report.py [--log-dir ./logs] [--bucket hour|day|minute]
+                                     [--since "2026-01-01 00:00:00"] [--until ...] [--json]
+
+Successes are counted from "SUCCESS: Captured" lines, so the report refuses to
+run when event_journal.log_successes is false; use journal_to_jsonl.py instead.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.config import Config
+from utils.log_analytics import BUCKETS, analyze_logs, find_logs
+
+
+def print_report(report, top):
+    """Human-readable report"""
+    totals = report['totals']
+    print(f"Captures: {totals['captures']}  successful: {totals['successful']}  "
+          f"failed: {totals['failed']}  success rate: {totals['success_rate']}%")
+    
+    print("\nSuccess-rate timeline:")
+    for row in report['timeline']:
+        bar = '#' * int(row['success_rate'] / 5)
+        print(f"  {row['bucket']:<16} {row['successful']:>7} ok {row['failed']:>5} failed "
+              f"{row['success_rate']:>6}% {bar}")
+    
+    print("\nRetry distribution (attempts needed):")
+    for attempts, count in report['retry_distribution']:
+        label = 'all failed' if attempts == 'failed' else f"{attempts} attempt{'s' if attempts != 1 else ''}"
+        print(f"  {label:<12} {count:>8}")
+    
+    print(f"\nTop failure reasons (per attempt):")
+    for reason, count in report['failure_reasons'][:top]:
+        print(f"  {count:>8}  {reason}")
+    
+    print("\nDisconnect windows:")
+    if not report['disconnect_windows']:
+        print("  none")
+    for window in report['disconnect_windows']:
+        if window['end']:
+            print(f"  {window['start']} -> {window['end']}  ({window['seconds']}s)")
+        else:
+            print(f"  {window['start']} -> (still disconnected at end of log)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze capture logs")
+    parser.add_argument('--log-dir', default='./logs')
+    parser.add_argument('--log-file', default='capture_log.txt', help="Base name of the current log")
+    parser.add_argument('--bucket', choices=sorted(BUCKETS), default='hour')
+    parser.add_argument('--since', default=None, help="'YYYY-MM-DD[ HH:MM:SS]'")
+    parser.add_argument('--until', default=None, help="'YYYY-MM-DD[ HH:MM:SS]'")
+    parser.add_argument('--workers', type=int, default=None, help="Parser processes (default: CPU count)")
+    parser.add_argument('--top', type=int, default=10, help="Failure reasons to show")
+    parser.add_argument('--json', action='store_true', help="Print the full report as JSON")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    args = parser.parse_args()
+    
+    # Without success lines every capture would look failed
+    journal = Config(args.config).get('event_journal', {}) or {}
+    if journal.get('enabled', False) and not journal.get('log_successes', True):
+        print("event_journal.log_successes is false: successful captures are only in the event "
+              "journal, so the log cannot give success rates.\n"
+              "Use: python3 scripts/journal_to_jsonl.py")
+        sys.exit(1)
+    
+    paths = find_logs(args.log_dir, args.log_file)
+    if not paths:
+        print(f"No logs matching {os.path.join(args.log_dir, args.log_file)}*")
+        sys.exit(1)
+    
+    # A bare date as --until means the whole day
+    until = args.until + ' 23:59:59' if args.until and len(args.until) == 10 else args.until
+    
+    started = time.monotonic()
+    report = analyze_logs(paths, args.bucket, args.since, until, args.workers)
+    elapsed = time.monotonic() - started
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    
+    print_report(report, args.top)
+    megabytes = report['bytes'] / (1024 * 1024)
+    print(f"\nScanned {len(paths)} files, {megabytes:.1f} MB in {elapsed:.2f}s "
+          f"({megabytes / elapsed if elapsed else 0:.0f} MB/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Ring Store Export
+Lists frames in a ring store and writes selected ones out as ordinary JPEGs
+
+Usage:
+  python3 scripts/ring_export.py list   --ring ./captures/frames.ring
+  python3 scripts/ring_export.py export --ring ./captures/frames.ring --out ./exported \\
+      [--last 50 | --seq 120 121 | --from "2026-01-05 08:00" --to "2026-01-05 08:05"]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.ring_store import RingStore
+
+
+def parse_time(value):
+    """Parse 'YYYY-MM-DD HH:MM[:SS]' into a Unix timestamp"""
+    return datetime.fromisoformat(value).timestamp() if value else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read frames out of a ring store")
+    parser.add_argument('command', choices=['list', 'export'])
+    parser.add_argument('--ring', default='./captures/frames.ring', help="Ring file")
+    parser.add_argument('--out', default='./exported', help="Export directory")
+    parser.add_argument('--seq', type=int, nargs='*', help="Sequence numbers to export")
+    parser.add_argument('--last', type=int, default=None, help="Export the newest N frames")
+    parser.add_argument('--from', dest='start', default=None, help="Start time")
+    parser.add_argument('--to', dest='end', default=None, help="End time")
+    args = parser.parse_args()
+    
+    # Read-only mapping: safe to run while the capture loop is appending
+    ring = RingStore(args.ring, 0, 0, readonly=True)
+    
+    try:
+        entries = ring.entries(parse_time(args.start), parse_time(args.end))
+        
+        if args.seq:
+            wanted = set(args.seq)
+            entries = [entry for entry in entries if entry.seq in wanted]
+        if args.last:
+            entries = entries[-args.last:]
+        
+        if args.command == 'list':
+            for entry in entries:
+                stamp = datetime.fromtimestamp(entry.timestamp).strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+                print(f"{entry.seq:10d}  {stamp}  {entry.length:9d}  {entry.name}")
+            
+            stats = ring.get_stats()
+            print(f"\n{stats['frames']}/{stats['slots']} slots used, head seq {stats['head_seq']}")
+            return
+        
+        os.makedirs(args.out, exist_ok=True)
+        exported = 0
+        
+        for entry in entries:
+            path = ring.export(entry.seq, args.out)
+            if path:
+                exported += 1
+            else:
+                print(f"Skipped seq {entry.seq} (overwritten or corrupt)")
+        
+        print(f"Exported {exported} frames to {args.out}")
+    
+    finally:
+        ring.close()
+
+
+if __name__ == "__main__":
+    main()
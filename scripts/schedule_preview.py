@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Schedule Dry Run
+Lists the next capture times produced by the schedule rules without capturing
+
+Usage: python3 scripts/schedule_preview.py [--count 20] [--from "2026-01-05 07:55"] [--config path]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.config import Config
+from app.scheduler import Scheduler
+
+
+class _QuietLogger:
+    """Scheduler only logs at runtime; the preview needs no log files"""
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List upcoming scheduled capture times")
+    parser.add_argument('--count', type=int, default=20, help="Number of capture times to list")
+    parser.add_argument('--from', dest='start', default=None,
+                        help="Start time 'YYYY-MM-DD HH:MM' (default: now)")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    args = parser.parse_args()
+    
+    config = Config(args.config)
+    scheduler = Scheduler(config.get_all(), _QuietLogger())
+    start = datetime.fromisoformat(args.start).timestamp() if args.start else None
+    
+    if not config.get('schedule.enabled', False):
+        print("Note: schedule.enabled is false, the capture loop uses capture.interval\n")
+    
+    print("Rules:")
+    for rule in scheduler.rules:
+        print(f"  {rule.describe()}")
+    
+    print(f"\nNext {args.count} capture times:")
+    previous = None
+    for slot, rule in scheduler.upcoming(args.count, start):
+        gap = f"+{slot - previous:.0f}s" if previous is not None else ''
+        print(f"  {datetime.fromtimestamp(slot):%a %Y-%m-%d %H:%M:%S}  {rule:<20} {gap}")
+        previous = slot
+
+
+if __name__ == "__main__":
+    main()
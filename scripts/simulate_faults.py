@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Fault Simulation Runner
+Drives the real capture, retry and health code against a seeded fault schedule
+and reports how the system coped. The same seed reproduces the same run.
+
+Usage:
+  python3 scripts/simulate_faults.py --scenario mixed --captures 1000000 --seed 7
+  python3 scripts/simulate_faults.py --config my_faults.yaml   # simulation.faults from config
+  python3 scripts/simulate_faults.py --scenario unplug --adaptive  # with the circuit breaker
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.capture import CaptureSystem
+from app.config import Config
+from app.fault_camera import FaultInjectionCamera
+from app.health_check import HealthCheck
+from utils.clock import VirtualClock
+from utils.file_manager import FileManager
+from utils.log_analytics import normalize_reason
+
+
+# Built-in fault schedules modelled on tests/failure_simulations.md
+SCENARIOS = {
+    'flaky': [
+        {'type': 'timeout', 'probability': 0.01},
+        {'type': 'exit', 'probability': 0.005, 'message': 'Error opening device /dev/video0: Device or resource busy'},
+    ],
+    'unplug': [
+        {'type': 'device_removed', 'every': 5000, 'duration': 12},
+        {'type': 'device_removed', 'probability': 0.0002, 'duration': 40},
+    ],
+    'corrupt': [
+        {'type': 'empty', 'probability': 0.005},
+        {'type': 'truncated', 'probability': 0.01, 'fraction': 0.6},
+    ],
+    'slow': [
+        {'type': 'slow_write', 'probability': 0.02, 'latency': 4},
+        {'type': 'slow_write', 'probability': 0.005, 'latency': 30},
+    ],
+    'mixed': [
+        {'type': 'timeout', 'probability': 0.01},
+        {'type': 'timeout', 'probability': 0.0005, 'count': 8},
+        {'type': 'exit', 'probability': 0.005},
+        {'type': 'empty', 'probability': 0.002},
+        {'type': 'truncated', 'probability': 0.004},
+        {'type': 'slow_write', 'probability': 0.01, 'latency': 6},
+        {'type': 'device_removed', 'probability': 0.0002, 'duration': 20},
+    ],
+}
+
+
+class _CountingLogger:
+    """Counts capture failures by reason; everything else is dropped for speed"""
+    
+    def __init__(self):
+        self.reasons = Counter()
+    
+    def log_capture_failure(self, error, attempt, max_attempts):
+        self.reasons[normalize_reason(error)] += 1
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def build_config(args):
+    """Config for a fast, disk-light, sleep-free simulation"""
+    config = copy.deepcopy(Config(args.config).get_all())
+    
+    simulation = config.setdefault('simulation', {})
+    if args.scenario:
+        simulation['faults'] = SCENARIOS[args.scenario]
+    simulation['seed'] = args.seed
+    simulation['realtime'] = True  # latencies advance the virtual clock
+    if args.adaptive:
+        config.setdefault('retry', {})['adaptive'] = True
+    
+    # Every attempt overwrites one small file in memory-backed storage
+    root = tempfile.mkdtemp(prefix='picam_sim_', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    config['files']['capture_dir'] = root
+    config['files']['log_dir'] = root
+    config['files']['filename_pattern'] = 'sim'
+    config['files']['storage'] = 'files'
+    config['capture'].pop('outputs', None)
+    config['camera']['warmup_delay'] = 0
+    return config, root
+
+
+def run(config, captures, health_every):
+    """
+    Run the capture loop's decisions for a number of slots
+    
+    Returns:
+        dict: Report
+    """
+    # Latencies and retry delays pass on a virtual clock instead of being slept
+    clock = VirtualClock()
+    logger = _CountingLogger()
+    camera = FaultInjectionCamera(config, logger, clock)
+    file_manager = FileManager(config, logger, clock)
+    
+    # Adaptive retry as main.py builds it, so breaker cool-downs follow the virtual clock
+    retry_policy = None
+    if config.get('retry', {}).get('adaptive', False):
+        from app.retry_policy import RetryPolicy
+        retry_policy = RetryPolicy(config, logger, clock=clock)
+    
+    health = HealthCheck(config, logger, camera,
+                         circuit_breaker=retry_policy.breaker if retry_policy else None, clock=clock)
+    system = CaptureSystem(config, logger, camera, file_manager, health,
+                           retry_policy=retry_policy, clock=clock)
+    
+    attempts_needed = Counter()
+    statuses = Counter()
+    streaks = Counter()
+    digest = hashlib.sha1()
+    streak = 0
+    stops = resets = 0
+    
+    started = time.perf_counter()
+    
+    for slot in range(1, captures + 1):
+        # Periodic health check, with the loop's one-reset-then-stop handling
+        if slot % health_every == 0:
+            if health.consecutive_failures == 0:
+                system._reset_attempted = False
+            
+            status, _ = health.check_camera_health()
+            statuses[status] += 1
+            
+            if status == 'failed':
+                if system._try_device_reset():
+                    resets += 1
+                else:
+                    # The real loop would stop here; count it and carry on as
+                    # if a supervisor had restarted the process
+                    stops += 1
+                    health.clear_failure_streak()
+                    system._reset_attempted = False
+        
+        before = camera.attempts
+        rejected = retry_policy.breaker.rejected if retry_policy else 0
+        captured = system.capture_with_retry()
+        attempts = camera.attempts - before
+        
+        # A slot the open breaker turned away takes no camera time; let the
+        # interval pass as the real loop would, so the cool-down can elapse
+        if retry_policy and retry_policy.breaker.rejected > rejected:
+            clock.advance(system.interval)
+        
+        attempts_needed[attempts if captured else 'failed'] += 1
+        digest.update(b'1' if captured else b'0')
+        
+        if captured:
+            if streak:
+                streaks[streak] += 1
+            streak = 0
+        else:
+            streak += 1
+    
+    elapsed = time.perf_counter() - started
+    if streak:
+        streaks[streak] += 1
+    
+    lost = sum(length * count for length, count in streaks.items())
+    camera_stats = camera.get_stats()
+    breaker_stats = retry_policy.breaker.get_stats() if retry_policy else {}
+    
+    return {
+        'slots': captures,
+        'captured': health.successful_captures,
+        'success_rate': health.get_success_rate(),
+        'attempts': camera_stats['attempts'],
+        'attempts_needed': sorted(attempts_needed.items(), key=lambda item: (isinstance(item[0], str), item[0])),
+        'injected': camera_stats['injected'],
+        'failure_reasons': logger.reasons.most_common(),
+        'health_checks': dict(statuses),
+        'device_resets': resets,
+        'would_stop': stops,
+        'failure_streaks': sum(streaks.values()),
+        'longest_streak': max(streaks, default=0),
+        'mean_streak': round(lost / sum(streaks.values()), 2) if streaks else 0,
+        'breaker_opens': breaker_stats.get('breaker_opens'),
+        'breaker_rejected': breaker_stats.get('breaker_rejected'),
+        'simulated_capture_hours': round(camera_stats['simulated_seconds'] / 3600, 1),
+        'simulated_busy_hours': round(clock.monotonic() / 3600, 1),
+        'elapsed_seconds': round(elapsed, 2),
+        'slots_per_second': round(captures / elapsed) if elapsed else None,
+        'digest': digest.hexdigest()[:16]
+    }
+
+
+def print_report(report):
+    """Human-readable report"""
+    print(f"Slots: {report['slots']}  captured: {report['captured']}  "
+          f"success rate: {report['success_rate']}%  attempts: {report['attempts']}")
+    
+    print("\nAttempts needed per slot:")
+    for attempts, count in report['attempts_needed']:
+        print(f"  {attempts!s:<8} {count:>10}")
+    
+    print("\nFaults injected:")
+    for fault_type, count in report['injected'].items():
+        print(f"  {fault_type:<16} {count:>10}")
+    
+    print("\nFailure reasons seen by the retry loop:")
+    for reason, count in report['failure_reasons'][:10]:
+        print(f"  {count:>10}  {reason}")
+    
+    print("\nRecovery:")
+    print(f"  health checks    {report['health_checks']}")
+    print(f"  device resets    {report['device_resets']}")
+    print(f"  would stop       {report['would_stop']} (failed health check after reset)")
+    print(f"  failed streaks   {report['failure_streaks']} (mean {report['mean_streak']} slots, "
+          f"longest {report['longest_streak']})")
+    if report['breaker_opens'] is not None:
+        print(f"  breaker opens    {report['breaker_opens']} "
+              f"({report['breaker_rejected']} attempts rejected while open)")
+    
+    print(f"\nSimulated {report['simulated_busy_hours']} h of capturing and retrying "
+          f"({report['simulated_capture_hours']} h camera time) in {report['elapsed_seconds']}s "
+          f"({report['slots_per_second']} slots/s), digest {report['digest']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seeded fault-injection scenario runner")
+    parser.add_argument('--scenario', choices=sorted(SCENARIOS), default=None,
+                        help="Built-in fault schedule (default: simulation.faults from config)")
+    parser.add_argument('--captures', type=int, default=100000, help="Capture slots to simulate")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--health-every', type=int, default=30, help="Slots between health checks")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Enable retry.adaptive (latency timeouts, backoff, circuit breaker)")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+    
+    config, root = build_config(args)
+    if not config['simulation'].get('faults'):
+        print("No faults configured: pass --scenario or set simulation.faults")
+        sys.exit(1)
+    
+    try:
+        report = run(config, args.captures, args.health_every)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Accelerated Soak Test
+Runs the real capture loop (schedule, retries, health checks, retention cleanup,
+logging) on a virtual clock with the fault-injection camera, so days of
+operation take minutes. Reports memory growth and per-iteration cost.
+
+Usage: python3 scripts/soak_test.py [--days 2] [--interval 10] [--retention-days 1]
+                                    [--no-faults] [--tracemalloc] [--config path]
+"""
+
+import argparse
+import copy
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.capture import CaptureSystem
+from app.config import Config
+from app.fault_camera import FaultInjectionCamera
+from app.health_check import HealthCheck
+from utils.clock import VirtualClock
+from utils.file_manager import FileManager
+from utils.logger import Logger
+
+
+def rss_mb():
+    """Current resident set size in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # Peak instead of current where /proc is unavailable (KB on Linux)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class SoakMonitor:
+    """Stops the run at the simulated deadline and samples cost and memory on the way"""
+    
+    def __init__(self, days, sample_hours, capture_dir, use_tracemalloc):
+        self.duration = days * 86400
+        self.sample_every = sample_hours * 3600
+        self.capture_dir = capture_dir
+        self.use_tracemalloc = use_tracemalloc
+        self.system = None
+        self.health = None
+        self.samples = []
+        self._next_sample = 0
+        self._wall = time.perf_counter()
+        self._captures = 0
+    
+    def __call__(self, clock):
+        """VirtualClock advance hook"""
+        elapsed = clock.monotonic()
+        
+        if elapsed >= self._next_sample:
+            self._next_sample += self.sample_every
+            self.sample(elapsed)
+        
+        if elapsed >= self.duration and self.system.running:
+            self.system.stop()
+    
+    def sample(self, elapsed):
+        """Record one row of wall time per capture and memory"""
+        wall = time.perf_counter()
+        captures = self.health.total_captures
+        done = captures - self._captures
+        
+        self.samples.append({
+            'hours': elapsed / 3600,
+            'captures': captures,
+            'us_per_capture': (wall - self._wall) / done * 1e6 if done else None,
+            'rss_mb': rss_mb(),
+            'traced_mb': tracemalloc.get_traced_memory()[0] / (1024 * 1024) if self.use_tracemalloc else None,
+            'files': len(os.listdir(self.capture_dir))
+        })
+        
+        self._wall = wall
+        self._captures = captures
+
+
+def build_config(args, root):
+    """Config pointing every path at a scratch directory"""
+    config = copy.deepcopy(Config(args.config).get_all())
+    
+    config['files']['capture_dir'] = os.path.join(root, 'captures')
+    config['files']['log_dir'] = os.path.join(root, 'logs')
+    config['files']['max_capture_age_days'] = args.retention_days
+    config['files']['storage'] = 'files'
+    config['capture']['interval'] = args.interval
+    config['capture'].pop('outputs', None)
+    config['logging']['console_output'] = False
+    
+    simulation = config.setdefault('simulation', {})
+    simulation['seed'] = args.seed
+    simulation['realtime'] = True  # latencies advance the virtual clock
+    simulation.setdefault('frame_size', '160x120')
+    if args.no_faults:
+        simulation['faults'] = []
+    
+    return config
+
+
+def print_report(monitor, health, elapsed):
+    """Sample table and growth summary"""
+    print(f"{'sim h':>7} {'captures':>9} {'us/capture':>11} {'rss MB':>8} "
+          f"{'traced MB':>10} {'files':>7}")
+    for row in monitor.samples[1:]:
+        traced = f"{row['traced_mb']:.2f}" if row['traced_mb'] is not None else '-'
+        cost = f"{row['us_per_capture']:.0f}" if row['us_per_capture'] else '-'
+        print(f"{row['hours']:>7.1f} {row['captures']:>9} {cost:>11} {row['rss_mb']:>8.1f} "
+              f"{traced:>10} {row['files']:>7}")
+    
+    rows = [row for row in monitor.samples[1:] if row['us_per_capture']]
+    if len(rows) >= 4:
+        quarter = len(rows) // 4
+        first = sum(r['us_per_capture'] for r in rows[:quarter]) / quarter
+        last = sum(r['us_per_capture'] for r in rows[-quarter:]) / quarter
+        
+        # Memory after the first sample excludes start-up allocations
+        days = (rows[-1]['hours'] - rows[0]['hours']) / 24 or 1
+        growth = rows[-1]['rss_mb'] - rows[0]['rss_mb']
+        
+        print(f"\nPer-capture cost: {first:.0f} us (first quarter) -> {last:.0f} us (last quarter), "
+              f"x{last / first:.2f}")
+        print(f"RSS growth: {growth:+.1f} MB ({growth / days:+.2f} MB per simulated day)")
+        if rows[-1]['traced_mb'] is not None:
+            traced = rows[-1]['traced_mb'] - rows[0]['traced_mb']
+            print(f"Python heap growth: {traced:+.2f} MB ({traced / days:+.3f} MB per simulated day)")
+    
+    hours = monitor.samples[-1]['hours'] if monitor.samples else 0
+    print(f"\nSimulated {hours:.1f} h in {elapsed:.1f}s ({hours * 3600 / elapsed:.0f}x real time): "
+          f"{health.total_captures} captures, {health.get_success_rate()}% successful, "
+          f"{health.camera_disconnects} disconnects")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accelerated soak test on a virtual clock")
+    parser.add_argument('--days', type=float, default=2, help="Simulated days to run")
+    parser.add_argument('--interval', type=float, default=10, help="Capture interval in seconds")
+    parser.add_argument('--retention-days', type=float, default=1,
+                        help="files.max_capture_age_days (short, so cleanup runs during the soak)")
+    parser.add_argument('--sample-hours', type=float, default=2, help="Simulated hours between samples")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--no-faults', action='store_true', help="Ignore simulation.faults")
+    parser.add_argument('--tracemalloc', action='store_true', help="Also track Python heap (slower)")
+    parser.add_argument('--keep', action='store_true', help="Keep the scratch directory")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    args = parser.parse_args()
+    
+    root = tempfile.mkdtemp(prefix='picam_soak_', dir='/dev/shm' if os.path.isdir('/dev/shm') else None)
+    config = build_config(args, root)
+    
+    if args.tracemalloc:
+        tracemalloc.start()
+    
+    monitor = SoakMonitor(args.days, args.sample_hours, config['files']['capture_dir'], args.tracemalloc)
+    clock = VirtualClock(on_advance=monitor)
+    
+    logger = Logger(config)
+    camera = FaultInjectionCamera(config, logger, clock)
+    file_manager = FileManager(config, logger, clock)
+    
+    # Optional components, built as main.py does but on the virtual clock
+    retry_policy = None
+    if config.get('retry', {}).get('adaptive', False):
+        from app.retry_policy import RetryPolicy
+        retry_policy = RetryPolicy(config, logger, clock=clock)
+    
+    load_shedder = None
+    if config.get('load_shedding', {}).get('enabled', False):
+        from app.load_shedder import LoadShedder
+        load_shedder = LoadShedder(config, logger, camera, clock=clock)
+    
+    scheduler = None
+    if config.get('schedule', {}).get('enabled', False):
+        from app.scheduler import Scheduler
+        scheduler = Scheduler(config, logger, clock=clock)
+    
+    coverage = None
+    if config.get('coverage', {}).get('enabled', False):
+        from app.coverage import CoverageIndex
+        coverage = CoverageIndex(config, logger, scheduler, clock=clock)
+    
+    health = HealthCheck(
+        config, logger, camera,
+        circuit_breaker=retry_policy.breaker if retry_policy else None,
+        load_shedder=load_shedder,
+        coverage=coverage,
+        clock=clock
+    )
+    system = CaptureSystem(
+        config, logger, camera, file_manager, health,
+        retry_policy=retry_policy,
+        scheduler=scheduler,
+        load_shedder=load_shedder,
+        coverage=coverage,
+        clock=clock
+    )
+    monitor.system = system
+    monitor.health = health
+    
+    started = time.perf_counter()
+    try:
+        system.run_continuous()
+    finally:
+        elapsed = time.perf_counter() - started
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+    
+    print_report(monitor, health, elapsed)
+    if args.keep:
+        print(f"Scratch directory kept: {root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -98,8 +98,16 @@ EOF
 fi
 
 # Start system in background
-echo "Starting system..."
-nohup python3 main.py > /tmp/pi_camera_system.out 2>&1 &
+# ./scripts/start.sh --supervised [config ...] runs workers under the supervisor,
+# which restarts crashed or stalled capture loops
+if [ "$1" == "--supervised" ]; then
+    shift
+    echo "Starting supervisor..."
+    nohup python3 scripts/supervise.py run "$@" > /tmp/pi_camera_system.out 2>&1 &
+else
+    echo "Starting system..."
+    nohup python3 main.py > /tmp/pi_camera_system.out 2>&1 &
+fi
 PID=$!
 
 # Save PID
@@ -114,6 +122,9 @@ if ps -p $PID > /dev/null 2>&1; then
     echo "  tail -f logs/capture_log.txt"
     echo "  tail -f /tmp/pi_camera_system.out"
     echo ""
+    echo "Worker status (supervised mode):"
+    echo "  python3 scripts/supervise.py status"
+    echo ""
     echo "Stop system:"
     echo "  ./scripts/stop.sh"
 else
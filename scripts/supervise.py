@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Supervisor
+Runs one capture worker per config file and restarts crashed or stalled workers
+
+Usage:
+  python3 scripts/supervise.py run [config/cam0.yaml config/cam1.yaml ...]
+  python3 scripts/supervise.py status [--json]
+"""
+
+import argparse
+import copy
+import json
+import os
+import sys
+from datetime import datetime
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.config import Config
+from app.shared_metrics import SharedMetrics
+from app.supervisor import Supervisor
+from utils.logger import Logger
+
+
+def run(config, worker_configs):
+    """Supervise workers until stopped"""
+    config_dict = copy.deepcopy(config.get_all())
+    
+    # Workers append to the capture log; the supervisor keeps its own
+    config_dict['logging']['log_file'] = 'supervisor_log.txt'
+    logger = Logger(config_dict)
+    
+    Supervisor(config_dict, logger, worker_configs or [config.config_path]).run()
+
+
+def status(config, as_json):
+    """Print fleet status read directly from shared memory"""
+    try:
+        metrics = SharedMetrics(config.get('supervisor.shm_name', 'picam_metrics'))
+    except FileNotFoundError:
+        print("Supervisor is not running")
+        sys.exit(1)
+    
+    try:
+        snapshot = metrics.read_all()
+    finally:
+        metrics.close()
+    
+    if as_json:
+        print(json.dumps(snapshot, indent=2))
+        return
+    
+    print(f"{'worker':<16} {'state':<9} {'pid':>7} {'restarts':>8} {'beat':>6} "
+          f"{'captures':>9} {'rate':>7} {'fails':>5} {'last success':<19}")
+    
+    for w in snapshot['workers']:
+        beat = f"{w['heartbeat_age']:.0f}s" if w['heartbeat_age'] is not None else '-'
+        last = datetime.fromtimestamp(w['last_success']).strftime('%Y-%m-%d %H:%M:%S') if w['last_success'] else 'never'
+        print(f"{w['name']:<16} {w['state']:<9} {w['pid']:>7} {w['restarts']:>8} {beat:>6} "
+              f"{w['total_captures']:>9} {w['success_rate']:>6}% {w['consecutive_failures']:>5} {last:<19}")
+    
+    totals = snapshot['totals']
+    print(f"\n{totals['running']}/{totals['workers']} running, {totals['restarts']} restarts, "
+          f"{totals['total_captures']} captures ({totals['success_rate']}% success)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Supervise capture workers")
+    parser.add_argument('command', choices=['run', 'status'])
+    parser.add_argument('configs', nargs='*', help="Worker config files (default: the main config)")
+    parser.add_argument('--config', default=None, help="Config holding the supervisor section")
+    parser.add_argument('--json', action='store_true', help="status: print JSON")
+    args = parser.parse_args()
+    
+    config = Config(args.config)
+    
+    if args.command == 'run':
+        run(config, [os.path.abspath(path) for path in args.configs])
+    else:
+        status(config, args.json)
+
+
+if __name__ == "__main__":
+    main()
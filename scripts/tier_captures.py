@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Storage Tiering Sweep
+Re-encodes captures that have aged into a configured tier, once
+
+Usage: python3 scripts/tier_captures.py [--dry-run] [--workers 3] [--dir ./captures]
+"""
+
+import argparse
+import os
+import sys
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app.config import Config
+from app.tiering import StorageTiering
+
+
+class _QuietLogger:
+    """Only the summary below is printed"""
+    
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+def mb(count):
+    """Bytes as MB for display"""
+    return f"{count / (1024 * 1024):.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one storage tiering sweep")
+    parser.add_argument('--config', default=None, help="Config file (default: config/default_config.yaml)")
+    parser.add_argument('--dir', default=None, help="Capture directory (default: from config)")
+    parser.add_argument('--workers', type=int, default=None, help="Encoder processes")
+    parser.add_argument('--max-files', type=int, default=None, help="Limit files re-encoded in this sweep")
+    parser.add_argument('--dry-run', action='store_true', help="Only list what is due")
+    parser.add_argument('--force', action='store_true',
+                        help="Run even with uploads enabled (re-encoded files may be uploaded again)")
+    args = parser.parse_args()
+    
+    config = Config(args.config).get_all()
+    if args.dir:
+        config['files']['capture_dir'] = args.dir
+    
+    tiering = config.setdefault('tiering', {})
+    if args.workers:
+        tiering['workers'] = args.workers
+    if args.max_files:
+        tiering['max_files_per_sweep'] = args.max_files
+    
+    if config.get('upload', {}).get('enabled') and not args.force and not args.dry_run:
+        # The running system consults the upload journal; a standalone sweep can't
+        print("Uploads are enabled: set tiering.enabled so the capture system tiers only "
+              "uploaded files, or pass --force")
+        sys.exit(1)
+    
+    catalog = None
+    if config.get('catalog', {}).get('enabled'):
+        from utils.catalog import CaptureCatalog
+        catalog = CaptureCatalog(config, _QuietLogger())
+    
+    sweeper = StorageTiering(config, _QuietLogger(), catalog=catalog)
+    if not sweeper.tiers:
+        print("No tiers configured (tiering.tiers)")
+        sys.exit(1)
+    
+    for index, tier in enumerate(sweeper.tiers, 1):
+        size = f"{tier.size[0]}x{tier.size[1]}" if tier.size else "original size"
+        print(f"Tier {index}: after {tier.after / 3600:g}h -> {tier.format} q{tier.quality}, {size}")
+    
+    if args.dry_run:
+        jobs = sweeper.plan()
+        due = [0] * len(sweeper.tiers)
+        for path, level, size, mtime in jobs:
+            due[level - 1] += 1
+        print(f"\n{len(jobs)} files due ({mb(sum(job[2] for job in jobs))}): "
+              + ", ".join(f"tier {index}: {count}" for index, count in enumerate(due, 1)))
+        return
+    
+    summary = sweeper.sweep()
+    sweeper.journal.close()
+    if catalog:
+        catalog.close()
+    
+    print(f"\nRe-encoded {summary['files']} files in {summary['elapsed']}s "
+          f"({sweeper.workers} workers, {summary['errors']} errors)")
+    print(f"  {mb(summary['bytes_before'])} -> {mb(summary['bytes_after'])}, "
+          f"{mb(summary['reclaimed'])} reclaimed")
+    print(f"  {summary['cpu_seconds']:.2f} CPU-seconds, "
+          f"{mb(summary['bytes_per_cpu_second'])} reclaimed per CPU-second")
+
+
+if __name__ == "__main__":
+    main()
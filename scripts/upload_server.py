@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pi Camera Integration System - Local Upload Stand-in Server
+Accepts HTTP PUT uploads (whole-file or Content-Range chunks) for testing the uploader
+
+Usage: python3 scripts/upload_server.py [--port 8000] [--dir ./uploaded]
+"""
+
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+
+CONTENT_RANGE = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """Stores PUT bodies under the server's upload directory"""
+    
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    
+    def log_message(self, format, *args):
+        """Silence per-request logging"""
+        pass
+    
+    def _target(self):
+        """Map request path to a local file"""
+        name = os.path.basename(unquote(self.path))
+        return os.path.join(self.server.upload_dir, name)
+    
+    def _reply(self, status, headers=None):
+        """Send an empty response"""
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    
+    def do_PUT(self):
+        """Handle whole-file or chunked upload"""
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        target = self._target()
+        partial = target + '.part'
+        
+        self.server.record(len(body))
+        
+        if self.server.fail_rate and self.server.should_fail():
+            self._reply(503)
+            return
+        
+        content_range = self.headers.get('Content-Range')
+        if not content_range:
+            with open(target, 'wb') as f:
+                f.write(body)
+            self._reply(201)
+            return
+        
+        match = CONTENT_RANGE.match(content_range)
+        if not match:
+            self._reply(400)
+            return
+        
+        start, end, total = (int(g) for g in match.groups())
+        stored = os.path.getsize(partial) if os.path.exists(partial) else 0
+        
+        if start != stored:
+            headers = {'Range': f"bytes=0-{stored - 1}"} if stored else {}
+            self._reply(416, headers)
+            return
+        
+        with open(partial, 'ab') as f:
+            f.write(body)
+        
+        if end + 1 >= total:
+            os.replace(partial, target)
+            self._reply(201)
+        else:
+            self._reply(308, {'Range': f"bytes=0-{end}"})
+
+
+class UploadServer(ThreadingHTTPServer):
+    """Threaded upload server with simple throughput accounting"""
+    
+    daemon_threads = True
+    
+    def __init__(self, address, upload_dir, fail_rate=0.0):
+        super().__init__(address, UploadHandler)
+        self.upload_dir = upload_dir
+        self.fail_rate = fail_rate
+        self.bytes_received = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        os.makedirs(upload_dir, exist_ok=True)
+    
+    def record(self, count):
+        with self._lock:
+            self.bytes_received += count
+            self.requests += 1
+    
+    def should_fail(self):
+        return random.random() < self.fail_rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the upload endpoint")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--dir', default='./uploaded', help="Where received files are stored")
+    parser.add_argument('--fail-rate', type=float, default=0.0,
+                        help="Fraction of requests answered with 503 (exercises retries)")
+    args = parser.parse_args()
+    
+    server = UploadServer((args.host, args.port), args.dir, args.fail_rate)
+    print(f"Upload server listening on http://{args.host}:{args.port}/ -> {args.dir}")
+    
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    try:
+        last_bytes = 0
+        while True:
+            time.sleep(5)
+            rate = (server.bytes_received - last_bytes) / 5 / 1024
+            last_bytes = server.bytes_received
+            print(f"requests={server.requests} received={server.bytes_received} bytes rate={rate:.1f} KB/s")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
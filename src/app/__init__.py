@@ -1,10 +1,43 @@
 """
 Application package for Pi Camera Integration System
+Classes are imported on first access so startup only loads what it uses
 """
 
-from .config import Config
-from .camera_interface import CameraInterface
-from .health_check import HealthCheck
-from .capture import CaptureSystem
+import importlib
 
-__all__ = ['Config', 'CameraInterface', 'HealthCheck', 'CaptureSystem']
+_EXPORTS = {
+    'Config': '.config',
+    'CameraInterface': '.camera_interface',
+    'HealthCheck': '.health_check',
+    'CaptureSystem': '.capture',
+    'Uploader': '.uploader',
+    'FrameStream': '.frame_stream',
+    'StreamServer': '.stream_server',
+    'SnapshotServer': '.snapshot_server',
+    'ValidationCache': '.validation_cache',
+    'DeviceMonitor': '.device_monitor',
+    'RetryPolicy': '.retry_policy',
+    'ConfigReloader': '.config_reloader',
+    'Scheduler': '.scheduler',
+    'RenditionEncoder': '.renditions',
+    'EventBuffer': '.event_buffer',
+    'SharedMetrics': '.shared_metrics',
+    'Supervisor': '.supervisor',
+    'LoadShedder': '.load_shedder',
+    'CoverageIndex': '.coverage',
+    'FaultInjectionCamera': '.fault_camera',
+    'StorageTiering': '.tiering',
+    'QualityGate': '.quality_gate',
+    'FleetAgent': '.fleet_agent',
+    'FleetAggregator': '.fleet_aggregator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Lazily import exported classes"""
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,7 +4,6 @@ Handles direct interaction with camera hardware via fswebcam
 """
 
 import os
-import subprocess
 import time
 
 
@@ -24,15 +23,45 @@ class CameraInterface:
         """
         self.config = config
         self.logger = logger
-        self.device = config['camera']['device']
+        self.apply_config(config)
+    
+    def apply_config(self, config):
+        """
+        Load camera settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        
+        # DeviceMonitor may have followed the camera to another node; keep that
+        # unless the configured device itself changed
+        configured = config['camera']['device']
+        if getattr(self, '_configured_device', None) != configured:
+            self.device = configured
+        self._configured_device = configured
+        
         self.resolution = config['camera']['resolution']
         self.warmup_delay = config['camera']['warmup_delay']
+        self.warmup_mode = config['camera'].get('warmup_mode', 'delay')
+        self.warmup_timeout = config['camera'].get('warmup_timeout', 5)
+        self.warmup_tolerance = config['camera'].get('warmup_tolerance', 2.0)
+        self.warmup_stable_frames = config['camera'].get('warmup_stable_frames', 2)
+        self.warmup_skip_frames = config['camera'].get('warmup_skip_frames', 2)
         self.timeout = config['camera']['capture_timeout']
         self.quality = config['capture']['quality']
         
         # fswebcam flags
         self.fswebcam_flags = config['fswebcam']['flags']
         self.custom_params = config['fswebcam'].get('custom_params', [])
+        
+        # sysfs/devfs locations (overridable to point at a fake tree for testing)
+        from .device_monitor import SYSFS_VIDEO_ROOT, DEV_ROOT
+        
+        hotplug = config.get('hotplug', {})
+        self.sysfs_root = hotplug.get('sysfs_root', SYSFS_VIDEO_ROOT)
+        self.dev_root = hotplug.get('dev_root', DEV_ROOT)
+        self.reset_settle = hotplug.get('reset_settle', 1.0)
     
     def is_device_present(self):
         """
@@ -77,34 +106,135 @@ class CameraInterface:
         Returns:
             list: List of device paths
         """
+        # Enumerate from sysfs when available instead of probing blindly
+        if os.path.isdir(self.sysfs_root):
+            from .device_monitor import discover_devices
+            return [d['path'] for d in discover_devices(self.sysfs_root, self.dev_root)
+                    if d['present']]
+        
         devices = []
         for i in range(10):  # Check video0 through video9
-            device = f"/dev/video{i}"
+            device = os.path.join(self.dev_root, f"video{i}")
             if os.path.exists(device):
                 devices.append(device)
         
         return devices
     
-    def warm_up(self):
+    def warm_up(self, delay=None, stream=None):
         """
         Wait for camera to initialize after connection
-        Prevents "device busy" errors on first capture
+        Prevents "device busy" errors and dark first frames
+        
+        In 'delay' mode this sleeps warmup_delay. In 'frames' mode it reads
+        frames and returns once mean luminance has settled (or warmup_timeout
+        passes), so a warm camera is ready at once and a dark scene gets
+        the time its auto exposure needs.
+        
+        Args:
+            delay: Optional override for the configured warmup_delay (delay mode)
+            stream: Optional running FrameStream to read from (frames mode);
+                    otherwise a stream is opened for the warm-up only
+                    
+        Returns:
+            dict: seconds, frames, luminance and converged (None in delay mode)
         """
-        if self.warmup_delay > 0:
-            self.logger.debug(f"Warming up camera for {self.warmup_delay}s...")
-            time.sleep(self.warmup_delay)
+        if self.warmup_mode == 'frames':
+            return self._warm_up_frames(stream)
+        
+        if delay is None:
+            delay = self.warmup_delay
+        
+        if delay > 0:
+            self.logger.debug(f"Warming up camera for {delay}s...")
+            time.sleep(delay)
+        
+        return {'seconds': delay, 'frames': 0, 'luminance': None, 'converged': None}
     
-    def capture_image(self, output_path):
+    def _warm_up_frames(self, stream=None):
         """
-        Capture single image using fswebcam
+        Discard frames until consecutive mean luminance stays within tolerance
         
         Args:
-            output_path: Full path where image should be saved
+            stream: Optional running FrameStream
             
         Returns:
-            tuple: (success: bool, error_message: str or None)
+            dict: seconds, frames, luminance and converged
+        """
+        from utils.luminance import mean_luminance
+        
+        started = time.monotonic()
+        deadline = started + self.warmup_timeout
+        
+        owned = stream is None
+        if owned:
+            from .frame_stream import FrameStream
+            stream = FrameStream(self.config, self.logger, self)
+            stream.start()
+        
+        frames = 0
+        stable = 0
+        level = None
+        converged = False
+        latest = stream.get_latest()
+        seq = latest[0] if latest else 0
+        
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                result = stream.wait_for_frame(seq, timeout=remaining)
+                if result is None:
+                    break
+                
+                seq, _, frame = result
+                frames += 1
+                if frames <= self.warmup_skip_frames:
+                    # First frames after stream-on are often black or stale
+                    continue
+                
+                current = mean_luminance(frame)
+                if current is None:
+                    continue
+                
+                if level is not None and abs(current - level) <= self.warmup_tolerance:
+                    stable += 1
+                else:
+                    stable = 0
+                level = current
+                
+                if stable >= self.warmup_stable_frames:
+                    converged = True
+                    break
+        
+        finally:
+            if owned:
+                stream.stop()
+        
+        seconds = round(time.monotonic() - started, 2)
+        luminance = round(level, 1) if level is not None else None
+        
+        if converged:
+            self.logger.debug(f"Exposure settled after {seconds}s ({frames} frames, luminance {luminance})")
+        else:
+            self.logger.warning(
+                f"Exposure did not settle within {self.warmup_timeout}s "
+                f"({frames} frames, luminance {luminance})"
+            )
+        
+        return {'seconds': seconds, 'frames': frames, 'luminance': luminance, 'converged': converged}
+    
+    def _build_command(self, output_path):
+        """
+        Build fswebcam command line
+        
+        Args:
+            output_path: Output file path ('-' for stdout)
+            
+        Returns:
+            list: Command and arguments
         """
-        # Build fswebcam command
         cmd = ['fswebcam']
         cmd.extend(self.fswebcam_flags)
         cmd.extend([
@@ -114,6 +244,26 @@ class CameraInterface:
         ])
         cmd.extend(self.custom_params)
         cmd.append(output_path)
+        return cmd
+    
+    def capture_image(self, output_path, timeout=None):
+        """
+        Capture single image using fswebcam
+        
+        Args:
+            output_path: Full path where image should be saved
+            timeout: Optional override for capture_timeout (seconds)
+            
+        Returns:
+            tuple: (success: bool, error_message: str or None)
+        """
+        # Deferred so startup doesn't pay for subprocess until the first capture
+        import subprocess
+        
+        if timeout is None:
+            timeout = self.timeout
+        
+        cmd = self._build_command(output_path)
         
         self.logger.debug(f"Executing: {' '.join(cmd)}")
         
@@ -121,7 +271,7 @@ class CameraInterface:
             # Execute fswebcam with timeout
             result = subprocess.run(
                 cmd,
-                timeout=self.timeout,
+                timeout=timeout,
                 capture_output=True,
                 text=True
             )
@@ -136,7 +286,7 @@ class CameraInterface:
                 return (False, error_msg)
         
         except subprocess.TimeoutExpired:
-            error_msg = f"Capture timeout after {self.timeout}s"
+            error_msg = f"Capture timeout after {timeout}s"
             self.logger.error(error_msg)
             return (False, error_msg)
         
@@ -150,6 +300,39 @@ class CameraInterface:
             self.logger.error(error_msg)
             return (False, error_msg)
     
+    def grab_frame(self):
+        """
+        Capture single frame into memory (fswebcam writes JPEG to stdout)
+        
+        Returns:
+            tuple: (frame: bytes or None, error_message: str or None)
+        """
+        import subprocess
+        
+        cmd = self._build_command('-')
+        
+        try:
+            result = subprocess.run(
+                cmd,
+                timeout=self.timeout,
+                capture_output=True
+            )
+            
+            if result.returncode == 0 and result.stdout:
+                return (result.stdout, None)
+            
+            error_msg = result.stderr.decode(errors='replace').strip() or "Empty frame"
+            return (None, error_msg)
+        
+        except subprocess.TimeoutExpired:
+            return (None, f"Capture timeout after {self.timeout}s")
+        
+        except FileNotFoundError:
+            return (None, "fswebcam not found - is it installed?")
+        
+        except Exception as e:
+            return (None, f"Capture exception: {str(e)}")
+    
     def test_capture(self):
         """
         Perform test capture to verify camera functionality
@@ -179,6 +362,8 @@ class CameraInterface:
         Returns:
             dict: Device information or None if unavailable
         """
+        import subprocess
+        
         try:
             result = subprocess.run(
                 ['v4l2-ctl', '--device', self.device, '--all'],
@@ -189,7 +374,7 @@ class CameraInterface:
             
             if result.returncode == 0:
                 return {'raw_info': result.stdout}
-            
+        
         except Exception as e:
             self.logger.debug(f"Could not get device info: {e}")
         
@@ -197,15 +382,49 @@ class CameraInterface:
     
     def reset_device(self):
         """
-        Attempt to reset camera device (requires root)
-        This is a placeholder for device reset logic
+        Reset camera by de-authorizing and re-authorizing its USB device
+        Equivalent to an unplug/replug; requires write access to sysfs (root)
         
         Returns:
-            bool: True if reset attempted
+            bool: True if the reset was performed
         """
-        self.logger.warning("Device reset requested (not implemented)")
-        # In production, this might involve:
-        # - Unbinding/rebinding USB device
-        # - Reloading kernel module
-        # - Power cycling via GPIO
-        return False
+        from .device_monitor import discover_devices
+        
+        real_device = os.path.realpath(self.device)
+        usb_device = None
+        
+        for info in discover_devices(self.sysfs_root, self.dev_root):
+            if os.path.realpath(info['path']) == real_device:
+                usb_device = info['usb_device']
+                break
+        
+        if not usb_device:
+            self.logger.warning(f"Device reset unavailable: no USB device found for {self.device}")
+            return False
+        
+        authorized = os.path.join(usb_device, 'authorized')
+        self.logger.warning(f"Resetting camera USB device {os.path.basename(usb_device)}...")
+        
+        try:
+            with open(authorized, 'w') as f:
+                f.write('0')
+        except OSError as e:
+            self.logger.error(f"Device reset failed: {e}")
+            return False
+        
+        # Once de-authorized the device must be re-authorized whatever happens,
+        # or it stays off until it is physically replugged
+        reauthorized = False
+        try:
+            time.sleep(self.reset_settle)
+        finally:
+            try:
+                with open(authorized, 'w') as f:
+                    f.write('1')
+                reauthorized = True
+            except OSError as e:
+                self.logger.error(f"Device re-authorization failed, camera stays disabled: {e}")
+        
+        if reauthorized:
+            self.logger.info("Camera USB device re-authorized")
+        return reauthorized
@@ -3,9 +3,12 @@ Capture System Module
 Main orchestration layer for automated image capture
 """
 
-import time
+import os
 import signal
 import sys
+import threading
+
+from utils.clock import SystemClock
 
 
 class CaptureSystem:
@@ -14,7 +17,12 @@ class CaptureSystem:
     Manages capture loop, retries, health monitoring, and graceful shutdown
     """
     
-    def __init__(self, config, logger, camera, file_manager, health_check):
+    def __init__(self, config, logger, camera, file_manager, health_check,
+                 uploader=None, frame_stream=None, frame_cache=None,
+                 validation_cache=None, device_monitor=None, retry_policy=None,
+                 config_reloader=None, scheduler=None, renditions=None,
+                 metrics_publisher=None, load_shedder=None, coverage=None, quality_gate=None,
+                 catalog=None, journal=None, clock=None):
         """
         Initialize capture system
         
@@ -24,19 +32,186 @@ class CaptureSystem:
             camera: CameraInterface instance
             file_manager: FileManager instance
             health_check: HealthCheck instance
+            uploader: Optional Uploader instance for offloading captures
+            frame_stream: Optional FrameStream that owns the camera while streaming
+            frame_cache: Optional FrameCache holding the latest frames in memory
+            validation_cache: Optional ValidationCache enabling fast-start validation
+            device_monitor: Optional DeviceMonitor for hotplug pause/resume
+            retry_policy: Optional RetryPolicy (adaptive timeouts, backoff, breaker)
+            config_reloader: Optional ConfigReloader for live config changes
+            scheduler: Optional Scheduler replacing the fixed interval with calendar rules
+            renditions: Optional RenditionEncoder deriving extra outputs from each capture
+            metrics_publisher: Optional MetricsPublisher (heartbeat for a supervisor)
+            load_shedder: Optional LoadShedder degrading capture under resource pressure
+            coverage: Optional CoverageIndex recording captured and missed slots
+            quality_gate: Optional QualityGate retrying or flagging blank/badly exposed frames
+            catalog: Optional CaptureCatalog recording every stored frame
+            journal: Optional EventJournal recording every capture attempt
+            clock: Optional time source (default: SystemClock; VirtualClock for soak tests)
         """
         self.config = config
         self.logger = logger
         self.camera = camera
         self.file_manager = file_manager
         self.health = health_check
+        self.uploader = uploader
+        self.frame_stream = frame_stream
+        self.frame_cache = frame_cache
+        self.validation_cache = validation_cache
+        self.device_monitor = device_monitor
+        self.retry_policy = retry_policy
+        self.config_reloader = config_reloader
+        self.scheduler = scheduler
+        self.renditions = renditions
+        self.metrics_publisher = metrics_publisher
+        self.load_shedder = load_shedder
+        self.coverage = coverage
+        self.quality_gate = quality_gate
+        self.catalog = catalog
+        self.journal = journal
+        self.clock = clock or SystemClock()
+        self._reset_attempted = False
+        self._slot = None
+        
+        # Fixed-rate pacing (high-rate mode) and time-based cleanup
+        self._next_due = None
+        self._last_cleanup = None
+        self.overruns = 0
+        
+        # Sequence numbers continue across restarts
+        if catalog:
+            file_manager.seq = max(file_manager.seq, catalog.last_seq)
+        
+        self.apply_config(config)
         
+        # Set by a fast-start validation hit (None keeps camera.warmup_delay)
+        self.warmup_delay = None
+        
+        self.running = False
+        self._wake = threading.Event()
+        self._setup_signal_handlers()
+    
+    def apply_config(self, config):
+        """
+        Load capture loop settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
         self.interval = config['capture']['interval']
         self.max_retries = config['capture']['retry_attempts']
         self.retry_delay = config['capture']['retry_delay']
         
-        self.running = False
-        self._setup_signal_handlers()
+        # High-rate mode: fixed frame rate from the live stream instead of an interval
+        high_rate = config.get('high_rate', {}) or {}
+        self.high_rate = high_rate.get('enabled', False)
+        if self.high_rate:
+            self.interval = 1.0 / high_rate.get('fps', 10)
+            # The next frame is a better retry than waiting retry_delay for this one
+            self.max_retries = high_rate.get('retry_attempts', 1)
+        self.reset_on_failure = config.get('hotplug', {}).get('reset_on_failure', True)
+    
+    def wake(self):
+        """Interrupt the inter-capture wait (stop or pending reload)"""
+        self._wake.set()
+    
+    def _wait(self, seconds):
+        """
+        Wait until the next capture, applying config reloads as they arrive
+        
+        Args:
+            seconds: Time to wait
+        """
+        started = self.clock.monotonic()
+        
+        while self.running:
+            remaining = started + seconds - self.clock.monotonic()
+            if remaining <= 0:
+                return
+            
+            # Keep the supervisor heartbeat alive through long waits
+            if self.metrics_publisher:
+                remaining = min(remaining, self.metrics_publisher.interval)
+                self.metrics_publisher.publish()
+            
+            if self.clock.wait(self._wake, remaining):
+                self._wake.clear()
+                
+                if self.config_reloader and self.config_reloader.apply_pending():
+                    if self.scheduler:
+                        # Schedule may have changed, let the caller re-read it
+                        return
+                    
+                    # Interval may have changed, measure from the same start
+                    seconds = self._current_interval()
+    
+    def _current_interval(self):
+        """Capture interval, stretched while load shedding asks for it"""
+        if self.load_shedder:
+            return self.interval * self.load_shedder.interval_factor
+        return self.interval
+    
+    def _wait_for_frame_slot(self, period):
+        """
+        Wait for the next fixed-rate frame time (high-rate mode)
+        Unlike _wait, time spent capturing counts against the period; a
+        capture that overruns it starts the next one at once
+        
+        Args:
+            period: Seconds between frame starts
+        """
+        now = self.clock.monotonic()
+        self._next_due = (self._next_due or now) + period
+        
+        if self._next_due <= now:
+            self.overruns += 1
+            self._next_due = now
+            return
+        
+        self._wait(self._next_due - now)
+    
+    def _cleanup_due(self):
+        """
+        Check whether old captures should be cleaned up now
+        
+        Returns:
+            bool: True every 10 captures, or every files.cleanup_interval seconds if set
+        """
+        if not self.file_manager.cleanup_interval:
+            return self.health.total_captures % 10 == 0
+        
+        now = self.clock.monotonic()
+        if self._last_cleanup is not None and now - self._last_cleanup < self.file_manager.cleanup_interval:
+            return False
+        
+        self._last_cleanup = now
+        return True
+    
+    def _wait_for_slot(self):
+        """
+        Sleep until the scheduler's next capture time
+        
+        Returns:
+            bool: True when a slot is due, False if stopped or the schedule has ended
+        """
+        while self.running:
+            slot = self.scheduler.peek()
+            if slot is None:
+                self.logger.warning("Capture schedule has no further slots, stopping")
+                return False
+            
+            now = self.clock.time()
+            remaining = slot - now
+            if remaining <= 0:
+                self._slot = slot
+                rule = self.scheduler.advance(now)
+                self.logger.debug(f"Schedule slot due ({rule})")
+                return True
+            
+            self._wait(remaining)
+        
+        return False
     
     def _setup_signal_handlers(self):
         """Setup graceful shutdown on SIGINT and SIGTERM"""
@@ -52,6 +227,8 @@ class CaptureSystem:
             frame: Current stack frame
         """
         self.logger.info(f"Received signal {signum}, shutting down gracefully...")
+        # Only flag the stop: the handler runs in the middle of a capture, and
+        # the loop tears down storage once that capture has finished
         self.stop()
     
     def capture_with_retry(self):
@@ -63,30 +240,114 @@ class CaptureSystem:
         """
         output_path = self.file_manager.generate_filename()
         
+        # While streaming, the stream holds the device and stills are taken from it
+        if self.frame_stream and self.frame_stream.is_running():
+            source = self.frame_stream
+        else:
+            source = self.camera
+        
         for attempt in range(1, self.max_retries + 1):
-            success, error = self.camera.capture_image(output_path)
+            # Breaker open: leave the camera alone until its cool-down ends
+            if self.retry_policy and not self.retry_policy.allow_attempt():
+                if attempt == 1:
+                    self.logger.debug("Circuit breaker open, capture skipped")
+                    if self.journal:
+                        self.journal.record('missed', 0, 0.0, error='breaker_open', timestamp=self.clock.time())
+                    return False
+                break
+            
+            timeout = self.retry_policy.get_timeout() if self.retry_policy else None
+            started = self.clock.monotonic()
+            success, error = source.capture_image(output_path, timeout=timeout)
+            latency = self.clock.monotonic() - started
             
             if success:
-                # Verify file was created
-                if self.file_manager.verify_file_exists(output_path):
-                    self.logger.log_capture_success(
-                        self.file_manager._get_filename(output_path),
-                        attempt
-                    )
+                # Verify file was created and is a complete JPEG
+                valid, reason = self.file_manager.verify_capture(output_path)
+                
+                # A valid JPEG can still be a black, white or blank frame
+                verdict = self.quality_gate.check(output_path) if valid and self.quality_gate else 'ok'
+                if self.quality_gate and self.quality_gate.should_retry(verdict, attempt, self.max_retries):
+                    # The camera worked, so this is not a failure for the breaker
+                    self.logger.warning(f"Bad frame ({verdict}), capturing again ({attempt}/{self.max_retries})")
+                    if self.journal:
+                        self.journal.record('bad_frame', attempt, latency, error=verdict, timestamp=self.clock.time())
+                    self.clock.sleep(self.quality_gate.retry_delay)
+                    continue
+                
+                if valid:
+                    if self.quality_gate:
+                        self.quality_gate.record(verdict, self.file_manager._get_filename(output_path))
+                    
+                    if self.retry_policy:
+                        self.retry_policy.record_success(latency)
+                    
+                    size = os.path.getsize(output_path)
+                    if self.journal:
+                        self.journal.record(
+                            'ok', attempt, latency, size,
+                            error=verdict if verdict != 'ok' else None,
+                            seq=self.file_manager.seq,
+                            timestamp=self.clock.time()
+                        )
+                    
+                    if not self.journal or self.journal.log_successes:
+                        self.logger.log_capture_success(
+                            self.file_manager._get_filename(output_path),
+                            attempt
+                        )
                     self.health.record_capture_attempt(True)
+                    
+                    if self.frame_cache:
+                        self.frame_cache.put_file(output_path)
+                    
+                    # Extra sizes/formats come from this frame, not another capture
+                    outputs = [output_path]
+                    if self.renditions:
+                        if self.load_shedder and self.load_shedder.skip_post_processing:
+                            self.load_shedder.skipped_post_processing += 1
+                        else:
+                            outputs.extend(self.renditions.render(output_path))
+                    
+                    if self.catalog:
+                        self.catalog.add(
+                            self.file_manager.seq,
+                            os.path.basename(output_path),
+                            self.clock.time(),
+                            size
+                        )
+                    
+                    # Ring storage absorbs the original frame (renditions stay files)
+                    if self.file_manager.store_capture(output_path) is None:
+                        outputs.remove(output_path)
+                    
+                    if self.uploader:
+                        for path in outputs:
+                            self.uploader.enqueue(path)
+                    
                     return True
                 else:
-                    error = "File verification failed"
+                    error = f"File verification failed: {reason}"
             
             # Capture failed
+            if self.retry_policy:
+                self.retry_policy.record_failure()
+            
             self.logger.log_capture_failure(error, attempt, self.max_retries)
+            if self.journal:
+                self.journal.record('failed', attempt, latency, error=error, timestamp=self.clock.time())
             
             # Don't delay after last attempt
             if attempt < self.max_retries:
-                time.sleep(self.retry_delay)
+                if self.retry_policy:
+                    self.clock.sleep(self.retry_policy.get_backoff(attempt))
+                else:
+                    self.clock.sleep(self.retry_delay)
         
         # All retries exhausted
         self.health.record_capture_attempt(False)
+        if self.journal:
+            self.journal.record('missed', attempt, 0.0, error=error or 'breaker_open', timestamp=self.clock.time())
         return False
     
     def run_single_capture(self):
@@ -107,7 +368,7 @@ class CaptureSystem:
             return False
         
         # Camera warm-up
-        self.camera.warm_up()
+        self._warm_up()
         
         # Capture
         success = self.capture_with_retry()
@@ -134,53 +395,187 @@ class CaptureSystem:
             return
         
         # Initial warm-up
-        self.camera.warm_up()
+        self._warm_up()
         
-        self.logger.info(f"Starting continuous capture (interval: {self.interval}s)")
+        if self.scheduler:
+            self.scheduler.reset(self.clock.time())
+            self.logger.info(f"Starting scheduled capture ({len(self.scheduler.rules)} rules)")
+        else:
+            self.logger.info(f"Starting continuous capture (interval: {self.interval}s)")
         
         try:
             while self.running:
+                # Scheduled mode sleeps until the next calendar slot first
+                # (under load shedding only every Nth slot is taken)
+                if self.scheduler:
+                    stride = self.load_shedder.interval_factor if self.load_shedder else 1
+                    if not all(self._wait_for_slot() for _ in range(stride)):
+                        break
+                
+                # Camera unplugged: pause until it is reattached instead of failing
+                if self.device_monitor and not self.device_monitor.is_present():
+                    if not self._wait_for_reconnect():
+                        break
+                    continue
+                
+                # A capture succeeded since the last reset, allow another one
+                if self.health.consecutive_failures == 0:
+                    self._reset_attempted = False
+                
                 # Periodic health check
                 if self.health.should_run_health_check():
                     status, details = self.health.check_camera_health()
                     
+                    if status == 'failed' and self._try_device_reset():
+                        continue
+                    
                     if status == 'failed':
                         self.logger.critical("Health check failed, stopping system")
+                        
+                        # Force a full validation on the next start
+                        if self.validation_cache:
+                            self.validation_cache.invalidate()
                         break
                     elif status == 'degraded':
                         self.logger.warning(f"System degraded: {details}")
                 
+                # Pick quality/resolution for current resource pressure
+                if self.load_shedder:
+                    self.load_shedder.update()
+                
                 # Capture image
-                self.capture_with_retry()
+                slot = self._slot if self.scheduler else self.clock.time()
+                captured = self.capture_with_retry()
+                
+                if self.coverage:
+                    self.coverage.record(slot, captured, self.clock.time())
                 
-                # Cleanup old files periodically (every 10 captures)
-                if self.health.total_captures % 10 == 0:
+                if self.metrics_publisher:
+                    self.metrics_publisher.publish()
+                
+                # Cleanup old files periodically (every 10 captures or cleanup_interval)
+                if self._cleanup_due():
                     self.file_manager.cleanup_old_captures()
                 
                 # Wait for next interval
-                if self.running:
-                    time.sleep(self.interval)
+                if self.running and not self.scheduler:
+                    if self.high_rate:
+                        self._wait_for_frame_slot(self._current_interval())
+                    else:
+                        self._wait(self._current_interval())
         
         except Exception as e:
             self.logger.critical(f"Unexpected error in main loop: {e}")
         
         finally:
-            self.stop()
+            self.running = False
+            self._shutdown()
     
-    def stop(self):
-        """Stop the capture system gracefully"""
-        if not self.running:
-            return
+    def _wait_for_reconnect(self):
+        """
+        Pause capture until the device monitor sees the camera again
+        
+        Returns:
+            bool: True if the camera is back, False if the system was stopped
+        """
+        self.logger.warning("Camera removed, capture paused until it is reattached")
+        
+        while self.running:
+            # Waiting on hardware is not a hang, keep the heartbeat going
+            if self.metrics_publisher:
+                self.metrics_publisher.publish()
+            
+            if self.device_monitor.wait_for_device(timeout=1.0):
+                self.logger.info("Camera reattached, resuming capture")
+                self._warm_up()
+                return True
+        
+        return False
+    
+    def _try_device_reset(self):
+        """
+        Reset a present but unresponsive camera once per failure streak
         
+        Returns:
+            bool: True if the device was reset and capture should continue
+        """
+        if not self.reset_on_failure or self._reset_attempted:
+            return False
+        
+        if not self.camera.is_device_present():
+            return False
+        
+        self._reset_attempted = True
+        
+        if not self.camera.reset_device():
+            return False
+        
+        self.health.clear_failure_streak()
+        
+        # Reset looks like an unplug/replug; give the device time to return
+        if self.device_monitor:
+            self.device_monitor.wait_for_device(timeout=10)
+        
+        self._warm_up()
+        return True
+    
+    def _warm_up(self):
+        """Warm the camera up and record how long it took"""
+        # While streaming, the stream holds the device; warm up on its frames
+        stream = self.frame_stream if self.frame_stream and self.frame_stream.is_running() else None
+        result = self.camera.warm_up(self.warmup_delay, stream=stream)
+        
+        if result:
+            self.health.record_warmup(result['seconds'], result['frames'], result['converged'])
+    
+    def stop(self):
+        """
+        Stop the capture system gracefully
+        Safe from signal handlers and other threads: the capture loop finishes
+        the current capture, then shuts down
+        """
         self.running = False
+        self._wake.set()
+    
+    def _shutdown(self):
+        """Report final statistics and close storage (called by the capture loop on exit)"""
         self.logger.log_system_stop()
         
+        if self.high_rate:
+            self.logger.info(
+                f"High-rate capture: {self.health.successful_captures} frames, "
+                f"{self.overruns} late starts, {self.file_manager.collisions} name collisions avoided"
+            )
+        
         # Print final metrics
         self.health.print_metrics()
         
+        # Stop background uploads (unsent files are picked up on next start)
+        if self.uploader:
+            stats = self.uploader.get_stats()
+            self.logger.info(
+                f"Upload Stats: {stats['uploaded_files']} files, "
+                f"{stats['uploaded_mb']} MB, {stats['queue_depth']} queued"
+            )
+            self.uploader.stop()
+        
+        if self.renditions:
+            self.renditions.stop()
+        
         # Print capture statistics
         stats = self.file_manager.get_capture_stats()
         self.logger.info(f"Capture Stats: {stats['count']} files, {stats['total_size_mb']} MB")
+        
+        self.file_manager.close()
+        
+        if self.coverage:
+            self.coverage.close()
+        
+        if self.catalog:
+            self.catalog.close()
+        
+        if self.journal:
+            self.journal.close()
     
     def validate_system(self):
         """
@@ -202,6 +597,14 @@ class CaptureSystem:
             self.logger.info("Hint: Try running with sudo or add user to 'video' group")
             return False
         
+        # Fast start: a recent full validation of the same device, driver and
+        # config stands in for the test capture
+        if self.validation_cache and self.validation_cache.is_valid():
+            self.file_manager._ensure_directories()
+            self.warmup_delay = self.config.get('startup', {}).get('warmup_delay')
+            self.logger.info("System validation passed (cached) ✓")
+            return True
+        
         # List available devices
         devices = self.camera.list_available_devices()
         self.logger.info(f"Available video devices: {devices}")
@@ -214,6 +617,9 @@ class CaptureSystem:
         # Check directories
         self.file_manager._ensure_directories()
         
+        if self.validation_cache:
+            self.validation_cache.store()
+        
         self.logger.info("System validation passed ✓")
         return True
 
@@ -4,7 +4,6 @@ Loads and validates system configuration from YAML
 """
 
 import os
-import yaml
 
 
 class Config:
@@ -15,6 +14,254 @@ class Config:
     
     DEFAULT_CONFIG_PATH = "config/default_config.yaml"
     
+    # Per-section settings: key -> (allowed types, required, rule)
+    # rule is None, a (min, max) range (None = unbounded) or a list of choices.
+    # Optional sections are only checked when present.
+    SCHEMA = {
+        'camera': {
+            'device': ((str,), True, None),
+            'resolution': ((str,), True, None),
+            'warmup_delay': ((int, float), True, (0, None)),
+            'warmup_mode': ((str,), False, ['delay', 'frames']),
+            'warmup_timeout': ((int, float), False, (0, None)),
+            'warmup_tolerance': ((int, float), False, (0, 255)),
+            'warmup_stable_frames': ((int,), False, (1, None)),
+            'warmup_skip_frames': ((int,), False, (0, None)),
+            'capture_timeout': ((int, float), True, (0.1, None)),
+        },
+        'capture': {
+            'interval': ((int, float), True, (0, None)),
+            'retry_attempts': ((int,), True, (1, None)),
+            'retry_delay': ((int, float), True, (0, None)),
+            'output_format': ((str,), False, ['jpg', 'jpeg']),
+            'quality': ((int,), True, (1, 100)),
+            'outputs': ((list,), False, None),
+            'output_workers': ((int,), False, (1, 64)),
+        },
+        'files': {
+            'capture_dir': ((str,), True, None),
+            'log_dir': ((str,), True, None),
+            'filename_pattern': ((str,), True, None),
+            'max_capture_age_days': ((int, float), True, (0, None)),
+            'verify_jpeg': ((bool,), False, None),
+            'storage': ((str,), False, ['files', 'ring']),
+            'ring': ((dict,), False, None),
+            'cleanup_interval': ((int, float), False, (0, None)),
+        },
+        'logging': {
+            'level': ((str,), True, ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']),
+            'log_file': ((str,), True, None),
+            'console_output': ((bool,), True, None),
+            'max_log_size_mb': ((int, float), True, (0, None)),
+            'backup_count': ((int,), True, (0, None)),
+        },
+        'health': {
+            'check_interval': ((int, float), True, (0, None)),
+            'max_consecutive_failures': ((int,), True, (1, None)),
+            'alert_on_disconnect': ((bool,), True, None),
+        },
+        'fswebcam': {
+            'flags': ((list,), True, None),
+            'custom_params': ((list,), False, None),
+        },
+        'upload': {
+            'enabled': ((bool,), False, None),
+            'endpoint': ((str,), False, None),
+            'concurrency': ((int,), False, (1, 64)),
+            'chunk_size_mb': ((int, float), False, (0.01, None)),
+            'max_retries': ((int,), False, (1, None)),
+            'backoff_base': ((int, float), False, (0, None)),
+            'backoff_max': ((int, float), False, (0, None)),
+            'scan_interval': ((int, float), False, (0.1, None)),
+            'settle_time': ((int, float), False, (0, None)),
+            'timeout': ((int, float), False, (0.1, None)),
+            'include_patterns': ((list,), False, None),
+            'journal_file': ((str,), False, None),
+            'delete_after_upload': ((bool,), False, None),
+        },
+        'stream': {
+            'enabled': ((bool,), False, None),
+            'backend': ((str,), False, ['ffmpeg', 'fswebcam']),
+            'input_format': ((str,), False, None),
+            'fps': ((int,), False, (1, 120)),
+            'restart_delay': ((int, float), False, (0, None)),
+            'host': ((str,), False, None),
+            'port': ((int,), False, (0, 65535)),
+            'max_clients': ((int,), False, (1, None)),
+            'client_timeout': ((int, float), False, (0.1, None)),
+        },
+        'snapshot': {
+            'enabled': ((bool,), False, None),
+            'cache_frames': ((int,), False, (1, None)),
+            'host': ((str,), False, None),
+            'port': ((int,), False, (0, 65535)),
+            'unix_socket': ((str,), False, None),
+        },
+        'startup': {
+            'fast_start': ((bool,), False, None),
+            'cache_file': ((str,), False, None),
+            'cache_max_age_hours': ((int, float), False, (0, None)),
+            'warmup_delay': ((int, float), False, (0, None)),
+        },
+        'hotplug': {
+            'enabled': ((bool,), False, None),
+            'method': ((str,), False, ['auto', 'inotify', 'netlink', 'poll']),
+            'sysfs_root': ((str,), False, None),
+            'dev_root': ((str,), False, None),
+            'poll_interval': ((int, float), False, (0.01, None)),
+            'settle_time': ((int, float), False, (0, None)),
+            'reset_on_failure': ((bool,), False, None),
+            'reset_settle': ((int, float), False, (0, None)),
+        },
+        'retry': {
+            'adaptive': ((bool,), False, None),
+            'timeout_percentile': ((int, float), False, (0, 1)),
+            'timeout_factor': ((int, float), False, (1, None)),
+            'min_timeout': ((int, float), False, (0.1, None)),
+            'max_timeout': ((int, float), False, (0.1, None)),
+            'min_samples': ((int,), False, (1, None)),
+            'window': ((int,), False, (1, None)),
+            'backoff_max': ((int, float), False, (0, None)),
+            'breaker_threshold': ((int,), False, (1, None)),
+            'breaker_cooldown': ((int, float), False, (0, None)),
+            'breaker_max_cooldown': ((int, float), False, (0, None)),
+            'half_open_trials': ((int,), False, (1, None)),
+        },
+        'schedule': {
+            'enabled': ((bool,), False, None),
+            'rules': ((list,), False, None),
+        },
+        'events': {
+            'enabled': ((bool,), False, None),
+            'pre_seconds': ((int, float), False, (0, None)),
+            'post_seconds': ((int, float), False, (0, None)),
+            'max_memory_mb': ((int, float), False, (1, None)),
+            'events_dir': ((str,), False, None),
+            'retention_days': ((int, float), False, (0, None)),
+            'trigger_signal': ((bool,), False, None),
+            'trigger_host': ((str,), False, None),
+            'trigger_port': ((int,), False, (0, 65535)),
+            'trigger_socket': ((str,), False, None),
+            'trigger_file': ((str,), False, None),
+            'file_poll_interval': ((int, float), False, (0.05, None)),
+            'motion_threshold': ((int, float), False, (0, 255)),
+            'motion_every': ((int,), False, (1, None)),
+        },
+        'supervisor': {
+            'shm_name': ((str,), False, None),
+            'heartbeat_interval': ((int, float), False, (0.1, None)),
+            'stall_timeout': ((int, float), False, (1, None)),
+            'startup_timeout': ((int, float), False, (1, None)),
+            'restart_delay': ((int, float), False, (0, None)),
+            'max_restart_delay': ((int, float), False, (0, None)),
+            'stable_after': ((int, float), False, (0, None)),
+            'poll_interval': ((int, float), False, (0.05, None)),
+            'stop_timeout': ((int, float), False, (1, None)),
+        },
+        'load_shedding': {
+            'enabled': ((bool,), False, None),
+            'check_interval': ((int, float), False, (0, None)),
+            'recover_after': ((int, float), False, (0, None)),
+            'proc_root': ((str,), False, None),
+            'sys_root': ((str,), False, None),
+            'thermal_zone': ((str,), False, None),
+            'disk_path': ((str,), False, None),
+            'thresholds': ((dict,), False, None),
+            'margins': ((dict,), False, None),
+            'levels': ((list,), False, None),
+        },
+        'simulation': {
+            'enabled': ((bool,), False, None),
+            'seed': ((int,), False, None),
+            'realtime': ((bool,), False, None),
+            'base_latency': ((int, float), False, (0, None)),
+            'frame_size': ((str,), False, None),
+            'faults': ((list,), False, None),
+        },
+        'coverage': {
+            'enabled': ((bool,), False, None),
+            'index_file': ((str,), False, None),
+            'sync_interval': ((int, float), False, (0, None)),
+            'retention_days': ((int, float), False, (1, None)),
+            'tolerance': ((int, float), False, (0, 1)),
+        },
+        'tiering': {
+            'enabled': ((bool,), False, None),
+            'interval': ((int, float), False, (1, None)),
+            'workers': ((int,), False, (0, None)),
+            'nice': ((int,), False, (0, 19)),
+            'idle_priority': ((bool,), False, None),
+            'max_files_per_sweep': ((int,), False, (1, None)),
+            'include_patterns': ((list,), False, None),
+            'journal_file': ((str,), False, None),
+            'tiers': ((list,), False, None),
+        },
+        'high_rate': {
+            'enabled': ((bool,), False, None),
+            'fps': ((int, float), False, (0.1, 120)),
+            'filename_pattern': ((str,), False, None),
+            'retry_attempts': ((int,), False, (1, None)),
+        },
+        'catalog': {
+            'enabled': ((bool,), False, None),
+            'dir': ((str,), False, None),
+            'flush_interval': ((int, float), False, (0, None)),
+            'retention_days': ((int, float), False, (0, None)),
+        },
+        'event_journal': {
+            'enabled': ((bool,), False, None),
+            'path': ((str,), False, None),
+            'flush_interval': ((int, float), False, (0, None)),
+            'log_successes': ((bool,), False, None),
+        },
+        'frame_quality': {
+            'enabled': ((bool,), False, None),
+            'action': ((str,), False, ['retry', 'flag']),
+            'retry_delay': ((int, float), False, (0, None)),
+            'probe_size': ((str,), False, None),
+            'blank_stddev': ((int, float), False, (0, 128)),
+            'dark_level': ((int,), False, (0, 255)),
+            'bright_level': ((int,), False, (0, 255)),
+            'clip_fraction': ((int, float), False, (0, 1)),
+            'window': ((int,), False, (1, None)),
+            'max_bad_rate': ((int, float), False, (0, 1)),
+            'budget_ms': ((int, float), False, (0, None)),
+        },
+        'fleet': {
+            'enabled': ((bool,), False, None),
+            'node_id': ((str,), False, None),
+            'transport': ((str,), False, ['http', 'udp']),
+            'url': ((str,), False, None),
+            'udp_host': ((str,), False, None),
+            'udp_port': ((int,), False, (1, 65535)),
+            'max_datagram': ((int,), False, (256, 65507)),
+            'sample_interval': ((int, float), False, (1, None)),
+            'batch_samples': ((int,), False, (1, None)),
+            'metrics': ((list,), False, None),
+            'send_catalog': ((bool,), False, None),
+            'max_catalog_records': ((int,), False, (1, None)),
+            'max_pending': ((int,), False, (1, None)),
+            'timeout': ((int, float), False, (0.1, None)),
+            'token': ((str,), False, None),
+            'compress_level': ((int,), False, (0, 9)),
+            'state_file': ((str,), False, None),
+        },
+        'fleet_aggregator': {
+            'host': ((str,), False, None),
+            'port': ((int,), False, (0, 65535)),
+            'udp_port': ((int,), False, (0, 65535)),
+            'data_dir': ((str,), False, None),
+            'stale_after': ((int, float), False, (1, None)),
+            'retention_days': ((int, float), False, (0, None)),
+            'token': ((str,), False, None),
+        },
+        'reload': {
+            'enabled': ((bool,), False, None),
+            'watch_file': ((bool,), False, None),
+            'watch_interval': ((int, float), False, (0.1, None)),
+        },
+    }
+    
     def __init__(self, config_path=None):
         """
         Initialize configuration
@@ -43,6 +290,9 @@ class Config:
         if not os.path.exists(self.config_path):
             raise FileNotFoundError(f"Config file not found: {self.config_path}")
         
+        # Imported here so startup only pays for yaml when a config is loaded
+        import yaml
+        
         with open(self.config_path, 'r') as f:
             config = yaml.safe_load(f)
         
@@ -55,18 +305,234 @@ class Config:
         Raises:
             ValueError: If required fields are missing or invalid
         """
+        self.validate(self.config)
+    
+    @classmethod
+    def validate(cls, config):
+        """
+        Validate a configuration dictionary against SCHEMA
+        
+        Args:
+            config: Configuration dictionary
+            
+        Raises:
+            ValueError: Listing every missing or invalid setting
+        """
+        if not isinstance(config, dict):
+            raise ValueError("Configuration must be a mapping")
+        
         required_sections = ['camera', 'capture', 'files', 'logging', 'health']
         
         for section in required_sections:
-            if section not in self.config:
+            if section not in config:
                 raise ValueError(f"Missing required config section: {section}")
         
+        errors = []
+        
+        for section, fields in cls.SCHEMA.items():
+            values = config.get(section)
+            
+            if values is None:
+                continue
+            
+            if not isinstance(values, dict):
+                errors.append(f"{section}: must be a mapping")
+                continue
+            
+            for key, (types, required, rule) in fields.items():
+                name = f"{section}.{key}"
+                
+                if key not in values:
+                    if required:
+                        errors.append(f"{name}: missing")
+                    continue
+                
+                value = values[key]
+                
+                # bool is an int subclass, don't let true/false pass as numbers
+                if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+                    expected = '/'.join(t.__name__ for t in types)
+                    errors.append(f"{name}: expected {expected}, got {type(value).__name__}")
+                    continue
+                
+                if isinstance(rule, tuple):
+                    low, high = rule
+                    if (low is not None and value < low) or (high is not None and value > high):
+                        errors.append(f"{name}: {value} outside [{low}, {high}]")
+                elif isinstance(rule, list) and value not in rule:
+                    errors.append(f"{name}: {value!r} not one of {rule}")
+        
+        # Schedule rules are checked by building them
+        schedule = config.get('schedule')
+        if isinstance(schedule, dict) and isinstance(schedule.get('rules'), list):
+            from .scheduler import ScheduleRule
+            
+            for index, rule in enumerate(schedule['rules']):
+                try:
+                    ScheduleRule.from_config(rule, index)
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    errors.append(f"schedule.rules[{index}]: {e!r}")
+        
+        # Rendition definitions are checked by building them
+        outputs = config['capture'].get('outputs') if isinstance(config['capture'], dict) else None
+        if isinstance(outputs, list):
+            from .renditions import Rendition
+            
+            names = set()
+            for index, entry in enumerate(outputs):
+                try:
+                    rendition = Rendition.from_config(entry, index)
+                except (TypeError, ValueError, AttributeError) as e:
+                    errors.append(f"capture.outputs[{index}]: {e}")
+                    continue
+                
+                if rendition.name in names:
+                    errors.append(f"capture.outputs[{index}]: duplicate name {rendition.name!r}")
+                names.add(rendition.name)
+        
+        # Fault specs are checked by building them
+        simulation = config.get('simulation')
+        if isinstance(simulation, dict) and isinstance(simulation.get('faults'), list):
+            from .fault_camera import FaultSpec
+            
+            for index, spec in enumerate(simulation['faults']):
+                try:
+                    FaultSpec(spec)
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    errors.append(f"simulation.faults[{index}]: {e!r}")
+        
+        # Storage tiers are checked by building them
+        tiering = config.get('tiering')
+        if isinstance(tiering, dict) and isinstance(tiering.get('tiers'), list):
+            from .tiering import Tier
+            
+            for index, entry in enumerate(tiering['tiers']):
+                try:
+                    Tier.from_config(entry, index)
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    errors.append(f"tiering.tiers[{index}]: {e!r}")
+        
+        # Name patterns may use {ms} and {seq} besides strftime codes
+        patterns = {}
+        if isinstance(config['files'], dict):
+            patterns['files.filename_pattern'] = config['files'].get('filename_pattern')
+        if isinstance(config.get('high_rate'), dict):
+            patterns['high_rate.filename_pattern'] = config['high_rate'].get('filename_pattern')
+        
+        for name, pattern in patterns.items():
+            if isinstance(pattern, str) and '{' in pattern:
+                try:
+                    pattern.format(ms='000', seq='000001')
+                except (KeyError, IndexError, ValueError) as e:
+                    errors.append(f"{name}: only {{ms}} and {{seq}} are supported, got {e!r}")
+        
+        frame_quality = config.get('frame_quality')
+        if isinstance(frame_quality, dict):
+            probe = frame_quality.get('probe_size', '160x120')
+            try:
+                width, height = (int(v) for v in str(probe).lower().split('x'))
+                if width <= 0 or height <= 0:
+                    raise ValueError
+            except ValueError:
+                errors.append(f"frame_quality.probe_size: expected 'WxH', got {probe!r}")
+            
+            dark, bright = frame_quality.get('dark_level', 16), frame_quality.get('bright_level', 240)
+            if isinstance(dark, int) and isinstance(bright, int) and dark >= bright:
+                errors.append("frame_quality.dark_level must be below bright_level")
+        
+        fleet = config.get('fleet')
+        if isinstance(fleet, dict) and fleet.get('enabled') and fleet.get('transport', 'http') == 'http':
+            url = fleet.get('url', 'http://127.0.0.1:8090/ingest')
+            if isinstance(url, str) and not url.startswith(('http://', 'https://')):
+                errors.append(f"fleet.url: expected an http(s) URL, got {url!r}")
+        
+        ring = config['files'].get('ring') if isinstance(config['files'], dict) else None
+        if isinstance(ring, dict):
+            for key, low in (('slots', 1), ('slot_size_kb', 1)):
+                value = ring.get(key, low)
+                if not isinstance(value, (int, float)) or isinstance(value, bool) or value < low:
+                    errors.append(f"files.ring.{key}: expected number >= {low}, got {value!r}")
+        
+        shedding = config.get('load_shedding')
+        if isinstance(shedding, dict):
+            for index, level in enumerate(shedding.get('levels') or []):
+                name = f"load_shedding.levels[{index}]"
+                if not isinstance(level, dict):
+                    errors.append(f"{name}: must be a mapping")
+                    continue
+                quality = level.get('quality', 1)
+                if not isinstance(quality, int) or not 1 <= quality <= 100:
+                    errors.append(f"{name}.quality: expected 1-100, got {quality!r}")
+                factor = level.get('interval_factor', 1)
+                if not isinstance(factor, int) or factor < 1:
+                    errors.append(f"{name}.interval_factor: expected integer >= 1, got {factor!r}")
+            
+            for key in ('thresholds', 'margins'):
+                for signal, value in (shedding.get(key) or {}).items():
+                    values = value if key == 'thresholds' else [value]
+                    if not isinstance(values, list) or not all(
+                        isinstance(v, (int, float)) and not isinstance(v, bool) for v in values
+                    ):
+                        errors.append(f"load_shedding.{key}.{signal}: expected numbers, got {value!r}")
+        
         # Validate specific critical settings
-        if not self.config['camera']['device']:
-            raise ValueError("Camera device path is required")
+        if not config['camera'].get('device'):
+            errors.append("camera.device: camera device path is required")
+        
+        if errors:
+            raise ValueError("Invalid configuration:\n  " + "\n  ".join(errors))
+    
+    @staticmethod
+    def diff(old, new, prefix=''):
+        """
+        List settings that differ between two configurations
+        
+        Args:
+            old: Running configuration dictionary
+            new: Candidate configuration dictionary
+            prefix: Dot-notation prefix (used for recursion)
+            
+        Returns:
+            list: Sorted dot-notation keys that were added, removed or changed
+        """
+        changed = []
+        
+        for key in set(old) | set(new):
+            name = f"{prefix}{key}"
+            a = old.get(key)
+            b = new.get(key)
+            
+            if isinstance(a, dict) and isinstance(b, dict):
+                changed.extend(Config.diff(a, b, name + '.'))
+            elif a != b:
+                changed.append(name)
         
-        if self.config['capture']['retry_attempts'] < 1:
-            raise ValueError("Retry attempts must be at least 1")
+        return sorted(changed)
+    
+    def load_candidate(self):
+        """
+        Re-read and validate the config file without applying it
+        
+        Returns:
+            dict: Validated configuration dictionary
+            
+        Raises:
+            ValueError: If the new configuration is invalid
+        """
+        candidate = self._load_config()
+        self.validate(candidate)
+        return candidate
+    
+    def replace(self, new_config):
+        """
+        Swap in a new configuration in place
+        Components holding the config dictionary see the new values
+        
+        Args:
+            new_config: Validated configuration dictionary
+        """
+        self.config.clear()
+        self.config.update(new_config)
     
     def get(self, key, default=None):
         """
@@ -127,6 +593,8 @@ class Config:
         if output_path is None:
             output_path = self.config_path
         
+        import yaml
+        
         with open(output_path, 'w') as f:
             yaml.dump(self.config, f, default_flow_style=False)
     
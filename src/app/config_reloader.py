@@ -0,0 +1,268 @@
+"""
+Config Reloader Module
+Applies configuration file changes to running components without a restart
+"""
+
+import copy
+import os
+import signal
+import threading
+
+
+class ConfigReloader:
+    """
+    Watches the config file (and SIGHUP) and hands validated changes to the
+    capture loop, which applies them between captures
+    Invalid files are rejected and the running configuration is kept
+    """
+    
+    # Settings each component re-reads in apply_config; sections not listed
+    # here are read once at startup and need a restart
+    COMPONENT_KEYS = {
+        'camera': ('camera.', 'capture.quality', 'fswebcam.',
+                   'hotplug.sysfs_root', 'hotplug.dev_root', 'hotplug.reset_settle'),
+        'capture': ('capture.interval', 'capture.retry_attempts', 'capture.retry_delay',
+                    'hotplug.reset_on_failure', 'high_rate.'),
+        'file_manager': ('files.capture_dir', 'files.filename_pattern', 'files.cleanup_interval',
+                         'files.max_capture_age_days', 'files.verify_jpeg',
+                         'files.storage', 'files.ring.'),
+        'logger': ('files.log_dir', 'logging.'),
+        'health': ('health.',),
+        'scheduler': ('schedule.rules', 'capture.interval'),
+        'renditions': ('capture.outputs', 'capture.output_workers'),
+        'load_shedder': ('load_shedding.',),
+        'coverage': ('capture.interval',),
+        'quality_gate': ('frame_quality.',),
+    }
+    
+    def __init__(self, config, logger, components):
+        """
+        Initialize config reloader
+        
+        Args:
+            config: Config instance (owns the file and the shared dictionary)
+            logger: Logger instance
+            components: Dict of name -> object with apply_config(config), using
+                        the names in COMPONENT_KEYS
+        """
+        self.config = config
+        self.logger = logger
+        self.components = components
+        
+        reload = config.get('reload', {}) or {}
+        self.watch_file = reload.get('watch_file', True)
+        self.watch_interval = reload.get('watch_interval', 2)
+        
+        self.running = False
+        self._thread = None
+        self._trigger = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = None
+        self._mtime = self._get_mtime()
+        
+        # Called after a change is queued (CaptureSystem.wake)
+        self.on_pending = None
+        
+        # Metrics
+        self.reloads = 0
+        self.rejected = 0
+        self.last_error = None
+        self.restart_pending = []
+    
+    def start(self):
+        """Install the SIGHUP handler and start watching (call from the main thread)"""
+        if self.running:
+            return
+        
+        self.running = True
+        
+        if hasattr(signal, 'SIGHUP'):
+            signal.signal(signal.SIGHUP, self._sighup_handler)
+        
+        self._thread = threading.Thread(target=self._run, name="config-reloader", daemon=True)
+        self._thread.start()
+        
+        self.logger.info(
+            f"Config reload enabled (SIGHUP"
+            f"{f', file watch every {self.watch_interval}s' if self.watch_file else ''})"
+        )
+    
+    def stop(self):
+        """Stop watching"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._trigger.set()
+        
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+    
+    def _sighup_handler(self, signum, frame):
+        """Request a reload (only sets a flag, the watcher thread does the work)"""
+        self._trigger.set()
+    
+    def _get_mtime(self):
+        """Config file modification time, or None if unreadable"""
+        try:
+            return os.stat(self.config.config_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _run(self):
+        """Watcher loop: wait for SIGHUP or a file change, then stage the new config"""
+        while self.running:
+            signalled = self._trigger.wait(self.watch_interval if self.watch_file else None)
+            self._trigger.clear()
+            
+            if not self.running:
+                break
+            
+            mtime = self._get_mtime()
+            if signalled or mtime != self._mtime:
+                self._mtime = mtime
+                self.check()
+    
+    def check(self):
+        """
+        Load, validate and diff the config file, queueing any change
+        
+        Returns:
+            list: Changed dot-notation keys (empty if none or invalid)
+        """
+        try:
+            candidate = self.config.load_candidate()
+        except Exception as e:
+            self.rejected += 1
+            self.last_error = str(e)
+            self.logger.error(f"Config reload rejected, keeping running config: {e}")
+            return []
+        
+        changed = self.config.diff(self.config.get_all(), candidate)
+        if not changed:
+            self.logger.debug("Config file unchanged")
+            return []
+        
+        with self._lock:
+            self._pending = (candidate, changed)
+        
+        self.logger.info(f"Config change detected: {', '.join(changed)}")
+        
+        if self.on_pending:
+            self.on_pending()
+        
+        return changed
+    
+    def affected_components(self, changed):
+        """
+        Map changed keys to the components that must re-read their settings
+        
+        Args:
+            changed: List of dot-notation keys
+            
+        Returns:
+            tuple: (component names: list, keys needing a restart: list)
+        """
+        names = []
+        restart = []
+        
+        for key in changed:
+            matched = False
+            for name, prefixes in self.COMPONENT_KEYS.items():
+                if any(key == p or (p.endswith('.') and key.startswith(p)) for p in prefixes):
+                    matched = True
+                    if name not in names:
+                        names.append(name)
+            
+            if not matched:
+                restart.append(key)
+        
+        return names, restart
+    
+    def apply_pending(self):
+        """
+        Apply a queued change (called from the capture thread between captures)
+        
+        Returns:
+            bool: True if a change was applied
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = None
+        
+        if pending is None:
+            return False
+        
+        candidate, changed = pending
+        names, restart = self.affected_components(changed)
+        
+        # Settings read only at startup keep their running values, so the
+        # config reports what is in effect and the next check sees them again
+        running = self.config.get_all()
+        for key in restart:
+            self._keep_running(running, candidate, key)
+        self.restart_pending = restart
+        
+        # Components share the config dictionary, so swap it in place first
+        self.config.replace(candidate)
+        config_dict = self.config.get_all()
+        
+        for name in names:
+            component = self.components.get(name)
+            if component is None:
+                continue
+            try:
+                component.apply_config(config_dict)
+            except Exception as e:
+                self.logger.error(f"Failed to apply config to {name}: {e}")
+        
+        # A camera reload restores the configured quality/resolution; put the
+        # current shedding level back on top
+        shedder = self.components.get('load_shedder')
+        if 'camera' in names and shedder is not None:
+            shedder.reapply()
+        
+        self.reloads += 1
+        self.last_error = None
+        
+        if names:
+            self.logger.info(f"Config reloaded ({', '.join(names)} updated)")
+        if restart:
+            self.logger.warning(f"Restart required for: {', '.join(restart)}")
+        
+        return True
+    
+    @staticmethod
+    def _keep_running(running, candidate, key):
+        """
+        Copy one setting (or its absence) from the running config into a candidate
+        
+        Args:
+            running: Running configuration dictionary
+            candidate: Candidate configuration dictionary (modified)
+            key: Dot-notation key from Config.diff (its parents are dicts in both)
+        """
+        *parents, leaf = key.split('.')
+        for part in parents:
+            running = running[part]
+            candidate = candidate[part]
+        
+        if leaf in running:
+            candidate[leaf] = copy.deepcopy(running[leaf])
+        else:
+            candidate.pop(leaf, None)
+    
+    def get_stats(self):
+        """
+        Get reload statistics
+        
+        Returns:
+            dict: Reload counters, last error and settings waiting for a restart
+        """
+        return {
+            'config_reloads': self.reloads,
+            'config_rejected': self.rejected,
+            'config_last_error': self.last_error,
+            'config_restart_pending': list(self.restart_pending)
+        }
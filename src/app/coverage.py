@@ -0,0 +1,335 @@
+"""
+Coverage Index Module
+Persisted record of expected versus captured slots, compacted into runs
+"""
+
+import bisect
+import json
+import os
+import threading
+
+from utils.clock import SystemClock
+
+
+class CoverageIndex:
+    """
+    Run-length-encoded history of capture slots
+    Each run is [start, end, slots, ok]: `slots` consecutive expected slots from
+    `start` to `end` (Unix times of the first and last slot) that were all
+    captured (ok) or all missed. Slots nobody attempted (downtime, hotplug
+    pauses, shed or overrun schedule slots) are inferred and recorded as missed.
+    
+    Updates are appended to a journal (the last record for a run wins) that is
+    compacted on open, so a crash loses at most sync_interval of the open run.
+    """
+    
+    def __init__(self, config, logger, scheduler=None, readonly=False, clock=None):
+        """
+        Initialize coverage index
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            scheduler: Optional Scheduler defining the expected slots
+                       (default: one slot per capture.interval)
+            readonly: Load only, never write (for reports beside a running system)
+            clock: Optional time source (default: SystemClock)
+        """
+        self.logger = logger
+        self.clock = clock or SystemClock()
+        self.scheduler = scheduler
+        self.readonly = readonly
+        
+        coverage = config.get('coverage', {}) or {}
+        self.index_file = coverage.get('index_file') or os.path.join(
+            config['files']['log_dir'], 'coverage_index.jsonl'
+        )
+        self.sync_interval = coverage.get('sync_interval', 60)
+        self.retention_days = coverage.get('retention_days', 90)
+        self.tolerance = coverage.get('tolerance', 0.5)
+        self.apply_config(config)
+        
+        self._lock = threading.Lock()
+        self.runs = []
+        self._starts = []  # run start times, kept in step with runs for bisect
+        self._after = None  # end of the last recorded slot (expected slots follow it)
+        self._dirty = False
+        self._synced = 0.0
+        self._lines = 0
+        self._fh = None
+        
+        self._load()
+        
+        if not readonly:
+            index_dir = os.path.dirname(self.index_file)
+            if index_dir:
+                os.makedirs(index_dir, exist_ok=True)
+            self._compact()
+            self._fh = open(self.index_file, 'a')
+    
+    def apply_config(self, config):
+        """
+        Load the fixed capture interval (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.interval = config['capture']['interval']
+    
+    def _load(self):
+        """Replay the journal into memory"""
+        if not os.path.exists(self.index_file):
+            return
+        
+        runs = {}
+        with open(self.index_file, 'r') as f:
+            for line in f:
+                try:
+                    index, start, end, slots, ok = json.loads(line)
+                    runs[index] = [start, end, slots, bool(ok)]
+                except (ValueError, TypeError):
+                    # Torn write from a crash, ignore the partial record
+                    continue
+        
+        self.runs = [runs[index] for index in sorted(runs)]
+        self._starts = [run[0] for run in self.runs]
+        if self.runs:
+            self._after = self.runs[-1][1]
+    
+    def _compact(self):
+        """Rewrite the journal with one record per run, dropping expired runs"""
+        cutoff = self.clock.time() - self.retention_days * 86400
+        expired = bisect.bisect_left([run[1] for run in self.runs], cutoff)
+        if expired:
+            del self.runs[:expired]
+            del self._starts[:expired]
+        
+        tmp_path = self.index_file + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for index, run in enumerate(self.runs):
+                f.write(self._encode(index, run))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(tmp_path, self.index_file)
+        self._lines = len(self.runs)
+    
+    @staticmethod
+    def _encode(index, run):
+        """One journal line for a run"""
+        start, end, slots, ok = run
+        return json.dumps([index, start, end, slots, int(ok)]) + '\n'
+    
+    def _write(self, index):
+        """Append the current state of a run to the journal"""
+        self._fh.write(self._encode(index, self.runs[index]))
+        self._lines += 1
+    
+    def _expected_between(self, after, before):
+        """
+        Slots that should have happened strictly between two times
+        
+        Returns:
+            tuple: (count: int, first: float, last: float)
+        """
+        if self.scheduler:
+            return self.scheduler.slots_between(after, before)
+        
+        # Fixed interval: the next slot is due one interval after the previous
+        # capture finished; anything past `tolerance` of a further interval is a miss
+        count = int((before - after) / self.interval + (1 - self.tolerance)) - 1
+        if count <= 0:
+            return (0, None, None)
+        return (count, after + self.interval, after + count * self.interval)
+    
+    def _extend(self, start, end, slots, ok):
+        """Add slots to the open run, or start a new run when the outcome changes"""
+        if self.runs and self.runs[-1][3] == ok:
+            run = self.runs[-1]
+            run[1] = end
+            run[2] += slots
+            self._dirty = True
+            return
+        
+        # Close the previous run on disk before starting the next one
+        if self._dirty:
+            self._write(len(self.runs) - 1)
+        
+        self.runs.append([start, end, slots, ok])
+        self._starts.append(start)
+        self._write(len(self.runs) - 1)
+        self._dirty = False
+    
+    def record(self, slot, captured, finished=None):
+        """
+        Record the outcome of one capture slot
+        
+        Args:
+            slot: Unix time the slot was due
+            captured: True if the capture succeeded
+            finished: Unix time the capture attempt ended (default: now); with a
+                      fixed interval the next slot is expected one interval later
+        """
+        if self.readonly:
+            return
+        
+        slot = round(slot, 3)
+        
+        with self._lock:
+            if self.runs and slot <= self.runs[-1][1]:
+                # Clock stepped back or the slot was already recorded
+                return
+            
+            if self._after is not None:
+                count, first, last = self._expected_between(self._after, slot)
+                if count:
+                    self._extend(round(first, 3), round(last, 3), count, False)
+            
+            self._extend(slot, slot, 1, bool(captured))
+            
+            # Scheduled slots are fixed points in time; fixed-interval slots follow the capture
+            if self.scheduler:
+                self._after = slot
+            else:
+                self._after = self.clock.time() if finished is None else finished
+            
+            self._sync()
+    
+    def _sync(self, force=False):
+        """Persist the open run every sync_interval seconds"""
+        now = self.clock.monotonic()
+        if self._dirty and (force or now - self._synced >= self.sync_interval):
+            self._write(len(self.runs) - 1)
+            self._dirty = False
+        
+        if force or now - self._synced >= self.sync_interval:
+            self._fh.flush()
+            self._synced = now
+            
+            # Journal has grown far past the run count, start it over
+            if self._lines > 2 * len(self.runs) + 10000:
+                self._fh.close()
+                self._compact()
+                self._fh = open(self.index_file, 'a')
+    
+    def _runs_from(self, since):
+        """Index of the first run that may end at or after `since`"""
+        if since is None:
+            return 0
+        return max(0, bisect.bisect_right(self._starts, since) - 1)
+    
+    def gaps(self, min_seconds=0, since=None, until=None):
+        """
+        List stretches without a successful capture
+        A gap runs from the last captured slot before it to the first captured
+        slot after it (or to now while it is still open)
+        
+        Args:
+            min_seconds: Only gaps at least this long
+            since: Unix time; only gaps ending after it
+            until: Unix time; only gaps starting before it
+            
+        Returns:
+            list: Dicts with start, end (None if open), seconds and missed slots
+        """
+        now = self.clock.time()
+        found = []
+        
+        with self._lock:
+            runs = self.runs
+            index = self._runs_from(since)
+            
+            # Step back to the captured run the gap starts from
+            while index > 0 and not runs[index][3]:
+                index -= 1
+            
+            while index < len(runs):
+                if runs[index][3]:
+                    index += 1
+                    continue
+                
+                start = runs[index - 1][1] if index > 0 else runs[index][0]
+                if until is not None and start >= until:
+                    break
+                
+                missed = 0
+                while index < len(runs) and not runs[index][3]:
+                    missed += runs[index][2]
+                    index += 1
+                
+                end = runs[index][0] if index < len(runs) else None
+                seconds = (end if end is not None else now) - start
+                
+                if seconds >= min_seconds and (since is None or (end or now) > since):
+                    found.append({'start': start, 'end': end, 'seconds': round(seconds, 1), 'missed': missed})
+        
+        return found
+    
+    def summary(self, since=None, until=None):
+        """
+        Expected versus captured slots in a time range
+        Runs crossing the range edges are prorated by time
+        
+        Args:
+            since: Unix time (default: start of the index)
+            until: Unix time (default: now)
+            
+        Returns:
+            dict: expected, captured, missed and coverage_percent
+        """
+        captured = missed = 0.0
+        
+        with self._lock:
+            for start, end, slots, ok in self.runs[self._runs_from(since):]:
+                if until is not None and start > until:
+                    break
+                
+                low = start if since is None else max(start, since)
+                high = end if until is None else min(end, until)
+                if high < low:
+                    continue
+                
+                share = slots * (high - low) / (end - start) if end > start else slots
+                if ok:
+                    captured += share
+                else:
+                    missed += share
+        
+        expected = round(captured + missed)
+        captured = round(captured)
+        return {
+            'expected': expected,
+            'captured': captured,
+            'missed': expected - captured,
+            'coverage_percent': round(captured / expected * 100, 2) if expected else 0.0
+        }
+    
+    def close(self):
+        """Persist the open run and close the journal"""
+        if self._fh is None:
+            return
+        
+        with self._lock:
+            self._sync(force=True)
+            os.fsync(self._fh.fileno())
+            self._fh.close()
+            self._fh = None
+    
+    def get_stats(self):
+        """
+        Get coverage over the last 24 hours
+        
+        Returns:
+            dict: Slot counts, coverage percentage and the longest gap
+        """
+        since = self.clock.time() - 86400
+        day = self.summary(since)
+        gaps = self.gaps(since=since)
+        
+        return {
+            'coverage_percent_24h': day['coverage_percent'],
+            'coverage_missed_24h': day['missed'],
+            'coverage_longest_gap_24h': max((gap['seconds'] for gap in gaps), default=0),
+            'coverage_open_gap': bool(gaps and gaps[-1]['end'] is None),
+            'coverage_runs': len(self.runs)
+        }
@@ -0,0 +1,336 @@
+"""
+Device Monitor Module
+Event-driven camera discovery and hotplug detection via sysfs, inotify and netlink
+"""
+
+import os
+import select
+import socket
+import struct
+import threading
+import time
+
+
+SYSFS_VIDEO_ROOT = "/sys/class/video4linux"
+DEV_ROOT = "/dev"
+
+# inotify constants (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = os.O_NONBLOCK
+IN_EVENT_HEADER = struct.Struct('iIII')
+
+NETLINK_KOBJECT_UEVENT = 15
+
+
+def _read_attr(path):
+    """Read a sysfs attribute, returning None if unavailable"""
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _symlinks_to(directory, target):
+    """Find the first symlink in directory that resolves to target"""
+    try:
+        names = sorted(os.listdir(directory))
+    except OSError:
+        return None
+    
+    for name in names:
+        path = os.path.join(directory, name)
+        if os.path.islink(path) and os.path.realpath(path) == target:
+            return path
+    
+    return None
+
+
+def discover_devices(sysfs_root=SYSFS_VIDEO_ROOT, dev_root=DEV_ROOT):
+    """
+    Enumerate video devices from sysfs instead of probing device numbers
+    
+    Args:
+        sysfs_root: video4linux class directory
+        dev_root: Directory holding device nodes
+        
+    Returns:
+        list: One dict per device with node path, name, stable by-id/by-path
+              links and the owning USB device directory
+    """
+    try:
+        nodes = sorted(
+            (n for n in os.listdir(sysfs_root) if n.startswith('video')),
+            key=lambda n: int(n[5:]) if n[5:].isdigit() else n
+        )
+    except OSError:
+        return []
+    
+    devices = []
+    for node in nodes:
+        sys_dir = os.path.join(sysfs_root, node)
+        dev_path = os.path.join(dev_root, node)
+        real_dev = os.path.realpath(dev_path)
+        interface_dir = os.path.realpath(os.path.join(sys_dir, 'device'))
+        
+        devices.append({
+            'node': node,
+            'path': dev_path,
+            'present': os.path.exists(dev_path),
+            'name': _read_attr(os.path.join(sys_dir, 'name')),
+            'index': _read_attr(os.path.join(sys_dir, 'index')),
+            'by_id': _symlinks_to(os.path.join(dev_root, 'v4l', 'by-id'), real_dev),
+            'by_path': _symlinks_to(os.path.join(dev_root, 'v4l', 'by-path'), real_dev),
+            # USB interface dirs look like 1-1.2:1.0; the device is its parent
+            'usb_device': os.path.dirname(interface_dir) if ':' in os.path.basename(interface_dir) else None
+        })
+    
+    return devices
+
+
+class DeviceMonitor:
+    """
+    Watches for camera removal and reattachment
+    Capture pauses on removal and resumes as soon as the device is back
+    """
+    
+    def __init__(self, config, logger, camera, health_check=None):
+        """
+        Initialize device monitor
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            camera: CameraInterface instance (device path is updated on reattach)
+            health_check: Optional HealthCheck for disconnect/reconnect metrics
+        """
+        self.config = config
+        self.logger = logger
+        self.camera = camera
+        self.health = health_check
+        
+        hotplug = config.get('hotplug', {})
+        self.method = hotplug.get('method', 'auto')  # auto, inotify, netlink, poll
+        self.sysfs_root = hotplug.get('sysfs_root', SYSFS_VIDEO_ROOT)
+        self.dev_root = hotplug.get('dev_root', DEV_ROOT)
+        self.poll_interval = hotplug.get('poll_interval', 1.0)
+        self.settle_time = hotplug.get('settle_time', 0.2)
+        
+        # Remember the stable identity of the configured camera so it can be
+        # found again if it comes back under a different /dev/videoN
+        self.identity = self._identify(camera.device)
+        
+        self.running = False
+        self._thread = None
+        self._present = threading.Event()
+        if os.path.exists(camera.device):
+            self._present.set()
+        
+        self.removed_at = None
+        self.last_reconnect_seconds = None
+        self.active_method = None
+    
+    def _identify(self, device):
+        """
+        Find stable by-id/by-path links for a device node
+        
+        Returns:
+            dict: {'by_id': str or None, 'by_path': str or None}
+        """
+        real = os.path.realpath(device)
+        for info in discover_devices(self.sysfs_root, self.dev_root):
+            if os.path.realpath(info['path']) == real:
+                return {'by_id': info['by_id'], 'by_path': info['by_path']}
+        return {'by_id': None, 'by_path': None}
+    
+    def start(self):
+        """Start watching for hotplug events in a background thread"""
+        if self.running:
+            return
+        
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="device-monitor", daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        """Stop watching"""
+        self.running = False
+        if self._thread:
+            self._thread.join(self.poll_interval + 1)
+            self._thread = None
+    
+    def is_present(self):
+        """
+        Check camera presence as last seen by the monitor (no filesystem access)
+        
+        Returns:
+            bool: True if the camera is attached
+        """
+        return self._present.is_set()
+    
+    def wait_for_device(self, timeout=None):
+        """
+        Block until the camera is attached
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            bool: True if the camera is present
+        """
+        return self._present.wait(timeout)
+    
+    def _run(self):
+        """Pick the best available event source and watch until stopped"""
+        methods = [self.method] if self.method != 'auto' else ['inotify', 'poll']
+        
+        for method in methods:
+            if not self.running:
+                return
+            try:
+                self.active_method = method
+                self.logger.info(f"Device monitor watching via {method}")
+                getattr(self, f"_watch_{method}")()
+                return
+            except OSError as e:
+                self.logger.warning(f"Device monitor: {method} unavailable ({e})")
+        
+        if self.running and self.active_method != 'poll':
+            self.active_method = 'poll'
+            self._watch_poll()
+    
+    def _watch_inotify(self):
+        """Watch the device directory for video node creation/removal"""
+        # ctypes.util pulls in subprocess; only load it when inotify is used
+        import ctypes
+        import ctypes.util
+        
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        try:
+            mask = IN_CREATE | IN_DELETE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+            if libc.inotify_add_watch(fd, self.dev_root.encode(), mask) < 0:
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch({self.dev_root}) failed")
+            
+            self._rescan()
+            
+            while self.running:
+                ready, _, _ = select.select([fd], [], [], self.poll_interval)
+                if not ready:
+                    continue
+                
+                relevant = False
+                data = os.read(fd, 4096)
+                offset = 0
+                while offset < len(data):
+                    _, _, _, length = IN_EVENT_HEADER.unpack_from(data, offset)
+                    offset += IN_EVENT_HEADER.size
+                    name = data[offset:offset + length].rstrip(b'\0')
+                    offset += length
+                    if name.startswith(b'video'):
+                        relevant = True
+                
+                if relevant:
+                    self._rescan()
+        finally:
+            os.close(fd)
+    
+    def _watch_netlink(self):
+        """Listen for kernel uevents on the video4linux subsystem"""
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_DGRAM, NETLINK_KOBJECT_UEVENT)
+        
+        try:
+            sock.bind((os.getpid(), 1))
+            sock.settimeout(self.poll_interval)
+            self._rescan()
+            
+            while self.running:
+                try:
+                    message = sock.recv(8192)
+                except socket.timeout:
+                    continue
+                
+                if b'SUBSYSTEM=video4linux' in message:
+                    # udev creates the node shortly after the kernel event
+                    time.sleep(self.settle_time)
+                    self._rescan()
+        finally:
+            sock.close()
+    
+    def _watch_poll(self):
+        """Fallback: rescan sysfs/devfs on a timer"""
+        while self.running:
+            self._rescan()
+            time.sleep(self.poll_interval)
+    
+    def _locate_camera(self):
+        """
+        Find the configured camera, following its stable identity if needed
+        
+        Returns:
+            str: Current device path or None if not attached
+        """
+        if os.path.exists(self.camera.device):
+            return self.camera.device
+        
+        if not (self.identity['by_id'] or self.identity['by_path']):
+            return None
+        
+        for info in discover_devices(self.sysfs_root, self.dev_root):
+            if not info['present']:
+                continue
+            if self.identity['by_id'] and info['by_id'] == self.identity['by_id']:
+                return info['path']
+            if self.identity['by_path'] and info['by_path'] == self.identity['by_path']:
+                return info['path']
+        
+        return None
+    
+    def _rescan(self):
+        """Re-evaluate camera presence and fire removal/reattach transitions"""
+        device = self._locate_camera()
+        was_present = self._present.is_set()
+        
+        if device and not was_present:
+            if device != self.camera.device:
+                self.logger.info(f"Camera reattached as {device} (was {self.camera.device})")
+                self.camera.device = device
+            
+            if self.removed_at is not None:
+                self.last_reconnect_seconds = round(time.monotonic() - self.removed_at, 3)
+                self.removed_at = None
+            
+            self.logger.log_camera_reconnect()
+            if self.health:
+                self.health.record_reconnect(self.last_reconnect_seconds)
+            
+            self._present.set()
+        
+        elif not device and was_present:
+            self._present.clear()
+            self.removed_at = time.monotonic()
+            self.logger.log_camera_disconnect()
+            if self.health:
+                self.health.record_disconnect()
+    
+    def get_stats(self):
+        """
+        Get monitor state
+        
+        Returns:
+            dict: Presence, event source and last reconnect time
+        """
+        return {
+            'present': self.is_present(),
+            'method': self.active_method,
+            'device': self.camera.device,
+            'by_id': self.identity['by_id'],
+            'last_reconnect_seconds': self.last_reconnect_seconds
+        }
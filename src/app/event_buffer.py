@@ -0,0 +1,421 @@
+"""
+Event Buffer Module
+Keeps the last seconds of full-rate frames in memory and saves them around triggers
+"""
+
+import io
+import json
+import os
+import shutil
+import signal
+import socketserver
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class _TriggerHandler(BaseHTTPRequestHandler):
+    """Local trigger endpoint: POST/GET /trigger?reason=..., GET /status"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        """Route access logs to the system logger at debug level"""
+        self.server.owner.logger.debug(f"Event trigger - {format % args}")
+    
+    def address_string(self):
+        """Unix socket peers have no address"""
+        return self.client_address[0] if self.client_address else 'unix'
+    
+    def do_GET(self):
+        """Dispatch requests"""
+        owner = self.server.owner
+        url = urlsplit(self.path)
+        
+        if url.path == '/trigger':
+            reason = parse_qs(url.query).get('reason', ['http'])[0]
+            owner.trigger(reason)
+            self._send_json(202, {'triggered': reason})
+        elif url.path == '/status':
+            self._send_json(200, owner.get_stats())
+        else:
+            self.send_error(404)
+    
+    def do_POST(self):
+        """POST works the same as GET (body ignored)"""
+        length = int(self.headers.get('Content-Length', 0))
+        if length:
+            self.rfile.read(length)
+        self.do_GET()
+    
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class _TriggerTCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _TriggerUnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class EventBuffer:
+    """
+    Pre-event ring of stream frames plus post-event recording
+    
+    Frames from the shared FrameStream are held by reference in a deque
+    bounded by both age (pre_seconds) and total bytes (max_memory_mb).
+    When a trigger fires, the buffered frames and the next post_seconds of
+    frames are written to capture_dir/events/<event>/ by the consumer thread,
+    so nothing else accumulates in memory while an event is saved.
+    """
+    
+    # Seconds between event retention checks
+    CLEANUP_INTERVAL = 3600
+    
+    def __init__(self, config, logger, frame_stream):
+        """
+        Initialize event buffer
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            frame_stream: FrameStream supplying full-rate frames
+        """
+        self.config = config
+        self.logger = logger
+        self.frame_stream = frame_stream
+        
+        events = config.get('events', {})
+        self.pre_seconds = events.get('pre_seconds', 10)
+        self.post_seconds = events.get('post_seconds', 10)
+        self.max_bytes = int(events.get('max_memory_mb', 64) * 1024 * 1024)
+        self.events_dir = events.get('events_dir') or os.path.join(config['files']['capture_dir'], 'events')
+        self.retention_days = events.get('retention_days', config['files']['max_capture_age_days'])
+        
+        self.trigger_signal = events.get('trigger_signal', True)
+        self.trigger_host = events.get('trigger_host', '127.0.0.1')
+        self.trigger_port = events.get('trigger_port', 0)
+        self.trigger_socket = events.get('trigger_socket') or None
+        self.trigger_file = events.get('trigger_file') or None
+        self.file_poll_interval = events.get('file_poll_interval', 0.5)
+        self.motion_threshold = events.get('motion_threshold', 0)
+        self.motion_every = max(1, events.get('motion_every', 2))
+        
+        self.running = False
+        self._threads = []
+        self._server = None
+        
+        # Frames as (seq, timestamp, bytes); the bytes are shared with FrameStream
+        self._frames = deque()
+        self._bytes = 0
+        
+        # Trigger state (set from any thread, consumed by the buffer thread)
+        self._lock = threading.Lock()
+        self._pending_reason = None
+        
+        # Active event
+        self._event_dir = None
+        self._event_until = 0
+        self._event_count = 0
+        
+        # Event directories are aged out hourly (capture cleanup only sees capture_dir's top level)
+        self._last_cleanup = None
+        
+        # Motion detection state
+        self._last_thumb = None
+        self.motion_score = 0.0
+        
+        # Metrics
+        self.events_triggered = 0
+        self.events_deleted = 0
+        self.frames_persisted = 0
+        self.frames_skipped = 0
+        self.frames_evicted_for_memory = 0
+    
+    def start(self):
+        """Start buffering and enable triggers (call from the main thread)"""
+        if self.running:
+            return
+        
+        self.running = True
+        os.makedirs(self.events_dir, exist_ok=True)
+        
+        if self.trigger_signal and hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self._signal_handler)
+        
+        self._spawn(self._run, "event-buffer")
+        
+        if self.trigger_file:
+            self._spawn(self._watch_file, "event-file-trigger")
+        
+        if self.trigger_socket or self.trigger_port:
+            self._start_server()
+        
+        self.logger.info(
+            f"Event buffer started ({self.pre_seconds}s pre, {self.post_seconds}s post, "
+            f"{self.max_bytes // (1024 * 1024)} MB max)"
+        )
+    
+    def stop(self):
+        """Stop buffering, finishing any event in progress"""
+        if not self.running:
+            return
+        
+        self.running = False
+        
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        
+        for thread in self._threads:
+            thread.join(5)
+        self._threads = []
+        
+        self._frames.clear()
+        self._bytes = 0
+        self.logger.info(
+            f"Event buffer stopped ({self.events_triggered} events, "
+            f"{self.frames_persisted} frames saved)"
+        )
+    
+    def _spawn(self, target, name):
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+    
+    def _start_server(self):
+        """Start the local HTTP trigger endpoint"""
+        if self.trigger_socket:
+            if os.path.exists(self.trigger_socket):
+                os.remove(self.trigger_socket)
+            self._server = _TriggerUnixServer(self.trigger_socket, _TriggerHandler)
+            where = f"unix:{self.trigger_socket}"
+        else:
+            self._server = _TriggerTCPServer((self.trigger_host, self.trigger_port), _TriggerHandler)
+            where = f"http://{self.trigger_host}:{self._server.server_address[1]}/trigger"
+        
+        self._server.owner = self
+        self._spawn(self._server.serve_forever, "event-trigger-server")
+        self.logger.info(f"Event trigger endpoint at {where}")
+    
+    def _signal_handler(self, signum, frame):
+        """SIGUSR1 triggers an event"""
+        self.trigger('signal')
+    
+    def trigger(self, reason='manual'):
+        """
+        Request an event (safe from any thread or signal handler)
+        A trigger during an event extends its post-event window
+        
+        Args:
+            reason: Short label used in the event directory name
+        """
+        with self._lock:
+            self._pending_reason = reason
+    
+    def _watch_file(self):
+        """Trigger when the trigger file is created or touched"""
+        last = self._file_mtime()
+        
+        while self.running:
+            time.sleep(self.file_poll_interval)
+            mtime = self._file_mtime()
+            if mtime is not None and mtime != last:
+                self.trigger('file')
+            last = mtime
+    
+    def _file_mtime(self):
+        try:
+            return os.stat(self.trigger_file).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _run(self):
+        """Consume stream frames: buffer, score motion, handle triggers"""
+        last_seq = 0
+        
+        while self.running:
+            if self._last_cleanup is None or time.monotonic() - self._last_cleanup >= self.CLEANUP_INTERVAL:
+                self._last_cleanup = time.monotonic()
+                self.cleanup_old_events()
+            
+            result = self.frame_stream.wait_for_frame(last_seq, timeout=1.0)
+            if result is None:
+                continue
+            
+            seq, timestamp, frame = result
+            if last_seq and seq > last_seq + 1:
+                self.frames_skipped += seq - last_seq - 1
+            last_seq = seq
+            
+            if self.motion_threshold and seq % self.motion_every == 0:
+                self.motion_score = self._motion_score(frame)
+                if self.motion_score >= self.motion_threshold:
+                    self.trigger('motion')
+            
+            with self._lock:
+                reason = self._pending_reason
+                self._pending_reason = None
+            
+            if reason:
+                self._begin_event(reason, timestamp)
+            
+            if self._event_dir:
+                self._save_frame(seq, timestamp, frame)
+                if timestamp >= self._event_until:
+                    self._end_event()
+            else:
+                self._buffer(seq, timestamp, frame)
+        
+        if self._event_dir:
+            self._end_event()
+    
+    def _buffer(self, seq, timestamp, frame):
+        """Add a frame, evicting by age and by the memory budget"""
+        self._frames.append((seq, timestamp, frame))
+        self._bytes += len(frame)
+        
+        cutoff = timestamp - self.pre_seconds
+        while self._frames and self._frames[0][1] < cutoff:
+            self._bytes -= len(self._frames.popleft()[2])
+        
+        while self._bytes > self.max_bytes and self._frames:
+            self._bytes -= len(self._frames.popleft()[2])
+            self.frames_evicted_for_memory += 1
+    
+    def _begin_event(self, reason, timestamp):
+        """Start (or extend) an event and flush the pre-event frames"""
+        self._event_until = timestamp + self.post_seconds
+        
+        if self._event_dir:
+            self.logger.info(f"Event extended by trigger '{reason}'")
+            return
+        
+        name = f"event_{datetime.fromtimestamp(timestamp).strftime('%Y%m%d_%H%M%S')}_{reason}"
+        self._event_dir = os.path.join(self.events_dir, name)
+        self._event_count = 0
+        os.makedirs(self._event_dir, exist_ok=True)
+        
+        self.events_triggered += 1
+        self.logger.info(f"Event triggered ({reason}), saving {len(self._frames)} pre-event frames")
+        
+        while self._frames:
+            seq, frame_time, frame = self._frames.popleft()
+            self._save_frame(seq, frame_time, frame)
+        self._bytes = 0
+    
+    def _save_frame(self, seq, timestamp, frame):
+        """Write one frame into the active event directory"""
+        stamp = datetime.fromtimestamp(timestamp).strftime('%H%M%S_%f')[:-3]
+        path = os.path.join(self._event_dir, f"{self._event_count:06d}_{stamp}.jpg")
+        
+        try:
+            with open(path, 'wb') as f:
+                f.write(frame)
+            os.utime(path, (timestamp, timestamp))
+            self._event_count += 1
+            self.frames_persisted += 1
+        except OSError as e:
+            self.logger.error(f"Failed to save event frame: {e}")
+    
+    def _end_event(self):
+        """Close the active event"""
+        self.logger.info(f"Event saved: {self._event_dir} ({self._event_count} frames)")
+        self._event_dir = None
+    
+    def cleanup_old_events(self):
+        """
+        Remove saved events older than retention_days (the active event is kept)
+        
+        Returns:
+            int: Number of event directories deleted
+        """
+        if self.retention_days <= 0:
+            return 0
+        
+        cutoff = time.time() - self.retention_days * 86400
+        deleted = 0
+        
+        try:
+            entries = list(os.scandir(self.events_dir))
+        except OSError as e:
+            self.logger.error(f"Event cleanup failed: {e}")
+            return 0
+        
+        for entry in entries:
+            if not entry.is_dir() or not entry.name.startswith('event_') or entry.path == self._event_dir:
+                continue
+            
+            try:
+                # The directory's mtime is when its last frame was added
+                if entry.stat().st_mtime < cutoff:
+                    shutil.rmtree(entry.path)
+                    deleted += 1
+            except OSError as e:
+                self.logger.error(f"Failed to delete old event {entry.name}: {e}")
+        
+        if deleted:
+            self.events_deleted += deleted
+            self.logger.info(f"Event cleanup: removed {deleted} old events")
+        
+        return deleted
+    
+    def _motion_score(self, frame):
+        """
+        Mean absolute difference against the previous sampled frame
+        Decoded at 1/8 scale (JPEG draft) into a small grayscale thumbnail
+        
+        Args:
+            frame: JPEG bytes
+            
+        Returns:
+            float: 0 (no change) to 255
+        """
+        from PIL import Image, ImageChops, ImageStat
+        
+        try:
+            image = Image.open(io.BytesIO(frame))
+            image.draft('L', (80, 60))
+            thumb = image.convert('L').resize((80, 60))
+        except Exception as e:
+            self.logger.debug(f"Motion scoring skipped: {e}")
+            return 0.0
+        
+        previous = self._last_thumb
+        self._last_thumb = thumb
+        
+        if previous is None:
+            return 0.0
+        
+        return ImageStat.Stat(ImageChops.difference(thumb, previous)).mean[0]
+    
+    def get_stats(self):
+        """
+        Get event buffer statistics
+        
+        Returns:
+            dict: Buffer occupancy, events and motion score
+        """
+        return {
+            'buffered_frames': len(self._frames),
+            'buffered_mb': round(self._bytes / (1024 * 1024), 2),
+            'max_memory_mb': round(self.max_bytes / (1024 * 1024), 2),
+            'event_active': self._event_dir is not None,
+            'events_triggered': self.events_triggered,
+            'events_deleted': self.events_deleted,
+            'frames_persisted': self.frames_persisted,
+            'frames_skipped': self.frames_skipped,
+            'frames_evicted_for_memory': self.frames_evicted_for_memory,
+            'motion_score': round(self.motion_score, 2)
+        }
@@ -0,0 +1,327 @@
+"""
+Fault Injection Camera Module
+Scriptable stand-in for the camera that reproduces hardware failures on a schedule
+"""
+
+import io
+import random
+
+from utils.clock import SystemClock
+
+from .camera_interface import CameraInterface
+
+
+class FaultSpec:
+    """
+    One scheduled fault
+    Fires on given attempt numbers, every Nth attempt and/or with a probability,
+    then repeats for `count` consecutive attempts
+    """
+    
+    TYPES = ('timeout', 'exit', 'empty', 'truncated', 'device_removed', 'slow_write')
+    
+    def __init__(self, spec):
+        """
+        Initialize fault spec
+        
+        Args:
+            spec: Dict with type and any of at, every, probability, count,
+                  latency (timeout/slow_write), code and message (exit),
+                  fraction (truncated), duration (device_removed)
+        """
+        self.type = spec['type']
+        if self.type not in self.TYPES:
+            raise ValueError(f"unknown fault type {self.type!r} (expected one of {', '.join(self.TYPES)})")
+        
+        at = spec.get('at')
+        self.at = frozenset(at if isinstance(at, list) else [at]) if at is not None else frozenset()
+        self.every = spec.get('every')
+        self.probability = spec.get('probability', 0.0)
+        self.count = max(1, spec.get('count', 1))
+        
+        self.latency = spec.get('latency')
+        self.code = spec.get('code', 1)
+        self.message = spec.get('message')
+        self.fraction = spec.get('fraction', 0.5)
+        self.duration = spec.get('duration', 10)
+        
+        if not self.at and not self.every and not self.probability:
+            raise ValueError(f"{self.type} fault needs at, every or probability")
+    
+    def triggers(self, attempt, rng):
+        """
+        Check whether the fault starts on this attempt
+        Always draws one random number so every spec consumes the stream
+        identically and a seed reproduces the whole run
+        
+        Args:
+            attempt: 1-based capture attempt number
+            rng: random.Random instance
+            
+        Returns:
+            bool: True if the fault fires
+        """
+        draw = rng.random()
+        return (
+            attempt in self.at
+            or bool(self.every and attempt % self.every == 0)
+            or draw < self.probability
+        )
+
+
+class FaultInjectionCamera(CameraInterface):
+    """
+    CameraInterface that never touches hardware
+    Every capture attempt consults the fault schedule; attempts without a fault
+    write a valid JPEG. Injected latencies are slept in realtime mode and only
+    accounted otherwise (simulated_seconds), so scenarios can run far faster
+    than the captures they model.
+    """
+    
+    def __init__(self, config, logger, clock=None):
+        """
+        Initialize fault injection camera
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            clock: Optional time source latencies are spent on (default: SystemClock)
+        """
+        super().__init__(config, logger)
+        self.clock = clock or SystemClock()
+        
+        simulation = config.get('simulation', {}) or {}
+        self.seed = simulation.get('seed', 0)
+        self.realtime = simulation.get('realtime', True)
+        self.base_latency = simulation.get('base_latency', 0.5)
+        self.faults = [FaultSpec(spec) for spec in simulation.get('faults') or []]
+        self.frame = self._make_frame(simulation.get('frame_size', '320x240'))
+        
+        self.reseed(self.seed)
+    
+    def reseed(self, seed):
+        """
+        Restart the fault schedule from attempt 1
+        
+        Args:
+            seed: Random seed
+        """
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self.attempts = 0
+        self.simulated_seconds = 0.0
+        self.injected = {fault_type: 0 for fault_type in FaultSpec.TYPES}
+        
+        self._active = []  # [spec, attempts remaining] for faults in a burst
+        self._removed_probes = 0  # probes left until a removed device returns
+    
+    def _make_frame(self, size):
+        """Encode the frame every good capture returns"""
+        from PIL import Image
+        
+        width, height = (int(v) for v in size.lower().split('x'))
+        image = Image.linear_gradient('L').resize((width, height)).convert('RGB')
+        out = io.BytesIO()
+        image.save(out, 'JPEG', quality=self.quality)
+        return out.getvalue()
+    
+    def _delay(self, seconds):
+        """Spend (or just account for) capture latency"""
+        self.simulated_seconds += seconds
+        if self.realtime:
+            self.clock.sleep(seconds)
+    
+    def _probe_removed(self):
+        """
+        Count one probe of a removed device
+        Outages last a number of probes (capture attempts and presence checks)
+        so they end even while the capture loop only checks for the device
+        
+        Returns:
+            bool: True if the device is still gone
+        """
+        if self._removed_probes <= 0:
+            return False
+        
+        self._removed_probes -= 1
+        return True
+    
+    def _next_fault(self):
+        """
+        Advance the schedule by one attempt
+        
+        Returns:
+            FaultSpec: Fault for this attempt, or None
+        """
+        self.attempts += 1
+        
+        for spec in self.faults:
+            if spec.triggers(self.attempts, self._rng):
+                self._active.append([spec, spec.count])
+        
+        if not self._active:
+            return None
+        
+        # Overlapping faults: the earliest started wins, later ones wait their turn
+        entry = self._active[0]
+        entry[1] -= 1
+        if entry[1] <= 0:
+            self._active.pop(0)
+        return entry[0]
+    
+    def warm_up(self, delay=None, stream=None):
+        """
+        Simulated warm-up (slept only in realtime mode)
+        Simulated frames have no exposure to settle, so frames mode is a delay too
+        
+        Args:
+            delay: Optional override for the configured warmup_delay
+            stream: Ignored
+            
+        Returns:
+            dict: seconds, frames, luminance and converged
+        """
+        delay = self.warmup_delay if delay is None else delay
+        self._delay(delay)
+        return {'seconds': delay, 'frames': 0, 'luminance': None, 'converged': None}
+    
+    def is_device_present(self):
+        """
+        Report whether the simulated device exists
+        
+        Returns:
+            bool: False during an injected removal
+        """
+        if self._probe_removed():
+            self.logger.error(f"Device not found: {self.device}")
+            return False
+        return True
+    
+    def check_device_permissions(self):
+        """Simulated device is always accessible"""
+        return True
+    
+    def list_available_devices(self):
+        """
+        List the simulated device while it is attached
+        
+        Returns:
+            list: Device paths
+        """
+        return [] if self._removed_probes > 0 else [self.device]
+    
+    def _capture(self, timeout):
+        """
+        Run one simulated capture attempt
+        
+        Returns:
+            tuple: (data: bytes or None, error_message: str or None)
+        """
+        fault = self._next_fault()
+        
+        if fault and fault.type == 'device_removed':
+            self.injected['device_removed'] += 1
+            self._removed_probes = max(self._removed_probes, fault.duration)
+        
+        if self._probe_removed():
+            self._delay(0.05)
+            return (None, f"Error opening device {self.device}: No such file or directory")
+        
+        if fault is None or fault.type == 'device_removed':
+            self._delay(self.base_latency)
+            return (self.frame, None)
+        
+        self.injected[fault.type] += 1
+        
+        if fault.type == 'timeout':
+            self._delay(timeout)
+            return (None, f"Capture timeout after {timeout}s")
+        
+        if fault.type == 'exit':
+            self._delay(self.base_latency)
+            message = fault.message or f"Error opening device {self.device}: Device or resource busy"
+            return (None, f"{message} (exit status {fault.code})")
+        
+        if fault.type == 'slow_write':
+            latency = fault.latency if fault.latency is not None else timeout * 0.8
+            if latency >= timeout:
+                self._delay(timeout)
+                return (None, f"Capture timeout after {timeout}s")
+            self._delay(latency)
+            return (self.frame, None)
+        
+        self._delay(self.base_latency)
+        if fault.type == 'empty':
+            return (b'', None)
+        
+        # truncated: the write stopped partway through the JPEG
+        return (self.frame[:int(len(self.frame) * fault.fraction)], None)
+    
+    def capture_image(self, output_path, timeout=None):
+        """
+        Simulated capture with the same contract as CameraInterface.capture_image
+        Empty and truncated faults report success, as fswebcam can, and leave
+        a bad file for verification to catch
+        
+        Args:
+            output_path: Full path where image should be saved
+            timeout: Optional override for capture_timeout (seconds)
+            
+        Returns:
+            tuple: (success: bool, error_message: str or None)
+        """
+        if timeout is None:
+            timeout = self.timeout
+        
+        data, error = self._capture(timeout)
+        if data is None:
+            self.logger.debug(f"Injected fault: {error}")
+            return (False, error)
+        
+        with open(output_path, 'wb') as f:
+            f.write(data)
+        return (True, None)
+    
+    def grab_frame(self):
+        """
+        Simulated in-memory frame grab
+        
+        Returns:
+            tuple: (frame: bytes or None, error_message: str or None)
+        """
+        data, error = self._capture(self.timeout)
+        if data is None:
+            return (None, error)
+        return (data or None, None if data else "Empty frame")
+    
+    def get_device_info(self):
+        """Describe the simulated device"""
+        return {'raw_info': f"fault injection camera (seed {self.seed}, {len(self.faults)} faults)"}
+    
+    def reset_device(self):
+        """
+        Simulated USB reset: recovers a wedged device, not a removed one
+        
+        Returns:
+            bool: True if the device was present to reset
+        """
+        if self._removed_probes > 0:
+            self.logger.warning(f"Device reset unavailable: {self.device} is removed")
+            return False
+        
+        self._active.clear()
+        self.logger.info("Simulated camera reset")
+        return True
+    
+    def get_stats(self):
+        """
+        Get injection statistics
+        
+        Returns:
+            dict: Attempts, simulated time and faults injected per type
+        """
+        return {
+            'attempts': self.attempts,
+            'simulated_seconds': round(self.simulated_seconds, 3),
+            'injected': dict(self.injected)
+        }
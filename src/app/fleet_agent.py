@@ -0,0 +1,446 @@
+"""
+Fleet Agent Module
+Pushes batched, compressed health metrics and catalog deltas to a fleet aggregator
+"""
+
+import json
+import math
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+import zlib
+from collections import deque
+
+from .uploader import ConnectionPool
+
+
+# Batch format version (checked by the aggregator)
+BATCH_VERSION = 1
+
+# Latest timestamp a batch may carry (year 3000; later ones overflow datetime)
+MAX_TIMESTAMP = 32503680000
+
+
+def encode_batch(batch, level=9):
+    """
+    Serialize and compress a batch
+    
+    Args:
+        batch: Batch dict
+        level: zlib compression level
+        
+    Returns:
+        bytes: Compressed compact JSON
+    """
+    return zlib.compress(json.dumps(batch, separators=(',', ':')).encode(), level)
+
+
+def decode_batch(payload):
+    """
+    Decompress and parse a batch
+    
+    Args:
+        payload: Bytes from encode_batch
+        
+    Returns:
+        dict: Batch
+        
+    Raises:
+        ValueError: If the payload is not a valid batch
+    """
+    try:
+        batch = json.loads(zlib.decompress(payload))
+    except (zlib.error, UnicodeDecodeError) as e:
+        raise ValueError(f"undecodable batch: {e}")
+    
+    if not isinstance(batch, dict) or batch.get('v') != BATCH_VERSION or not batch.get('node'):
+        raise ValueError("not a fleet batch")
+    _check_batch(batch)
+    return batch
+
+
+def _is_int(value):
+    """True for a JSON integer (bools excluded)"""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_timestamp(value):
+    """True for a finite Unix time that datetime can represent"""
+    return ((_is_int(value) or isinstance(value, float)) and math.isfinite(value)
+            and 0 <= value <= MAX_TIMESTAMP)
+
+
+def _check_batch(batch):
+    """
+    Check the shape and types of a decoded batch, so the aggregator can
+    store it without further checks
+    
+    Raises:
+        ValueError: Naming the first field that is missing or malformed
+    """
+    if not isinstance(batch['node'], str):
+        raise ValueError("bad batch: node")
+    if not isinstance(batch.get('boot'), str) or not batch['boot']:
+        raise ValueError("bad batch: boot")
+    if not _is_int(batch.get('batch')) or batch['batch'] < 0:
+        raise ValueError("bad batch: batch")
+    
+    metrics = batch.get('metrics')
+    if not isinstance(metrics, dict):
+        raise ValueError("bad batch: metrics")
+    keys = metrics.get('keys')
+    if not isinstance(keys, list) or not all(isinstance(key, str) for key in keys):
+        raise ValueError("bad batch: metrics.keys")
+    rows = metrics.get('rows')
+    if not isinstance(rows, list):
+        raise ValueError("bad batch: metrics.rows")
+    for row in rows:
+        if not isinstance(row, list) or not row or len(row) > len(keys) + 1 or not _is_timestamp(row[0]):
+            raise ValueError("bad batch: metrics row")
+    
+    catalog = batch.get('catalog', {})
+    if not isinstance(catalog, dict):
+        raise ValueError("bad batch: catalog")
+    frames = catalog.get('frames', [])
+    updates = catalog.get('updates', [])
+    if not isinstance(frames, list) or not isinstance(updates, list):
+        raise ValueError("bad batch: catalog")
+    for frame in frames:
+        if (not isinstance(frame, list) or len(frame) != 4 or not _is_int(frame[0])
+                or not isinstance(frame[1], str) or not _is_timestamp(frame[2])
+                or not _is_int(frame[3]) or frame[3] < 0):
+            raise ValueError("bad batch: catalog frame")
+    for update in updates:
+        if (not isinstance(update, dict) or not isinstance(update.get('update'), str)
+                or not _is_timestamp(update.get('time'))):
+            raise ValueError("bad batch: catalog update")
+
+
+class FleetAgent:
+    """
+    Samples this node's health metrics and ships them in batches
+    Samples are stored column-wise (keys once, then rows of values) and
+    zlib-compressed, so a batch of minute samples costs a few hundred bytes.
+    HTTP batches that fail are kept (bounded) and resent in order; UDP is
+    fire-and-forget, split into datagrams that fit one packet.
+    """
+    
+    def __init__(self, config, logger, health_check, catalog=None):
+        """
+        Initialize fleet agent
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            health_check: HealthCheck whose metrics are sampled
+            catalog: Optional CaptureCatalog whose new records are shipped
+        """
+        self.config = config
+        self.logger = logger
+        self.health = health_check
+        self.catalog = catalog
+        
+        fleet = config.get('fleet', {}) or {}
+        self.node = fleet.get('node_id') or socket.gethostname()
+        self.transport = fleet.get('transport', 'http')
+        self.url = fleet.get('url', 'http://127.0.0.1:8090/ingest')
+        self.udp_host = fleet.get('udp_host', '127.0.0.1')
+        self.udp_port = fleet.get('udp_port', 8091)
+        self.max_datagram = fleet.get('max_datagram', 1200)
+        self.sample_interval = fleet.get('sample_interval', 60)
+        self.batch_samples = fleet.get('batch_samples', 5)
+        self.metrics = fleet.get('metrics') or []
+        self.send_catalog = fleet.get('send_catalog', True) and catalog is not None
+        self.max_catalog_records = fleet.get('max_catalog_records', 5000)
+        self.max_pending = fleet.get('max_pending', 100)
+        self.timeout = fleet.get('timeout', 10)
+        self.token = fleet.get('token', '')
+        self.level = fleet.get('compress_level', 9)
+        self.disk_path = config['files']['capture_dir']
+        
+        self.state_file = fleet.get('state_file') or os.path.join(config['files']['log_dir'], 'fleet_state.json')
+        
+        # A new boot id per process lets the aggregator tell resent batches from a restart
+        self.boot = uuid.uuid4().hex[:8]
+        self.batch_no = 0
+        self._rows = []
+        self._keys = []
+        self._pending = deque()
+        self._cursor = self._load_cursor()
+        if self._cursor is None and self.send_catalog:
+            # First run: ship frames captured from now on, not the backlog
+            self._cursor = self.catalog.read_from(None)[1]
+        
+        self._pool = ConnectionPool(self.url, 1, self.timeout) if self.transport == 'http' else None
+        self._socket = None
+        
+        self.running = False
+        self._thread = None
+        self._stop_event = threading.Event()
+        
+        # Metrics
+        self.batches_sent = 0
+        self.send_failures = 0
+        self.batches_dropped = 0
+        self.bytes_sent = 0
+        self.raw_bytes = 0
+        self.started = time.monotonic()
+    
+    def _load_cursor(self):
+        """Catalog position of the last acknowledged batch"""
+        try:
+            with open(self.state_file, 'r') as f:
+                cursor = json.load(f).get('catalog_cursor')
+            return tuple(cursor) if cursor else None
+        except (OSError, ValueError):
+            return None
+    
+    def _save_cursor(self, cursor):
+        """Persist the catalog position atomically"""
+        tmp_path = self.state_file + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'catalog_cursor': cursor}, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            self.logger.debug(f"Fleet state not saved: {e}")
+    
+    def start(self):
+        """Start sampling and shipping in a background thread"""
+        if self.running:
+            return
+        
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="fleet-agent", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Fleet agent started (node {self.node}, {self.transport}, "
+                         f"{self.sample_interval}s samples x {self.batch_samples})")
+    
+    def stop(self):
+        """Ship what has been sampled and stop"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(self.timeout + 5)
+            self._thread = None
+        
+        self.sample()
+        self.flush()
+        
+        if self._pool:
+            self._pool.close_all()
+        if self._socket:
+            self._socket.close()
+    
+    def _run(self):
+        """Sample loop; ships every batch_samples samples"""
+        while not self._stop_event.wait(self.sample_interval):
+            try:
+                self.sample()
+                if len(self._rows) >= self.batch_samples:
+                    self.flush()
+            except Exception as e:
+                self.logger.error(f"Fleet agent error: {e}")
+    
+    def sample(self):
+        """Append one row of numeric health metrics"""
+        values = {
+            key: round(value, 3) if isinstance(value, float) else value
+            for key, value in self.health.get_metrics().items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+            and (not self.metrics or key in self.metrics)
+        }
+        
+        try:
+            values['disk_free_mb'] = shutil.disk_usage(self.disk_path).free // (1024 * 1024)
+        except OSError:
+            pass
+        
+        for key in values:
+            if key not in self._keys:
+                self._keys.append(key)
+        
+        self._rows.append([round(time.time(), 1)] + [values.get(key) for key in self._keys])
+    
+    def _build_batch(self):
+        """Turn sampled rows and new catalog records into a batch"""
+        width = len(self._keys) + 1
+        batch = {
+            'v': BATCH_VERSION,
+            'node': self.node,
+            'boot': self.boot,
+            'batch': self.batch_no,
+            'sent': round(time.time(), 1),
+            'metrics': {
+                'keys': list(self._keys),
+                # Rows sampled before a key first appeared are padded
+                'rows': [row + [None] * (width - len(row)) for row in self._rows]
+            }
+        }
+        self._rows = []
+        
+        cursor = self._cursor
+        if self.send_catalog:
+            records, cursor = self.catalog.read_from(self._cursor, self.max_catalog_records)
+            frames = [[r['seq'], r['name'], r['time'], r['size']] for r in records if 'seq' in r]
+            updates = [r for r in records if 'update' in r]
+            if frames or updates:
+                batch['catalog'] = {'frames': frames, 'updates': updates}
+        
+        return batch, cursor
+    
+    def flush(self):
+        """
+        Ship sampled rows and catalog deltas, then anything still pending
+        
+        Returns:
+            bool: True if nothing is left pending
+        """
+        if self._rows or self.send_catalog:
+            batch, cursor = self._build_batch()
+            self._cursor = cursor
+            
+            if batch['metrics']['rows'] or 'catalog' in batch:
+                self.batch_no += 1
+                self._pending.append((batch, cursor))
+                
+                while len(self._pending) > self.max_pending:
+                    self._pending.popleft()
+                    self.batches_dropped += 1
+        
+        while self._pending:
+            batch, cursor = self._pending[0]
+            if not self._send(batch):
+                return False
+            
+            self._pending.popleft()
+            if cursor:
+                self._save_cursor(cursor)
+        
+        return True
+    
+    def _send(self, batch):
+        """
+        Send one batch over the configured transport
+        
+        Returns:
+            bool: True if delivered (HTTP) or handed to the network (UDP)
+        """
+        try:
+            if self.transport == 'udp':
+                self._send_udp(batch)
+            else:
+                self._send_http(encode_batch(batch, self.level))
+        
+        except (OSError, ValueError) as e:
+            self.send_failures += 1
+            self.logger.warning(f"Fleet batch {batch['batch']} not sent ({len(self._pending)} pending): {e}")
+            return False
+        
+        self.batches_sent += 1
+        self.raw_bytes += len(json.dumps(batch, separators=(',', ':')))
+        return True
+    
+    def _send_http(self, payload):
+        """POST a compressed batch on the pooled keep-alive connection"""
+        import http.client
+        
+        headers = {
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'deflate',
+            'Content-Length': str(len(payload)),
+            'Connection': 'keep-alive'
+        }
+        if self.token:
+            headers['X-Fleet-Token'] = self.token
+        
+        conn = self._pool.acquire()
+        reuse = False
+        try:
+            conn.request('POST', self._pool.base_path or '/', body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            reuse = True
+        except http.client.HTTPException as e:
+            raise OSError(str(e))
+        finally:
+            self._pool.release(conn, reuse=reuse)
+        
+        if response.status not in (200, 202, 204):
+            raise OSError(f"HTTP {response.status} {response.reason}")
+        
+        # Request line and headers are roughly constant; count them for the link budget
+        self.bytes_sent += len(payload) + 200
+    
+    def _send_udp(self, batch):
+        """Send a batch as one or more datagrams"""
+        if self._socket is None:
+            self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        
+        if self.token:
+            batch = dict(batch, token=self.token)
+        
+        for payload in self._split(batch):
+            self._socket.sendto(payload, (self.udp_host, self.udp_port))
+            self.bytes_sent += len(payload) + 28  # IPv4 + UDP headers
+    
+    def _split(self, batch):
+        """
+        Encode a batch into datagrams of at most max_datagram bytes
+        Halves the longest list (metric rows, frames or updates) until each part fits
+        
+        Returns:
+            list: Encoded payloads
+        """
+        payload = encode_batch(batch, self.level)
+        if len(payload) <= self.max_datagram:
+            return [payload]
+        
+        catalog = batch.get('catalog', {})
+        lists = [('rows', batch['metrics']['rows']),
+                 ('frames', catalog.get('frames', [])),
+                 ('updates', catalog.get('updates', []))]
+        name, longest = max(lists, key=lambda item: len(item[1]))
+        if len(longest) <= 1:
+            raise ValueError(f"batch part of {len(payload)} bytes exceeds max_datagram")
+        
+        middle = len(longest) // 2
+        
+        # The first half keeps every other list, the second carries only its share
+        head = dict(batch)
+        tail = {key: value for key, value in batch.items() if key != 'catalog'}
+        tail['metrics'] = dict(batch['metrics'], rows=[])
+        
+        if name == 'rows':
+            head['metrics'] = dict(batch['metrics'], rows=longest[:middle])
+            tail['metrics'] = dict(batch['metrics'], rows=longest[middle:])
+        else:
+            head['catalog'] = dict(catalog, **{name: longest[:middle]})
+            tail['catalog'] = {name: longest[middle:]}
+        
+        return self._split(head) + self._split(tail)
+    
+    def get_stats(self):
+        """
+        Get agent statistics
+        
+        Returns:
+            dict: Batches, bytes on the wire and compression
+        """
+        hours = max((time.monotonic() - self.started) / 3600, 1 / 60)
+        return {
+            'fleet_batches_sent': self.batches_sent,
+            'fleet_send_failures': self.send_failures,
+            'fleet_pending': len(self._pending),
+            'fleet_batches_dropped': self.batches_dropped,
+            'fleet_bytes_sent': self.bytes_sent,
+            'fleet_kb_per_hour': round(self.bytes_sent / 1024 / hours, 1),
+            'fleet_compression': round(self.raw_bytes / self.bytes_sent, 1) if self.bytes_sent else 0.0
+        }
@@ -0,0 +1,519 @@
+"""
+Fleet Aggregator Module
+Receives fleet agent batches and answers fleet-wide queries
+"""
+
+import glob
+import json
+import os
+import re
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .fleet_agent import decode_batch
+
+
+# Node ids become directory names
+NODE_ID = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def _node_dir(node):
+    """
+    Directory-safe form of a node id
+    
+    Args:
+        node: Node id as sent by an agent or a query
+        
+    Returns:
+        str: Id with unsafe characters replaced and leading dots dropped
+        
+    Raises:
+        ValueError: If nothing usable is left (empty, '.' or '..')
+    """
+    name = NODE_ID.sub('_', str(node)).lstrip('.')[:64]
+    if not name:
+        raise ValueError(f"invalid node id: {node!r}")
+    return name
+
+
+class _FleetHandler(BaseHTTPRequestHandler):
+    """Ingest (POST) and query (GET) endpoints"""
+    
+    protocol_version = 'HTTP/1.1'  # keep-alive for agents
+    
+    def log_message(self, format, *args):
+        """Route access logs to the aggregator logger at debug level"""
+        self.server.owner.logger.debug(f"Fleet {self.address_string()} - {format % args}")
+    
+    def _reply(self, status, body=None):
+        """Send a JSON response (or an empty one)"""
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        if body is not None:
+            self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def do_POST(self):
+        """Accept a compressed batch"""
+        owner = self.server.owner
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        
+        if urlsplit(self.path).path.rstrip('/') != '/ingest':
+            self._reply(404)
+            return
+        
+        try:
+            owner.ingest(body, self.client_address[0], token=self.headers.get('X-Fleet-Token'))
+        except PermissionError:
+            self._reply(403)
+            return
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+            return
+        except Exception as e:
+            owner.logger.error(f"Fleet batch from {self.client_address[0]} failed: {e!r}")
+            self._reply(500)
+            return
+        
+        self._reply(204)
+    
+    def do_GET(self):
+        """Fleet queries"""
+        owner = self.server.owner
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        
+        try:
+            since = float(query['since']) if 'since' in query else None
+            if 'hours' in query:
+                since = time.time() - float(query['hours']) * 3600
+            until = float(query['until']) if 'until' in query else None
+            
+            path = parts.path.rstrip('/')
+            if path == '/nodes':
+                self._reply(200, owner.node_summaries())
+            elif path == '/fleet':
+                self._reply(200, owner.fleet(query.get('metric')))
+            elif path == '/series' and 'metric' in query:
+                self._reply(200, owner.series(query['metric'], query.get('node'), since, until))
+            elif path == '/frames':
+                self._reply(200, owner.frames(query.get('node'), since, until, int(query.get('limit', 1000))))
+            else:
+                self._reply(404)
+        except ValueError as e:
+            self._reply(400, {'error': str(e)})
+
+
+class FleetAggregator:
+    """
+    Collects agent batches into per-node daily JSON-lines segments
+    (metrics_YYYYMMDD.jsonl and catalog_YYYYMMDD.jsonl under <data_dir>/<node>)
+    and keeps each node's latest sample in memory for fleet-wide answers
+    """
+    
+    def __init__(self, config, logger):
+        """
+        Initialize fleet aggregator
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+        """
+        self.config = config
+        self.logger = logger
+        
+        aggregator = config.get('fleet_aggregator', {}) or {}
+        self.host = aggregator.get('host', '0.0.0.0')
+        self.port = aggregator.get('port', 8090)
+        self.udp_port = aggregator.get('udp_port', 8091)
+        self.data_dir = aggregator.get('data_dir') or os.path.join(config['files']['log_dir'], 'fleet')
+        self.stale_after = aggregator.get('stale_after', 600)
+        self.retention_days = aggregator.get('retention_days', 30)
+        self.token = aggregator.get('token', '')
+        
+        os.makedirs(self.data_dir, exist_ok=True)
+        
+        self.nodes = {}
+        self._lock = threading.Lock()
+        self._last_expire = 0
+        
+        self.running = False
+        self._server = None
+        self._udp = None
+        self._threads = []
+        
+        # Metrics
+        self.batches = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.bytes_received = 0
+        
+        self._load()
+    
+    def _load(self):
+        """Rebuild each node's latest sample from its newest metrics segment"""
+        for node_dir in sorted(glob.glob(os.path.join(self.data_dir, '*'))):
+            segments = sorted(glob.glob(os.path.join(node_dir, 'metrics_*.jsonl')))
+            if not segments:
+                continue
+            
+            state = self._node_state(os.path.basename(node_dir))
+            with open(segments[-1], 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record['t'] >= (state['latest_time'] or 0):
+                        state['latest'].update(record['m'])
+                        state['latest_time'] = state['last_seen'] = record['t']
+    
+    def _node_state(self, node):
+        """Get or create the in-memory state of a node"""
+        state = self.nodes.get(node)
+        if state is None:
+            state = self.nodes[node] = {
+                'last_seen': None, 'address': None, 'boot': None, 'batch': -1,
+                'latest': {}, 'latest_time': None, 'batches': 0, 'bytes': 0, 'frames': 0
+            }
+        return state
+    
+    def start(self):
+        """Serve HTTP (and UDP if udp_port is set) in background threads"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _FleetHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.running = True
+        
+        self._threads = [threading.Thread(target=self._server.serve_forever, name="fleet-http", daemon=True)]
+        
+        if self.udp_port:
+            self._udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            self._udp.bind((self.host, self.udp_port))
+            self._udp.settimeout(1.0)
+            self._threads.append(threading.Thread(target=self._serve_udp, name="fleet-udp", daemon=True))
+        
+        for thread in self._threads:
+            thread.start()
+        
+        self.logger.info(f"Fleet aggregator on http://{self.host}:{self.port}/"
+                         + (f" and udp://{self.host}:{self.udp_port}" if self.udp_port else "")
+                         + f" -> {self.data_dir}")
+    
+    def stop(self):
+        """Stop serving"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join(2)
+        if self._udp:
+            self._udp.close()
+    
+    def _serve_udp(self):
+        """Receive datagrams (no acknowledgements, so no duplicate check)"""
+        while self.running:
+            try:
+                payload, address = self._udp.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            
+            try:
+                self.ingest(payload, address[0], dedupe=False)
+            except (ValueError, PermissionError) as e:
+                self.logger.debug(f"Fleet datagram from {address[0]} rejected: {e!r}")
+            except Exception as e:
+                # Keep listening; one bad datagram must not end the thread
+                self.logger.error(f"Fleet datagram from {address[0]} failed: {e!r}")
+    
+    def ingest(self, payload, address=None, token=None, dedupe=True):
+        """
+        Store one batch
+        
+        Args:
+            payload: Compressed batch from a fleet agent
+            address: Sender address (for node listings)
+            token: Token presented with the request (UDP batches carry their own)
+            dedupe: Skip batches already stored (resent after a lost response)
+            
+        Returns:
+            bool: True if stored, False if it was a duplicate
+            
+        Raises:
+            ValueError: If the payload is not a valid batch
+            PermissionError: If the token does not match
+        """
+        try:
+            batch = decode_batch(payload)
+            node = _node_dir(batch['node'])
+        except ValueError:
+            self.rejected += 1
+            raise
+        
+        if self.token and (token or batch.get('token')) != self.token:
+            self.rejected += 1
+            raise PermissionError("bad fleet token")
+        
+        # Everything that can fail on content happens before any state changes
+        segments, samples, frames = self._records(node, batch)
+        
+        with self._lock:
+            state = self._node_state(node)
+            
+            if dedupe and state['boot'] == batch['boot'] and batch['batch'] <= state['batch']:
+                self.duplicates += 1
+                return False
+            
+            self._store(node, segments)
+            
+            for timestamp, values in samples:
+                if timestamp >= (state['latest_time'] or 0):
+                    state['latest'].update(values)
+                    state['latest_time'] = timestamp
+            state['frames'] += frames
+            state['boot'] = batch['boot']
+            state['batch'] = max(state['batch'], batch['batch']) if dedupe else batch['batch']
+            state['last_seen'] = time.time()
+            state['address'] = address
+            state['batches'] += 1
+            state['bytes'] += len(payload)
+            self.batches += 1
+            self.bytes_received += len(payload)
+        
+        if time.time() - self._last_expire > 3600:
+            self.expire()
+        return True
+    
+    def _records(self, node, batch):
+        """
+        Turn a decoded batch into segment records
+        
+        Returns:
+            tuple: (segment path -> records, [(time, metric values)], frame count)
+        """
+        lines = {}
+        samples = []
+        
+        keys = batch['metrics']['keys']
+        for row in batch['metrics']['rows']:
+            values = {key: value for key, value in zip(keys, row[1:]) if value is not None}
+            lines.setdefault(('metrics', row[0]), []).append({'t': row[0], 'm': values})
+            samples.append((row[0], values))
+        
+        catalog = batch.get('catalog', {})
+        frames = catalog.get('frames', [])
+        for seq, name, timestamp, size in frames:
+            lines.setdefault(('catalog', timestamp), []).append(
+                {'seq': seq, 'name': name, 'time': timestamp, 'size': size}
+            )
+        for update in catalog.get('updates', []):
+            lines.setdefault(('catalog', update['time']), []).append(update)
+        
+        # Group by segment so each file is opened once per batch
+        segments = {}
+        for (kind, timestamp), records in lines.items():
+            segments.setdefault(self._segment_path(node, kind, timestamp), []).extend(records)
+        
+        return segments, samples, len(frames)
+    
+    def _store(self, node, segments):
+        """Append records to the node's segments"""
+        node_dir = os.path.join(self.data_dir, node)
+        os.makedirs(node_dir, exist_ok=True)
+        for path, records in segments.items():
+            with open(path, 'a') as f:
+                f.write(''.join(json.dumps(r, separators=(',', ':')) + '\n' for r in records))
+    
+    def _segment_path(self, node, kind, timestamp):
+        """Segment file holding a record of this kind and time"""
+        day = datetime.fromtimestamp(timestamp).strftime('%Y%m%d')
+        return os.path.join(self.data_dir, node, f"{kind}_{day}.jsonl")
+    
+    def expire(self):
+        """
+        Delete segments older than retention_days
+        
+        Returns:
+            int: Segments deleted
+        """
+        self._last_expire = time.time()
+        if not self.retention_days:
+            return 0
+        
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime('%Y%m%d')
+        deleted = 0
+        for path in glob.glob(os.path.join(self.data_dir, '*', '*_*.jsonl')):
+            if os.path.basename(path).rsplit('_', 1)[1][:8] < cutoff:
+                os.remove(path)
+                deleted += 1
+        return deleted
+    
+    def _read(self, node, kind, since=None, until=None):
+        """
+        Stream a node's records of one kind within a time range
+        
+        Yields:
+            dict: Records, oldest segment first
+            
+        Raises:
+            ValueError: If the node id is not usable as a directory name
+        """
+        node = _node_dir(node)
+        first = datetime.fromtimestamp(since).strftime('%Y%m%d') if since else ''
+        last = datetime.fromtimestamp(until).strftime('%Y%m%d') if until else '99999999'
+        
+        for path in sorted(glob.glob(os.path.join(self.data_dir, node, f"{kind}_*.jsonl"))):
+            day = os.path.basename(path)[len(kind) + 1:-len('.jsonl')]
+            if not first <= day <= last:
+                continue
+            
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    
+                    timestamp = record.get('t', record.get('time'))
+                    if (since and timestamp < since) or (until and timestamp >= until):
+                        continue
+                    yield record
+    
+    def node_summaries(self):
+        """
+        List nodes with their latest sample
+        
+        Returns:
+            dict: node -> last_seen, age, stale, address, batches, frames, latest metrics
+        """
+        now = time.time()
+        with self._lock:
+            return {
+                node: {
+                    'last_seen': state['last_seen'],
+                    'age': round(now - state['last_seen'], 1) if state['last_seen'] else None,
+                    'stale': not state['last_seen'] or now - state['last_seen'] > self.stale_after,
+                    'address': state['address'],
+                    'batches': state['batches'],
+                    'frames': state['frames'],
+                    'latest': dict(state['latest'])
+                }
+                for node, state in sorted(self.nodes.items())
+            }
+    
+    def fleet(self, metric=None):
+        """
+        Aggregate the latest value of each metric across nodes
+        
+        Args:
+            metric: One metric name, or None for every metric
+            
+        Returns:
+            dict: nodes, stale (list), and per metric min/max/mean/sum with
+                  the nodes holding the min and max (plus every node's value
+                  when a single metric is asked for)
+        """
+        summaries = self.node_summaries()
+        result = {
+            'nodes': len(summaries),
+            'stale': [node for node, summary in summaries.items() if summary['stale']],
+            'metrics': {}
+        }
+        
+        keys = [metric] if metric else sorted({key for s in summaries.values() for key in s['latest']})
+        for key in keys:
+            values = {node: s['latest'][key] for node, s in summaries.items() if key in s['latest']}
+            if not values:
+                continue
+            
+            low = min(values, key=values.get)
+            high = max(values, key=values.get)
+            entry = {
+                'min': values[low], 'min_node': low,
+                'max': values[high], 'max_node': high,
+                'mean': round(sum(values.values()) / len(values), 3),
+                'sum': round(sum(values.values()), 3)
+            }
+            if metric:
+                entry['values'] = values
+            result['metrics'][key] = entry
+        
+        return result
+    
+    def series(self, metric, node=None, since=None, until=None):
+        """
+        Time series of one metric
+        
+        Args:
+            metric: Metric name
+            node: One node, or None for every node
+            since: Start (Unix seconds)
+            until: End (Unix seconds)
+            
+        Returns:
+            dict: node -> [[time, value], ...]
+        """
+        nodes = [node] if node else sorted(self.nodes)
+        return {
+            name: [[r['t'], r['m'][metric]] for r in self._read(name, 'metrics', since, until) if metric in r['m']]
+            for name in nodes
+        }
+    
+    def frames(self, node=None, since=None, until=None, limit=1000):
+        """
+        Catalog query: one node's frames, or per-node frame counts
+        
+        Args:
+            node: Node to list frames for, or None for counts across the fleet
+            since: Start (Unix seconds)
+            until: End (Unix seconds)
+            limit: Maximum frames listed for one node (the newest are kept)
+            
+        Returns:
+            list or dict: Frames (updates applied) for a node, else node -> frames, bytes
+        """
+        if node is None:
+            counts = {}
+            for name in sorted(self.nodes):
+                frames = self.frames(name, since, until, limit=None)
+                counts[name] = {'frames': len(frames), 'bytes': sum(f['size'] for f in frames)}
+            return counts
+        
+        frames = {}
+        for record in self._read(node, 'catalog', since, until):
+            if 'update' in record:
+                frame = frames.pop(record.pop('update'), None)
+                if frame:
+                    frame.update(record)
+                    frames[frame['name']] = frame
+            else:
+                frames[record['name']] = record
+        
+        ordered = sorted(frames.values(), key=lambda frame: frame['seq'])
+        return ordered[-limit:] if limit else ordered
+    
+    def get_stats(self):
+        """
+        Get aggregator statistics
+        
+        Returns:
+            dict: Nodes, batches and bytes received
+        """
+        return {
+            'nodes': len(self.nodes),
+            'batches': self.batches,
+            'duplicates': self.duplicates,
+            'rejected': self.rejected,
+            'received_kb': round(self.bytes_received / 1024, 1)
+        }
@@ -0,0 +1,301 @@
+"""
+Frame Stream Module
+Single shared capture stream from the camera, consumed by many readers
+"""
+
+import os
+import subprocess
+import threading
+import time
+
+
+class FrameStream:
+    """
+    Owns the camera while streaming and publishes each grabbed frame once
+    Readers get a reference to the same immutable bytes object (no per-reader copy)
+    """
+    
+    SOI = b'\xff\xd8'
+    EOI = b'\xff\xd9'
+    READ_SIZE = 64 * 1024
+    
+    def __init__(self, config, logger, camera):
+        """
+        Initialize frame stream
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            camera: CameraInterface instance
+        """
+        self.config = config
+        self.logger = logger
+        self.camera = camera
+        
+        stream = config.get('stream', {})
+        self.backend = stream.get('backend', 'ffmpeg')
+        self.fps = max(1, stream.get('fps', 10))
+        self.input_format = stream.get('input_format', 'mjpeg')
+        self.restart_delay = stream.get('restart_delay', 2)
+        
+        self.running = False
+        self._thread = None
+        self._process = None
+        
+        # Latest frame, replaced atomically under the condition
+        self._cond = threading.Condition()
+        self._frame = None
+        self._seq = 0
+        self._timestamp = None
+        
+        # Metrics
+        self.frames_grabbed = 0
+        self.grab_errors = 0
+        self.restarts = 0
+    
+    def start(self):
+        """Start grabbing frames in a background thread"""
+        if self.running:
+            return
+        
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name="frame-stream", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Frame stream started ({self.backend}, {self.fps} fps)")
+    
+    def stop(self):
+        """Stop grabbing and release the camera"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._terminate_process()
+        
+        if self._thread:
+            self._thread.join(5)
+            self._thread = None
+        
+        with self._cond:
+            self._cond.notify_all()
+        
+        self.logger.info(f"Frame stream stopped ({self.frames_grabbed} frames grabbed)")
+    
+    def is_running(self):
+        """
+        Check whether the stream currently owns the camera
+        
+        Returns:
+            bool: True if streaming
+        """
+        return self.running
+    
+    def _run(self):
+        """Grab loop, restarting the backend if it dies"""
+        while self.running:
+            try:
+                if self.backend == 'ffmpeg':
+                    self._run_ffmpeg()
+                else:
+                    self._run_fswebcam()
+            except Exception as e:
+                self.logger.error(f"Frame stream error: {e}")
+            
+            if self.running:
+                self.restarts += 1
+                self.logger.warning(f"Frame stream restarting in {self.restart_delay}s")
+                time.sleep(self.restart_delay)
+    
+    def _build_ffmpeg_command(self):
+        """
+        Build ffmpeg command that writes concatenated JPEGs to stdout
+        
+        Returns:
+            list: Command and arguments
+        """
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-f', 'v4l2',
+            '-input_format', self.input_format,
+            '-framerate', str(self.fps),
+            '-video_size', self.camera.resolution,
+            '-i', self.camera.device
+        ]
+        
+        if self.input_format == 'mjpeg':
+            # Camera already delivers JPEG, pass it through untouched
+            cmd.extend(['-c:v', 'copy'])
+        else:
+            # Map quality 1-100 onto ffmpeg's 2-31 qscale (lower is better)
+            qscale = max(2, min(31, round(31 - (self.camera.quality / 100) * 29)))
+            cmd.extend(['-c:v', 'mjpeg', '-q:v', str(qscale)])
+        
+        cmd.extend(['-f', 'mjpeg', '-'])
+        return cmd
+    
+    def _run_ffmpeg(self):
+        """Read a persistent MJPEG stream and split it into frames"""
+        cmd = self._build_ffmpeg_command()
+        self.logger.debug(f"Executing: {' '.join(cmd)}")
+        
+        try:
+            self._process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except FileNotFoundError:
+            self.logger.error("ffmpeg not found - is it installed?")
+            return
+        
+        buffer = bytearray()
+        stdout = self._process.stdout
+        
+        while self.running:
+            chunk = os.read(stdout.fileno(), self.READ_SIZE)
+            if not chunk:
+                break
+            
+            buffer.extend(chunk)
+            
+            # Publish every complete SOI..EOI frame in the buffer
+            while True:
+                start = buffer.find(self.SOI)
+                if start < 0:
+                    buffer.clear()
+                    break
+                
+                end = buffer.find(self.EOI, start + 2)
+                if end < 0:
+                    if start:
+                        del buffer[:start]
+                    break
+                
+                self._publish(bytes(buffer[start:end + 2]))
+                del buffer[:end + 2]
+        
+        self._terminate_process()
+    
+    def _run_fswebcam(self):
+        """Repeatedly grab single frames when no streaming backend is available"""
+        period = 1.0 / self.fps
+        
+        while self.running:
+            started = time.monotonic()
+            frame, error = self.camera.grab_frame()
+            
+            if frame:
+                self._publish(frame)
+            else:
+                self.grab_errors += 1
+                self.logger.debug(f"Frame grab failed: {error}")
+            
+            remaining = period - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+    
+    def _terminate_process(self):
+        """Stop the streaming subprocess if one is running"""
+        process = self._process
+        self._process = None
+        
+        if process and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=3)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    def _publish(self, frame):
+        """
+        Make a new frame the latest one and wake all waiting readers
+        
+        Args:
+            frame: JPEG bytes
+        """
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._timestamp = time.time()
+            self.frames_grabbed += 1
+            self._cond.notify_all()
+    
+    def get_latest(self):
+        """
+        Get the most recent frame without waiting
+        
+        Returns:
+            tuple: (seq: int, timestamp: float, frame: bytes) or None if no frame yet
+        """
+        with self._cond:
+            if self._frame is None:
+                return None
+            return (self._seq, self._timestamp, self._frame)
+    
+    def wait_for_frame(self, after_seq=0, timeout=None):
+        """
+        Block until a frame newer than after_seq is available
+        Readers that fall behind skip straight to the latest frame
+        
+        Args:
+            after_seq: Sequence number of the last frame the reader saw
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            tuple: (seq: int, timestamp: float, frame: bytes) or None on timeout/stop
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._seq > after_seq or not self.running,
+                timeout
+            )
+            
+            if self._seq <= after_seq or self._frame is None:
+                return None
+            
+            return (self._seq, self._timestamp, self._frame)
+    
+    def capture_image(self, output_path, timeout=None):
+        """
+        Save the next streamed frame as a still
+        Same contract as CameraInterface.capture_image so scheduled stills keep
+        working while the stream owns the device
+        
+        Args:
+            output_path: Full path where image should be saved
+            timeout: Maximum seconds to wait for a frame (default: capture_timeout)
+            
+        Returns:
+            tuple: (success: bool, error_message: str or None)
+        """
+        if timeout is None:
+            timeout = self.camera.timeout
+        
+        latest = self.get_latest()
+        after_seq = latest[0] if latest else 0
+        
+        result = self.wait_for_frame(after_seq, timeout=timeout)
+        if result is None:
+            return (False, f"No stream frame within {timeout}s")
+        
+        try:
+            with open(output_path, 'wb') as f:
+                f.write(result[2])
+        except OSError as e:
+            return (False, f"Failed to write frame: {e}")
+        
+        return (True, None)
+    
+    def get_stats(self):
+        """
+        Get stream statistics
+        
+        Returns:
+            dict: Frame counters and current sequence number
+        """
+        return {
+            'backend': self.backend,
+            'frames_grabbed': self.frames_grabbed,
+            'grab_errors': self.grab_errors,
+            'restarts': self.restarts,
+            'seq': self._seq
+        }
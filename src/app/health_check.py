@@ -3,8 +3,7 @@ Health Check Module
 Monitors system health and camera availability
 """
 
-import time
-from datetime import datetime, timedelta
+from utils.clock import SystemClock
 
 
 class HealthCheck:
@@ -12,7 +11,8 @@ class HealthCheck:
     System health monitoring and metrics tracking
     """
     
-    def __init__(self, config, logger, camera_interface):
+    def __init__(self, config, logger, camera_interface, circuit_breaker=None, load_shedder=None,
+                 coverage=None, quality_gate=None, clock=None):
         """
         Initialize health check system
         
@@ -20,14 +20,22 @@ class HealthCheck:
             config: Configuration dictionary
             logger: Logger instance
             camera_interface: CameraInterface instance
+            circuit_breaker: Optional CircuitBreaker whose state is reported
+            load_shedder: Optional LoadShedder whose level is reported
+            coverage: Optional CoverageIndex whose recent coverage is reported
+            quality_gate: Optional QualityGate whose bad frame rate is reported
+            clock: Optional time source (default: SystemClock)
         """
         self.config = config
         self.logger = logger
         self.camera = camera_interface
+        self.circuit_breaker = circuit_breaker
+        self.load_shedder = load_shedder
+        self.coverage = coverage
+        self.quality_gate = quality_gate
+        self.clock = clock or SystemClock()
         
-        self.check_interval = config['health']['check_interval']
-        self.max_failures = config['health']['max_consecutive_failures']
-        self.alert_on_disconnect = config['health']['alert_on_disconnect']
+        self.apply_config(config)
         
         # Metrics
         self.total_captures = 0
@@ -36,9 +44,31 @@ class HealthCheck:
         self.consecutive_failures = 0
         self.last_success_time = None
         self.last_failure_time = None
-        self.start_time = datetime.now()
+        self.start_time = self.clock.now()
         self.camera_disconnects = 0
+        self.camera_reconnects = 0
+        self.last_reconnect_seconds = None
+        self.last_warmup_seconds = None
+        self.warmup_frames = 0
+        self.warmup_converged = None
+        self.warmup_timeouts = 0
         self.last_health_check = None
+        
+        # Startup latency (process start to first saved frame)
+        self._start_monotonic = self.clock.monotonic()
+        self.first_capture_seconds = None
+    
+    def apply_config(self, config):
+        """
+        Load health settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        self.check_interval = config['health']['check_interval']
+        self.max_failures = config['health']['max_consecutive_failures']
+        self.alert_on_disconnect = config['health']['alert_on_disconnect']
     
     def record_capture_attempt(self, success):
         """
@@ -52,11 +82,48 @@ class HealthCheck:
         if success:
             self.successful_captures += 1
             self.consecutive_failures = 0
-            self.last_success_time = datetime.now()
+            self.last_success_time = self.clock.now()
+            
+            if self.first_capture_seconds is None:
+                self.first_capture_seconds = round(self.clock.monotonic() - self._start_monotonic, 3)
+                self.logger.info(f"First frame captured {self.first_capture_seconds}s after start")
         else:
             self.failed_captures += 1
             self.consecutive_failures += 1
-            self.last_failure_time = datetime.now()
+            self.last_failure_time = self.clock.now()
+    
+    def record_disconnect(self):
+        """Record a camera removal reported by the device monitor"""
+        self.camera_disconnects += 1
+    
+    def record_reconnect(self, seconds=None):
+        """
+        Record a camera reattach
+        
+        Args:
+            seconds: Time the camera was gone, if known
+        """
+        self.camera_reconnects += 1
+        self.last_reconnect_seconds = seconds
+    
+    def record_warmup(self, seconds, frames=0, converged=None):
+        """
+        Record a camera warm-up
+        
+        Args:
+            seconds: Measured warm-up time
+            frames: Frames read while waiting for exposure to settle (0 for a fixed delay)
+            converged: Whether exposure settled before the timeout (None for a fixed delay)
+        """
+        self.last_warmup_seconds = seconds
+        self.warmup_frames = frames
+        self.warmup_converged = converged
+        if converged is False:
+            self.warmup_timeouts += 1
+    
+    def clear_failure_streak(self):
+        """Forget consecutive failures (e.g. after a device reset)"""
+        self.consecutive_failures = 0
     
     def check_camera_health(self):
         """
@@ -67,7 +134,7 @@ class HealthCheck:
                 status: 'healthy', 'degraded', or 'failed'
                 details: Additional health information
         """
-        self.last_health_check = datetime.now()
+        self.last_health_check = self.clock.now()
         
         # Check device presence
         if not self.camera.is_device_present():
@@ -94,6 +161,27 @@ class HealthCheck:
                 'max_allowed': self.max_failures
             })
         
+        # Degraded while the breaker holds off capture attempts
+        if self.circuit_breaker and self.circuit_breaker.get_state() == 'open':
+            return ('degraded', {
+                'reason': 'Circuit breaker open',
+                **self.circuit_breaker.get_stats()
+            })
+        
+        # Degraded while capture settings are lowered for resource pressure
+        if self.load_shedder and self.load_shedder.level > 0:
+            return ('degraded', {
+                'reason': f'Load shedding level {self.load_shedder.level}',
+                **self.load_shedder.get_stats()['load_signals']
+            })
+        
+        # Degraded while too many captured frames are blank or badly exposed
+        if self.quality_gate and self.quality_gate.is_degraded():
+            return ('degraded', {
+                'reason': f'Bad frame rate {self.quality_gate.get_bad_frame_rate():.0%}',
+                'max_allowed': f'{self.quality_gate.max_bad_rate:.0%}'
+            })
+        
         # Degraded if recent failures
         if self.consecutive_failures > 0:
             return ('degraded', {
@@ -122,7 +210,7 @@ class HealthCheck:
         Returns:
             timedelta: Time since system start
         """
-        return datetime.now() - self.start_time
+        return self.clock.now() - self.start_time
     
     def get_metrics(self):
         """
@@ -142,11 +230,30 @@ class HealthCheck:
             'success_rate': self.get_success_rate(),
             'consecutive_failures': self.consecutive_failures,
             'camera_disconnects': self.camera_disconnects,
+            'camera_reconnects': self.camera_reconnects,
+            'last_reconnect_seconds': self.last_reconnect_seconds,
+            'first_capture_seconds': self.first_capture_seconds,
+            'last_warmup_seconds': self.last_warmup_seconds,
+            'warmup_frames': self.warmup_frames,
+            'warmup_converged': self.warmup_converged,
+            'warmup_timeouts': self.warmup_timeouts,
             'last_success': self.last_success_time.strftime('%Y-%m-%d %H:%M:%S') if self.last_success_time else 'Never',
             'last_failure': self.last_failure_time.strftime('%Y-%m-%d %H:%M:%S') if self.last_failure_time else 'Never',
             'last_health_check': self.last_health_check.strftime('%Y-%m-%d %H:%M:%S') if self.last_health_check else 'Never'
         }
         
+        if self.circuit_breaker:
+            metrics.update(self.circuit_breaker.get_stats())
+        
+        if self.load_shedder:
+            metrics.update(self.load_shedder.get_stats())
+        
+        if self.coverage:
+            metrics.update(self.coverage.get_stats())
+        
+        if self.quality_gate:
+            metrics.update(self.quality_gate.get_stats())
+        
         return metrics
     
     def print_metrics(self):
@@ -163,6 +270,23 @@ class HealthCheck:
         print(f"Failed: {metrics['failed_captures']}")
         print(f"Consecutive Failures: {metrics['consecutive_failures']}")
         print(f"Camera Disconnects: {metrics['camera_disconnects']}")
+        if metrics['last_reconnect_seconds'] is not None:
+            print(f"Last Reconnect Time: {metrics['last_reconnect_seconds']}s")
+        if metrics['first_capture_seconds'] is not None:
+            print(f"First Frame Latency: {metrics['first_capture_seconds']}s")
+        if metrics['warmup_converged'] is not None:
+            print(f"Last Warm-up: {metrics['last_warmup_seconds']}s ({metrics['warmup_frames']} frames, "
+                  f"{'settled' if metrics['warmup_converged'] else 'timed out'})")
+        if 'breaker_state' in metrics:
+            print(f"Circuit Breaker: {metrics['breaker_state']} (opened {metrics['breaker_opens']}x)")
+        if 'load_level' in metrics:
+            print(f"Load Shedding Level: {metrics['load_level']} (max {metrics['load_max_level']})")
+        if 'coverage_percent_24h' in metrics:
+            print(f"Coverage (24h): {metrics['coverage_percent_24h']}% "
+                  f"({metrics['coverage_missed_24h']} missed, longest gap {metrics['coverage_longest_gap_24h']}s)")
+        if 'bad_frame_rate' in metrics:
+            print(f"Bad Frames: {metrics['bad_frames']} (recent rate {metrics['bad_frame_rate']}%, "
+                  f"{metrics['quality_check_ms']} ms/check)")
         print(f"Last Success: {metrics['last_success']}")
         print(f"Last Failure: {metrics['last_failure']}")
         print("="*50 + "\n")
@@ -177,7 +301,7 @@ class HealthCheck:
         if self.last_health_check is None:
             return True
         
-        elapsed = (datetime.now() - self.last_health_check).total_seconds()
+        elapsed = (self.clock.now() - self.last_health_check).total_seconds()
         return elapsed >= self.check_interval
     
     def reset_metrics(self):
@@ -188,8 +312,14 @@ class HealthCheck:
         self.consecutive_failures = 0
         self.last_success_time = None
         self.last_failure_time = None
-        self.start_time = datetime.now()
+        self.start_time = self.clock.now()
         self.camera_disconnects = 0
+        self.camera_reconnects = 0
+        self.last_reconnect_seconds = None
+        self.last_warmup_seconds = None
+        self.warmup_frames = 0
+        self.warmup_converged = None
+        self.warmup_timeouts = 0
         self.last_health_check = None
         
         self.logger.info("Health metrics reset")
@@ -0,0 +1,300 @@
+"""
+Load Shedder Module
+Steps capture quality, resolution and rate down under resource pressure
+"""
+
+import os
+
+from utils.clock import SystemClock
+
+
+# Signal name -> default thresholds for levels 1, 2, 3 and recovery margin
+DEFAULT_THRESHOLDS = {
+    'load_per_cpu': [1.5, 2.0, 3.0],
+    'cpu_psi': [40, 60, 80],
+    'io_psi': [30, 50, 70],
+    'memory_psi': [10, 25, 40],
+    'temperature_c': [70, 75, 80],
+    'disk_used_percent': [85, 90, 95],
+}
+
+DEFAULT_MARGINS = {
+    'load_per_cpu': 0.3,
+    'cpu_psi': 10,
+    'io_psi': 10,
+    'memory_psi': 5,
+    'temperature_c': 3,
+    'disk_used_percent': 2,
+}
+
+DEFAULT_LEVELS = [
+    {'quality': 70},
+    {'quality': 60, 'resolution': '1280x720', 'skip_post_processing': True},
+    {'quality': 50, 'resolution': '640x480', 'interval_factor': 2, 'skip_post_processing': True},
+]
+
+
+class LoadShedder:
+    """
+    Samples /proc and /sys pressure signals and picks a degradation level
+    
+    Level N is entered as soon as any signal crosses its Nth threshold.
+    Leaving a level requires every signal to stay below that level's
+    thresholds minus a margin for recover_after seconds, and only one level
+    is given back at a time, so a signal hovering at a threshold can't make
+    the settings flap.
+    """
+    
+    def __init__(self, config, logger, camera, clock=None):
+        """
+        Initialize load shedder
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            camera: CameraInterface whose quality/resolution are lowered
+            clock: Optional time source for sampling and hold times (default: SystemClock)
+        """
+        self.logger = logger
+        self.camera = camera
+        self.clock = clock or SystemClock()
+        
+        self.level = 0
+        self.signals = {}
+        self._last_sample = None
+        self._calm_since = None
+        self.apply_config(config)
+        
+        # Metrics
+        self.level_changes = 0
+        self.max_level_seen = 0
+        self.skipped_post_processing = 0
+    
+    def apply_config(self, config):
+        """
+        Load shedding settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        shedding = config.get('load_shedding', {}) or {}
+        
+        self.check_interval = shedding.get('check_interval', 10)
+        self.recover_after = shedding.get('recover_after', 60)
+        self.proc_root = shedding.get('proc_root', '/proc')
+        self.sys_root = shedding.get('sys_root', '/sys')
+        self.thermal_zone = shedding.get('thermal_zone', 'thermal_zone0')
+        self.disk_path = shedding.get('disk_path') or config['files']['capture_dir']
+        
+        self.thresholds = dict(DEFAULT_THRESHOLDS)
+        self.thresholds.update(shedding.get('thresholds') or {})
+        self.margins = dict(DEFAULT_MARGINS)
+        self.margins.update(shedding.get('margins') or {})
+        self.levels = shedding.get('levels') or DEFAULT_LEVELS
+        
+        # A reload may remove levels; fall back to the deepest one left
+        if self.level > len(self.levels):
+            self.logger.info(f"Load shedding level {self.level} -> {len(self.levels)} (levels reloaded)")
+            self.level = len(self.levels)
+            self._calm_since = None
+    
+    # Signal readers; each returns None when the source is unavailable
+    
+    def _read(self, *parts):
+        try:
+            with open(os.path.join(*parts)) as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _read_load_per_cpu(self):
+        text = self._read(self.proc_root, 'loadavg')
+        if not text:
+            return None
+        return float(text.split()[0]) / (os.cpu_count() or 1)
+    
+    def _read_psi(self, resource):
+        """'some avg10' from /proc/pressure/<resource> (percent of time stalled)"""
+        text = self._read(self.proc_root, 'pressure', resource)
+        if not text:
+            return None
+        for line in text.splitlines():
+            if line.startswith('some'):
+                for field in line.split()[1:]:
+                    key, _, value = field.partition('=')
+                    if key == 'avg10':
+                        return float(value)
+        return None
+    
+    def _read_temperature(self):
+        text = self._read(self.sys_root, 'class', 'thermal', self.thermal_zone, 'temp')
+        if not text:
+            return None
+        return int(text.strip()) / 1000.0
+    
+    def _read_disk_used(self):
+        try:
+            stats = os.statvfs(self.disk_path)
+        except OSError:
+            return None
+        if not stats.f_blocks:
+            return None
+        return 100.0 * (1 - stats.f_bavail / stats.f_blocks)
+    
+    def read_signals(self):
+        """
+        Sample every pressure signal
+        
+        Returns:
+            dict: Signal name -> value (None if unavailable)
+        """
+        return {
+            'load_per_cpu': self._read_load_per_cpu(),
+            'cpu_psi': self._read_psi('cpu'),
+            'io_psi': self._read_psi('io'),
+            'memory_psi': self._read_psi('memory'),
+            'temperature_c': self._read_temperature(),
+            'disk_used_percent': self._read_disk_used(),
+        }
+    
+    def _target_level(self, signals):
+        """Highest level whose threshold any signal has crossed"""
+        target = 0
+        for name, value in signals.items():
+            if value is None:
+                continue
+            for index, threshold in enumerate(self.thresholds.get(name, [])[:len(self.levels)]):
+                if value >= threshold:
+                    target = max(target, index + 1)
+        return target
+    
+    def _below_level(self, signals, level):
+        """Check every signal is clear of the level's thresholds by its margin"""
+        for name, value in signals.items():
+            thresholds = self.thresholds.get(name, [])
+            if value is None or level > len(thresholds):
+                continue
+            if value >= thresholds[level - 1] - self.margins.get(name, 0):
+                return False
+        return True
+    
+    def update(self, now=None):
+        """
+        Re-sample (at most every check_interval) and apply the current level
+        Called by the capture loop before each capture
+        
+        Args:
+            now: Monotonic time (default: clock.monotonic())
+            
+        Returns:
+            int: Current degradation level (0 = full quality)
+        """
+        now = self.clock.monotonic() if now is None else now
+        
+        if self._last_sample is None or now - self._last_sample >= self.check_interval:
+            self._last_sample = now
+            self.signals = self.read_signals()
+            self._evaluate(now)
+        
+        self._apply()
+        return self.level
+    
+    def _evaluate(self, now):
+        """Move between levels: up immediately, down one level after a calm period"""
+        target = self._target_level(self.signals)
+        
+        if target > self.level:
+            self._set_level(target)
+            self._calm_since = None
+            return
+        
+        if self.level == 0:
+            return
+        
+        if not self._below_level(self.signals, self.level):
+            self._calm_since = None
+            return
+        
+        if self._calm_since is None:
+            self._calm_since = now
+        elif now - self._calm_since >= self.recover_after:
+            self._set_level(self.level - 1)
+            self._calm_since = now if self.level else None
+    
+    def _set_level(self, level):
+        """Record a level change"""
+        active = {k: round(v, 2) for k, v in self.signals.items() if v is not None}
+        
+        if level > self.level:
+            self.logger.warning(f"Load shedding level {self.level} -> {level} ({active})")
+        else:
+            self.logger.info(f"Load shedding level {self.level} -> {level} (recovered)")
+        
+        self.level = level
+        self.level_changes += 1
+        self.max_level_seen = max(self.max_level_seen, level)
+    
+    def _settings(self):
+        """Degradation settings of the current level (empty at level 0)"""
+        return self.levels[self.level - 1] if self.level else {}
+    
+    @staticmethod
+    def _pixels(resolution):
+        """Pixel count of a 'WxH' resolution (None if unparsable)"""
+        try:
+            width, height = (int(v) for v in str(resolution).lower().split('x'))
+        except ValueError:
+            return None
+        return width * height
+    
+    def reapply(self):
+        """Put the current level's settings back on the camera (after a camera config reload)"""
+        self._apply()
+    
+    def _apply(self):
+        """
+        Set camera quality/resolution from the level (configured values at level 0)
+        A level only ever lowers them: a camera already configured below a
+        level's quality or resolution keeps its own setting
+        """
+        settings = self._settings()
+        quality = self.config['capture']['quality']
+        resolution = self.config['camera']['resolution']
+        
+        if settings.get('quality') is not None:
+            quality = min(quality, settings['quality'])
+        
+        shed = settings.get('resolution')
+        if shed:
+            shed_pixels, own_pixels = self._pixels(shed), self._pixels(resolution)
+            if shed_pixels and own_pixels and shed_pixels < own_pixels:
+                resolution = shed
+        
+        self.camera.quality = quality
+        self.camera.resolution = resolution
+    
+    @property
+    def interval_factor(self):
+        """Multiplier for the capture interval at the current level"""
+        return self._settings().get('interval_factor', 1)
+    
+    @property
+    def skip_post_processing(self):
+        """Whether renditions are skipped at the current level"""
+        return self._settings().get('skip_post_processing', False)
+    
+    def get_stats(self):
+        """
+        Get load shedding statistics
+        
+        Returns:
+            dict: Level, last signals and counters
+        """
+        return {
+            'load_level': self.level,
+            'load_level_changes': self.level_changes,
+            'load_max_level': self.max_level_seen,
+            'load_signals': {k: round(v, 2) for k, v in self.signals.items() if v is not None},
+            'skipped_post_processing': self.skipped_post_processing
+        }
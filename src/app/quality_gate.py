@@ -0,0 +1,198 @@
+"""
+Quality Gate Module
+Rejects or flags frames that are blank, crushed to black or blown out
+"""
+
+import time
+from collections import deque
+
+from utils.luminance import frame_statistics
+
+
+VERDICTS = ('ok', 'blank', 'underexposed', 'overexposed')
+
+
+class QualityGate:
+    """
+    Classifies each captured frame from a reduced-scale luminance histogram
+    A covered lens, failed IR illumination or stuck auto exposure still
+    produces valid JPEGs; this catches them so they count against health
+    """
+    
+    def __init__(self, config, logger):
+        """
+        Initialize quality gate
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+        """
+        self.logger = logger
+        self.apply_config(config)
+        
+        # Verdicts of recently kept frames, for the bad frame rate
+        self._recent = deque(maxlen=self.window)
+        
+        # Metrics
+        self.checked = 0
+        self.counts = dict.fromkeys(VERDICTS, 0)
+        self.flagged = 0
+        self.retried = 0
+        self.check_seconds = 0.0
+        self.over_budget = 0
+        self.last_stats = None
+    
+    def apply_config(self, config):
+        """
+        Load quality gate settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        quality = config.get('frame_quality', {}) or {}
+        
+        self.action = quality.get('action', 'retry')
+        self.retry_delay = quality.get('retry_delay', 1)
+        width, height = (int(v) for v in str(quality.get('probe_size', '160x120')).lower().split('x'))
+        self.probe_size = (width, height)
+        self.blank_stddev = quality.get('blank_stddev', 4.0)
+        self.dark_level = quality.get('dark_level', 16)
+        self.bright_level = quality.get('bright_level', 240)
+        self.clip_fraction = quality.get('clip_fraction', 0.8)
+        self.window = quality.get('window', 100)
+        self.max_bad_rate = quality.get('max_bad_rate', 0.2)
+        self.budget = quality.get('budget_ms', 25) / 1000.0
+        
+        recent = getattr(self, '_recent', None)
+        if recent is not None and recent.maxlen != self.window:
+            self._recent = deque(recent, maxlen=self.window)
+    
+    def classify(self, stats):
+        """
+        Classify frame statistics
+        
+        Args:
+            stats: Dict from frame_statistics
+            
+        Returns:
+            str: 'ok', 'blank', 'underexposed' or 'overexposed'
+        """
+        # Mostly crushed or clipped pixels (covered lens, dead IR, stuck exposure)
+        if stats['dark_fraction'] >= self.clip_fraction:
+            return 'underexposed'
+        if stats['bright_fraction'] >= self.clip_fraction:
+            return 'overexposed'
+        
+        # A flat frame at any other level carries no picture (e.g. a frozen grey frame)
+        if stats['stddev'] < self.blank_stddev:
+            return 'blank'
+        return 'ok'
+    
+    def check(self, filepath):
+        """
+        Classify a captured frame
+        
+        Args:
+            filepath: Path to the verified JPEG
+            
+        Returns:
+            str: Verdict (an undecodable frame is 'blank')
+        """
+        started = time.perf_counter()
+        
+        try:
+            with open(filepath, 'rb') as f:
+                stats = frame_statistics(f.read(), self.probe_size, self.dark_level, self.bright_level)
+        except OSError:
+            stats = None
+        
+        verdict = self.classify(stats) if stats else 'blank'
+        
+        elapsed = time.perf_counter() - started
+        self.checked += 1
+        self.check_seconds += elapsed
+        if elapsed > self.budget:
+            self.over_budget += 1
+            self.logger.debug(f"Quality check took {elapsed * 1000:.1f} ms (budget {self.budget * 1000:g} ms)")
+        
+        self.last_stats = stats
+        return verdict
+    
+    def should_retry(self, verdict, attempt, max_attempts):
+        """
+        Decide whether a bad frame is worth another capture attempt
+        
+        Args:
+            verdict: Verdict from check()
+            attempt: Current attempt number (1-based)
+            max_attempts: Attempts allowed for this capture
+            
+        Returns:
+            bool: True to discard the frame and capture again
+        """
+        if verdict == 'ok' or self.action != 'retry' or attempt >= max_attempts:
+            return False
+        
+        self.retried += 1
+        return True
+    
+    def record(self, verdict, filename):
+        """
+        Count the verdict of a frame that was kept
+        
+        Args:
+            verdict: Verdict from check()
+            filename: Saved file name (for the log)
+        """
+        self.counts[verdict] += 1
+        self._recent.append(verdict != 'ok')
+        
+        if verdict != 'ok':
+            self.flagged += 1
+            stats = self.last_stats or {}
+            self.logger.warning(
+                f"Bad frame ({verdict}): {filename} "
+                f"(mean {stats.get('mean', 0):.0f}, stddev {stats.get('stddev', 0):.1f}, "
+                f"dark {stats.get('dark_fraction', 0):.0%}, bright {stats.get('bright_fraction', 0):.0%})"
+            )
+    
+    def get_bad_frame_rate(self):
+        """
+        Share of recently kept frames that were bad
+        
+        Returns:
+            float: 0.0 - 1.0 over the last `window` frames
+        """
+        if not self._recent:
+            return 0.0
+        return sum(self._recent) / len(self._recent)
+    
+    def is_degraded(self):
+        """
+        Check whether the recent bad frame rate is above the limit
+        Needs a full window so a single bad frame at startup doesn't count
+        
+        Returns:
+            bool: True if health should report degraded
+        """
+        return len(self._recent) >= self._recent.maxlen and self.get_bad_frame_rate() > self.max_bad_rate
+    
+    def get_stats(self):
+        """
+        Get quality gate statistics
+        
+        Returns:
+            dict: Verdict counters, bad frame rate and check cost
+        """
+        return {
+            'frames_checked': self.checked,
+            'bad_frames': self.flagged,
+            'bad_frame_rate': round(self.get_bad_frame_rate() * 100, 1),
+            'bad_frame_retries': self.retried,
+            'bad_blank': self.counts['blank'],
+            'bad_underexposed': self.counts['underexposed'],
+            'bad_overexposed': self.counts['overexposed'],
+            'quality_check_ms': round(self.check_seconds / self.checked * 1000, 2) if self.checked else 0.0,
+            'quality_over_budget': self.over_budget
+        }
@@ -0,0 +1,228 @@
+"""
+Renditions Module
+Derives extra output sizes/formats from a single captured frame
+"""
+
+import io
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+
+# Pillow save format per file extension
+FORMATS = {'jpg': 'JPEG', 'jpeg': 'JPEG', 'webp': 'WEBP', 'png': 'PNG'}
+
+
+class Rendition(namedtuple('Rendition', 'name size quality format')):
+    """
+    One derived output
+    size is a (width, height) bounding box or None for the captured size
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_config(cls, entry, index=0):
+        """
+        Build a rendition from its config mapping
+        
+        Args:
+            entry: Dict with optional name, size ('WxH'), quality and format
+            index: Position in the outputs list (used for the default name)
+            
+        Returns:
+            Rendition: Parsed rendition
+        """
+        name = str(entry.get('name', f"r{index + 1}"))
+        
+        size = entry.get('size')
+        if size is not None:
+            width, height = (int(v) for v in str(size).lower().split('x'))
+            if width <= 0 or height <= 0:
+                raise ValueError(f"size must be positive, got {size!r}")
+            size = (width, height)
+        
+        quality = entry.get('quality', 85)
+        if not isinstance(quality, int) or not 1 <= quality <= 100:
+            raise ValueError(f"quality must be 1-100, got {quality!r}")
+        
+        fmt = str(entry.get('format', 'jpg')).lower()
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {sorted(FORMATS)}, got {fmt!r}")
+        
+        return cls(name, size, quality, fmt)
+
+
+class RenditionEncoder:
+    """
+    Writes every configured rendition next to the original capture
+    The frame is read once; each rendition decodes it at reduced scale
+    (JPEG DCT scaling via draft) and encodes on a worker thread, since
+    Pillow releases the GIL while decoding and encoding
+    """
+    
+    def __init__(self, config, logger):
+        """
+        Initialize rendition encoder
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+        """
+        self.logger = logger
+        self._executor = None
+        self.workers = 0
+        self.apply_config(config)
+        
+        # Metrics
+        self.frames_rendered = 0
+        self.render_errors = 0
+        self.last_render_ms = 0.0
+        self.total_render_seconds = 0.0
+    
+    def apply_config(self, config):
+        """
+        Load output definitions (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        capture = config['capture']
+        
+        self.outputs = [
+            Rendition.from_config(entry, index)
+            for index, entry in enumerate(capture.get('outputs') or [])
+        ]
+        
+        workers = capture.get('output_workers') or os.cpu_count() or 1
+        workers = max(1, min(workers, len(self.outputs) or 1))
+        
+        if self._executor is None or self.workers != workers:
+            if self._executor:
+                self._executor.shutdown(wait=True)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rendition")
+        
+        self.workers = workers
+    
+    def stop(self):
+        """Release worker threads"""
+        if self._executor:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+    
+    def output_path(self, source_path, rendition):
+        """
+        Path of a rendition derived from a capture
+        
+        Args:
+            source_path: Original capture path
+            rendition: Rendition
+            
+        Returns:
+            str: img_YYYYmmdd_HHMMSS_<name>.<format> beside the original
+        """
+        stem = os.path.splitext(source_path)[0]
+        return f"{stem}_{rendition.name}.{rendition.format}"
+    
+    def render(self, source_path):
+        """
+        Write all renditions of one capture
+        
+        Args:
+            source_path: Path to the captured JPEG
+            
+        Returns:
+            list: Paths of renditions written (failed ones are logged and left out)
+        """
+        if not self.outputs:
+            return []
+        
+        started = time.monotonic()
+        
+        with open(source_path, 'rb') as f:
+            data = f.read()
+        
+        jobs = [
+            (rendition, self._executor.submit(
+                self._render_one, data, rendition, self.output_path(source_path, rendition)
+            ))
+            for rendition in self.outputs
+        ]
+        
+        written = []
+        for rendition, job in jobs:
+            try:
+                written.append(job.result())
+            except Exception as e:
+                self.render_errors += 1
+                self.logger.error(f"Rendition '{rendition.name}' failed: {e}")
+        
+        elapsed = time.monotonic() - started
+        self.frames_rendered += 1
+        self.last_render_ms = round(elapsed * 1000, 1)
+        self.total_render_seconds += elapsed
+        self.logger.debug(f"Rendered {len(written)}/{len(self.outputs)} outputs in {self.last_render_ms}ms")
+        
+        return written
+    
+    @staticmethod
+    def _render_one(data, rendition, path):
+        """
+        Decode, scale and encode one rendition (runs on a worker thread)
+        
+        Args:
+            data: Original JPEG bytes
+            rendition: Rendition
+            path: Output path
+            
+        Returns:
+            str: Output path
+        """
+        image = Image.open(io.BytesIO(data))
+        
+        if rendition.size:
+            # Let the JPEG decoder scale by 1/2, 1/4 or 1/8 while decoding,
+            # so only the remaining fraction needs resampling
+            image.draft('RGB', rendition.size)
+            image.thumbnail(rendition.size, Image.BILINEAR)
+        
+        if rendition.format != 'png' and image.mode not in ('RGB', 'L'):
+            image = image.convert('RGB')
+        
+        options = {}
+        if FORMATS[rendition.format] in ('JPEG', 'WEBP'):
+            options['quality'] = rendition.quality
+        
+        # Write beside the target and rename, so readers never see a partial file
+        temp_path = path + '.tmp'
+        try:
+            image.save(temp_path, FORMATS[rendition.format], **options)
+            os.replace(temp_path, path)
+        except Exception:
+            # No cleanup pattern matches .tmp, so don't leave it behind (e.g. disk full)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return path
+    
+    def get_stats(self):
+        """
+        Get rendition statistics
+        
+        Returns:
+            dict: Output count, render counters and timing
+        """
+        average = self.total_render_seconds / self.frames_rendered if self.frames_rendered else 0
+        return {
+            'outputs': [r.name for r in self.outputs],
+            'frames_rendered': self.frames_rendered,
+            'render_errors': self.render_errors,
+            'last_render_ms': self.last_render_ms,
+            'avg_render_ms': round(average * 1000, 1)
+        }
@@ -0,0 +1,283 @@
+"""
+Retry Policy Module
+Adaptive capture timeouts, jittered exponential backoff and a circuit breaker
+"""
+
+import random
+import threading
+from collections import deque
+
+from utils.clock import SystemClock
+
+
+class LatencyTracker:
+    """
+    Sliding window of recent capture latencies
+    """
+    
+    def __init__(self, window=200):
+        """
+        Initialize latency tracker
+        
+        Args:
+            window: Number of recent samples to keep
+        """
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, seconds):
+        """Add a latency sample"""
+        with self._lock:
+            self._samples.append(seconds)
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._samples)
+    
+    def percentile(self, p):
+        """
+        Get a latency percentile
+        
+        Args:
+            p: Percentile as a fraction (0.99 for p99)
+            
+        Returns:
+            float: Latency in seconds or None if no samples
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        
+        if not samples:
+            return None
+        
+        return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+class CircuitBreaker:
+    """
+    Stops capture attempts against a failing camera for a cool-down period
+    closed -> open after N consecutive failures, open -> half_open after the
+    cool-down, half_open -> closed after successful trials (or open again)
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold=5, cooldown=30, max_cooldown=300, half_open_trials=1, clock=None):
+        """
+        Initialize circuit breaker
+        
+        Args:
+            failure_threshold: Consecutive failed attempts that open the breaker
+            cooldown: Initial seconds to stay open
+            max_cooldown: Upper bound for the cool-down, which doubles on each
+                          failed half-open trial
+            half_open_trials: Successful trials needed to close again
+            clock: Optional time source (default: SystemClock)
+        """
+        self.clock = clock or SystemClock()
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.half_open_trials = half_open_trials
+        
+        self.state = self.CLOSED
+        self.cooldown = cooldown
+        self.failures = 0
+        self.trial_successes = 0
+        self.opened_at = None
+        self.times_opened = 0
+        self.rejected = 0
+        self._lock = threading.Lock()
+    
+    def allow_request(self):
+        """
+        Check whether an attempt may be made now
+        
+        Returns:
+            bool: False while the breaker is open
+        """
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock.monotonic() - self.opened_at < self.cooldown:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self.trial_successes = 0
+            
+            return True
+    
+    def record_success(self):
+        """Record a successful attempt"""
+        with self._lock:
+            self.failures = 0
+            
+            if self.state == self.HALF_OPEN:
+                self.trial_successes += 1
+                if self.trial_successes >= self.half_open_trials:
+                    self.state = self.CLOSED
+                    self.cooldown = self.base_cooldown
+    
+    def record_failure(self):
+        """Record a failed attempt"""
+        with self._lock:
+            self.failures += 1
+            
+            if self.state == self.HALF_OPEN:
+                # Trial failed, back off harder before the next probe
+                self.cooldown = min(self.max_cooldown, self.cooldown * 2)
+                self._open()
+            elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+                self._open()
+    
+    def _open(self):
+        """Transition to open (caller holds the lock)"""
+        self.state = self.OPEN
+        self.opened_at = self.clock.monotonic()
+        self.times_opened += 1
+    
+    def get_state(self):
+        """
+        Get breaker state, accounting for an elapsed cool-down
+        
+        Returns:
+            str: 'closed', 'open' or 'half_open'
+        """
+        with self._lock:
+            if self.state == self.OPEN and self.clock.monotonic() - self.opened_at >= self.cooldown:
+                return self.HALF_OPEN
+            return self.state
+    
+    def get_stats(self):
+        """
+        Get breaker metrics
+        
+        Returns:
+            dict: State, open count, rejected attempts and current cool-down
+        """
+        state = self.get_state()
+        
+        with self._lock:
+            remaining = 0
+            if state == self.OPEN:
+                remaining = max(0, self.cooldown - (self.clock.monotonic() - self.opened_at))
+            
+            return {
+                'breaker_state': state,
+                'breaker_opens': self.times_opened,
+                'breaker_rejected': self.rejected,
+                'breaker_cooldown': self.cooldown,
+                'breaker_retry_in': round(remaining, 1)
+            }
+
+
+class RetryPolicy:
+    """
+    Adaptive retry engine used by CaptureSystem
+    Timeouts follow the observed latency distribution instead of a fixed value
+    """
+    
+    def __init__(self, config, logger, clock=None):
+        """
+        Initialize retry policy
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            clock: Optional time source for the breaker cool-down (default: SystemClock)
+        """
+        self.config = config
+        self.logger = logger
+        
+        retry = config.get('retry', {})
+        self.default_timeout = config['camera']['capture_timeout']
+        self.timeout_percentile = retry.get('timeout_percentile', 0.99)
+        self.timeout_factor = retry.get('timeout_factor', 3.0)
+        self.min_timeout = retry.get('min_timeout', 2)
+        self.max_timeout = retry.get('max_timeout', self.default_timeout)
+        self.min_samples = retry.get('min_samples', 20)
+        self.backoff_base = config['capture']['retry_delay']
+        self.backoff_max = retry.get('backoff_max', 30)
+        
+        self.latency = LatencyTracker(retry.get('window', 200))
+        self.breaker = CircuitBreaker(
+            failure_threshold=retry.get('breaker_threshold', 5),
+            cooldown=retry.get('breaker_cooldown', 30),
+            max_cooldown=retry.get('breaker_max_cooldown', 300),
+            half_open_trials=retry.get('half_open_trials', 1),
+            clock=clock
+        )
+    
+    def get_timeout(self):
+        """
+        Timeout for the next attempt
+        
+        Returns:
+            float: p<percentile> latency x factor, clamped to [min_timeout, max_timeout];
+                   the configured capture_timeout until enough samples exist
+        """
+        if len(self.latency) < self.min_samples:
+            return self.default_timeout
+        
+        observed = self.latency.percentile(self.timeout_percentile) * self.timeout_factor
+        return round(min(self.max_timeout, max(self.min_timeout, observed)), 2)
+    
+    def get_backoff(self, attempt):
+        """
+        Delay before the next retry (exponential with full jitter)
+        
+        Args:
+            attempt: Attempt number that just failed (1-based)
+            
+        Returns:
+            float: Seconds to wait
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+    
+    def allow_attempt(self):
+        """
+        Ask the circuit breaker whether to try the camera
+        
+        Returns:
+            bool: True if an attempt may be made
+        """
+        return self.breaker.allow_request()
+    
+    def record_success(self, latency):
+        """
+        Record a successful attempt
+        
+        Args:
+            latency: Seconds the attempt took
+        """
+        self.latency.record(latency)
+        self.breaker.record_success()
+    
+    def record_failure(self):
+        """Record a failed attempt"""
+        previous = self.breaker.get_state()
+        self.breaker.record_failure()
+        
+        if self.breaker.get_state() == CircuitBreaker.OPEN and previous != CircuitBreaker.OPEN:
+            self.logger.warning(
+                f"Circuit breaker opened, pausing capture attempts for {self.breaker.cooldown}s"
+            )
+    
+    def get_stats(self):
+        """
+        Get retry policy metrics
+        
+        Returns:
+            dict: Breaker state plus latency percentiles and current timeout
+        """
+        stats = self.breaker.get_stats()
+        p50 = self.latency.percentile(0.50)
+        p99 = self.latency.percentile(0.99)
+        stats.update({
+            'latency_p50': round(p50, 3) if p50 is not None else None,
+            'latency_p99': round(p99, 3) if p99 is not None else None,
+            'capture_timeout': self.get_timeout()
+        })
+        return stats
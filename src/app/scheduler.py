@@ -0,0 +1,317 @@
+"""
+Scheduler Module
+Calendar-aware capture schedule built from time-of-day, weekday and date rules
+"""
+
+import heapq
+import math
+from datetime import date, datetime, timedelta
+
+from utils.clock import SystemClock
+
+
+WEEKDAYS = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
+
+
+class ScheduleRule:
+    """
+    One recurring capture rule
+    Slots are every `interval` seconds from the start of each active window
+    """
+    
+    # How far ahead to look for the next active window before giving up
+    SEARCH_DAYS = 400
+    
+    def __init__(self, name, interval, days=None, start=None, end=None,
+                 date_from=None, date_to=None):
+        """
+        Initialize schedule rule
+        
+        Args:
+            name: Rule name (for logs and dry-run output)
+            interval: Seconds between captures inside the window
+            days: Weekday names ('mon'..'sun') the window opens on (default: every day)
+            start: Window start 'HH:MM' (default: midnight)
+            end: Window end 'HH:MM' (default: midnight); end <= start spans midnight
+            date_from: First date 'YYYY-MM-DD' the rule applies (inclusive)
+            date_to: Last date 'YYYY-MM-DD' the rule applies (inclusive)
+        """
+        if not isinstance(interval, (int, float)) or isinstance(interval, bool) or interval <= 0:
+            raise ValueError(f"interval must be a positive number, got {interval!r}")
+        
+        self.name = name
+        self.interval = interval
+        self.days = frozenset(WEEKDAYS.index(d.lower()[:3]) for d in days) if days else None
+        self.start = self._parse_time(start or '00:00')
+        self.end = self._parse_time(end or '00:00')
+        self.date_from = date.fromisoformat(str(date_from)) if date_from else None
+        self.date_to = date.fromisoformat(str(date_to)) if date_to else None
+        
+        # Window length; an end at or before the start runs into the next day
+        length = self.end - self.start
+        self.length = length if length > timedelta(0) else length + timedelta(days=1)
+    
+    @classmethod
+    def from_config(cls, rule, index=0):
+        """
+        Build a rule from its config mapping
+        
+        Args:
+            rule: Dict with interval and optional name/days/start/end/date_from/date_to
+            index: Position in the rule list (used for the default name)
+            
+        Returns:
+            ScheduleRule: Parsed rule
+        """
+        return cls(
+            rule.get('name', f"rule{index + 1}"),
+            rule['interval'],
+            days=rule.get('days'),
+            start=rule.get('start'),
+            end=rule.get('end'),
+            date_from=rule.get('date_from'),
+            date_to=rule.get('date_to')
+        )
+    
+    @staticmethod
+    def _parse_time(value):
+        """Parse 'HH:MM' or 'HH:MM:SS' into an offset from midnight"""
+        parts = [int(p) for p in str(value).split(':')]
+        while len(parts) < 3:
+            parts.append(0)
+        return timedelta(hours=parts[0], minutes=parts[1], seconds=parts[2])
+    
+    def _active_on(self, day):
+        """Check whether a window opens on the given date"""
+        if self.days is not None and day.weekday() not in self.days:
+            return False
+        if self.date_from and day < self.date_from:
+            return False
+        if self.date_to and day > self.date_to:
+            return False
+        return True
+    
+    def next_after(self, after):
+        """
+        Find the first slot strictly after a time
+        
+        Args:
+            after: Unix timestamp
+            
+        Returns:
+            float: Unix timestamp of the next slot, or None if the rule never fires again
+        """
+        # Start a day early so a window spanning midnight is not missed
+        day = datetime.fromtimestamp(after).date() - timedelta(days=1)
+        
+        for _ in range(self.SEARCH_DAYS):
+            if self.date_to and day > self.date_to:
+                return None
+            
+            if self._active_on(day):
+                opens = datetime.combine(day, datetime.min.time()) + self.start
+                window_start = opens.timestamp()
+                window_end = (opens + self.length).timestamp()
+                
+                if window_end > after:
+                    if after < window_start:
+                        slot = window_start
+                    else:
+                        slot = window_start + (math.floor((after - window_start) / self.interval) + 1) * self.interval
+                    
+                    if slot < window_end:
+                        return slot
+            
+            day += timedelta(days=1)
+        
+        return None
+    
+    def describe(self):
+        """
+        Human-readable summary
+        
+        Returns:
+            str: Rule description
+        """
+        days = ','.join(WEEKDAYS[d] for d in sorted(self.days)) if self.days is not None else 'daily'
+        clock = lambda offset: f"{offset.seconds // 3600:02d}:{offset.seconds % 3600 // 60:02d}"
+        window = f"{clock(self.start)}-{clock(self.start + self.length)}"
+        dates = ''
+        if self.date_from or self.date_to:
+            dates = f" {self.date_from or '...'}..{self.date_to or '...'}"
+        return f"{self.name}: every {self.interval}s {days} {window}{dates}"
+
+
+class Scheduler:
+    """
+    Merges all rules into one timeline ordered by a heap
+    Each rule keeps exactly one pending slot in the heap, so finding and
+    advancing to the next capture is O(log n) in the number of rules
+    """
+    
+    def __init__(self, config, logger, clock=None):
+        """
+        Initialize scheduler
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            clock: Optional time source for "now" (default: SystemClock)
+        """
+        self.logger = logger
+        self.clock = clock or SystemClock()
+        self.apply_config(config)
+    
+    def apply_config(self, config):
+        """
+        Build rules from config and restart the timeline from now
+        Called at init and on live config reload
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        schedule = config.get('schedule', {}) or {}
+        
+        self.rules = [
+            ScheduleRule.from_config(rule, index)
+            for index, rule in enumerate(schedule.get('rules') or [])
+        ]
+        
+        # No rules: behave like the plain fixed interval
+        if not self.rules:
+            self.rules.append(ScheduleRule('interval', config['capture']['interval']))
+        
+        self.missed_slots = 0
+        self.reset()
+    
+    def _build_heap(self, now):
+        """Heap of (slot, rule index) holding the first slot at or after now"""
+        heap = []
+        for index, rule in enumerate(self.rules):
+            slot = rule.next_after(now - 1e-6)
+            if slot is not None:
+                heap.append((slot, index))
+        heapq.heapify(heap)
+        return heap
+    
+    def _push_next(self, heap, index, after):
+        """Queue a rule's first slot after the given time"""
+        following = self.rules[index].next_after(after)
+        if following is not None:
+            heapq.heappush(heap, (following, index))
+    
+    def _pop(self, heap):
+        """
+        Remove the earliest slot, refilling from the rule it came from
+        
+        Returns:
+            tuple: (slot: float, rule index: int)
+        """
+        slot, index = heapq.heappop(heap)
+        self._push_next(heap, index, slot)
+        
+        # Rules firing at the same moment are merged into one slot
+        while heap and heap[0][0] == slot:
+            _, other = heapq.heappop(heap)
+            self._push_next(heap, other, slot)
+        
+        return slot, index
+    
+    def reset(self, now=None):
+        """
+        Restart the timeline
+        
+        Args:
+            now: Unix timestamp to start from (default: current time)
+        """
+        self._heap = self._build_heap(self.clock.time() if now is None else now)
+    
+    def peek(self):
+        """
+        Get the next scheduled capture time without consuming it
+        
+        Returns:
+            float: Unix timestamp, or None if no rule fires again
+        """
+        return self._heap[0][0] if self._heap else None
+    
+    def advance(self, now=None):
+        """
+        Consume every slot that is due
+        Slots missed while a capture overran are skipped, not replayed
+        
+        Args:
+            now: Unix timestamp (default: current time)
+            
+        Returns:
+            str: Name of the rule that fired, or None if nothing was due
+        """
+        now = self.clock.time() if now is None else now
+        fired = None
+        
+        while self._heap and self._heap[0][0] <= now:
+            if fired is not None:
+                self.missed_slots += 1
+            _, index = self._pop(self._heap)
+            fired = self.rules[index].name
+        
+        return fired
+    
+    def upcoming(self, count, start=None):
+        """
+        List the next capture times without touching the live timeline (dry run)
+        
+        Args:
+            count: Number of slots to list
+            start: Unix timestamp to start from (default: current time)
+            
+        Returns:
+            list: (timestamp: float, rule name: str) tuples
+        """
+        heap = self._build_heap(self.clock.time() if start is None else start)
+        slots = []
+        
+        while heap and len(slots) < count:
+            slot, index = self._pop(heap)
+            slots.append((slot, self.rules[index].name))
+        
+        return slots
+    
+    def slots_between(self, start, end):
+        """
+        Count the slots strictly between two times without touching the live timeline
+        
+        Args:
+            start: Unix timestamp (exclusive)
+            end: Unix timestamp (exclusive)
+            
+        Returns:
+            tuple: (count: int, first: float or None, last: float or None)
+        """
+        heap = self._build_heap(start + 1e-6)
+        count = 0
+        first = last = None
+        
+        while heap and heap[0][0] < end:
+            slot, _ = self._pop(heap)
+            count += 1
+            if first is None:
+                first = slot
+            last = slot
+        
+        return (count, first, last)
+    
+    def get_stats(self):
+        """
+        Get scheduler statistics
+        
+        Returns:
+            dict: Rule count, next slot and skipped slots
+        """
+        next_slot = self.peek()
+        return {
+            'schedule_rules': len(self.rules),
+            'next_capture': datetime.fromtimestamp(next_slot).isoformat() if next_slot else None,
+            'missed_slots': self.missed_slots
+        }
@@ -0,0 +1,275 @@
+"""
+Shared Metrics Module
+Fixed-layout shared-memory block where supervised workers publish health metrics
+"""
+
+import math
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+
+WORKER_STATES = ('stopped', 'starting', 'running', 'backoff', 'stalled')
+
+
+class SharedMetrics:
+    """
+    One slot per worker, each split into two single-writer regions:
+        worker region      written only by the worker (health counters, heartbeat)
+        supervisor region  written only by the supervisor (pid, state, restarts)
+        
+    Every region starts with a sequence counter that is odd while a write is
+    in progress, so readers take consistent snapshots without locks or IPC.
+    """
+    
+    MAGIC = b'PCSM'
+    VERSION = 1
+    
+    HEADER = struct.Struct('<4sHHI')
+    HEADER_SIZE = 64
+    SLOT_SIZE = 256
+    SUPERVISOR_OFFSET = 128
+    
+    # seq, pid, heartbeat, started, total, successful, failed,
+    # consecutive_failures, disconnects, reconnects,
+    # last_success, last_failure, first_capture_seconds, breaker_open
+    WORKER = struct.Struct('<QIddQQQIIIdddB')
+    
+    # seq, pid, state, restarts, last_exit, name
+    SUPERVISOR = struct.Struct('<QIBIi32s')
+    
+    SEQ = struct.Struct('<Q')
+    
+    def __init__(self, name, slots=0, create=False):
+        """
+        Create or attach to a metrics block
+        
+        Args:
+            name: Shared memory name
+            slots: Number of worker slots (create only)
+            create: Create the block (supervisor) instead of attaching (worker, reader)
+            
+        Raises:
+            FileNotFoundError: Attaching to a block that does not exist
+            ValueError: Attaching to memory that is not a metrics block
+        """
+        self.name = name
+        self.owner = create
+        
+        if create:
+            size = self.HEADER_SIZE + slots * self.SLOT_SIZE
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                # Left behind by a supervisor that was killed, reuse the name
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+                self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            
+            self._shm.buf[:size] = bytes(size)
+            self.HEADER.pack_into(self._shm.buf, 0, self.MAGIC, self.VERSION, self.SLOT_SIZE, slots)
+            self.slots = slots
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            
+            # Only the creator may unlink; stop this process's tracker doing it at exit
+            resource_tracker.unregister(self._shm._name, 'shared_memory')
+            
+            magic, version, slot_size, slots = self.HEADER.unpack_from(self._shm.buf, 0)
+            if magic != self.MAGIC or version != self.VERSION or slot_size != self.SLOT_SIZE:
+                self._shm.close()
+                raise ValueError(f"Shared memory {name} is not a metrics block")
+            self.slots = slots
+    
+    def _offset(self, slot):
+        if not 0 <= slot < self.slots:
+            raise IndexError(f"Metrics slot {slot} out of range (0-{self.slots - 1})")
+        return self.HEADER_SIZE + slot * self.SLOT_SIZE
+    
+    def _write(self, offset, layout, values):
+        """Seqlock write: bump to odd, write fields, bump to even"""
+        buf = self._shm.buf
+        seq = self.SEQ.unpack_from(buf, offset)[0]
+        self.SEQ.pack_into(buf, offset, seq + 1)
+        layout.pack_into(buf, offset, seq + 1, *values)
+        self.SEQ.pack_into(buf, offset, seq + 2)
+    
+    def _read(self, offset, layout, attempts=100):
+        """Seqlock read: retry while a write is in progress or raced"""
+        buf = self._shm.buf
+        for _ in range(attempts):
+            before = self.SEQ.unpack_from(buf, offset)[0]
+            if before % 2:
+                continue
+            values = layout.unpack_from(buf, offset)
+            if self.SEQ.unpack_from(buf, offset)[0] == before:
+                return values
+        return layout.unpack_from(buf, offset)
+    
+    def publish_worker(self, slot, pid, started, health):
+        """
+        Write a worker's health metrics and heartbeat (worker side)
+        
+        Args:
+            slot: Worker slot
+            pid: Worker process id
+            started: Worker start time (Unix)
+            health: HealthCheck instance
+        """
+        breaker = health.circuit_breaker
+        self._write(self._offset(slot), self.WORKER, (
+            pid,
+            time.time(),
+            started,
+            health.total_captures,
+            health.successful_captures,
+            health.failed_captures,
+            health.consecutive_failures,
+            health.camera_disconnects,
+            health.camera_reconnects,
+            health.last_success_time.timestamp() if health.last_success_time else math.nan,
+            health.last_failure_time.timestamp() if health.last_failure_time else math.nan,
+            health.first_capture_seconds if health.first_capture_seconds is not None else math.nan,
+            1 if breaker and breaker.get_state() == 'open' else 0
+        ))
+    
+    def clear_worker(self, slot):
+        """Reset a worker region before (re)starting it (supervisor side, worker not running)"""
+        offset = self._offset(slot)
+        self._write(offset, self.WORKER, (0, math.nan, math.nan, 0, 0, 0, 0, 0, 0,
+                                           math.nan, math.nan, math.nan, 0))
+    
+    def publish_supervisor(self, slot, pid, state, restarts, last_exit, name):
+        """
+        Write a worker's process state (supervisor side)
+        
+        Args:
+            slot: Worker slot
+            pid: Process id (0 if not running)
+            state: One of WORKER_STATES
+            restarts: Restart count
+            last_exit: Last exit code (0 if none)
+            name: Worker name
+        """
+        self._write(self._offset(slot) + self.SUPERVISOR_OFFSET, self.SUPERVISOR, (
+            pid, WORKER_STATES.index(state), restarts, last_exit, name.encode('utf-8')[:32]
+        ))
+    
+    def heartbeat(self, slot):
+        """
+        Last heartbeat of a worker
+        
+        Returns:
+            float: Unix time, or nan if the worker has not published yet
+        """
+        return self._read(self._offset(slot), self.WORKER)[2]
+    
+    def read(self, slot):
+        """
+        Snapshot one slot
+        
+        Args:
+            slot: Worker slot
+            
+        Returns:
+            dict: Worker metrics merged with supervisor state
+        """
+        offset = self._offset(slot)
+        (_, pid, heartbeat, started, total, successful, failed, consecutive,
+         disconnects, reconnects, last_success, last_failure, first_capture,
+         breaker_open) = self._read(offset, self.WORKER)
+        _, sup_pid, state, restarts, last_exit, name = self._read(
+            offset + self.SUPERVISOR_OFFSET, self.SUPERVISOR
+        )
+        
+        optional = lambda value: None if math.isnan(value) else value
+        
+        return {
+            'slot': slot,
+            'name': name.rstrip(b'\0').decode('utf-8', 'replace'),
+            'pid': sup_pid or pid,
+            'state': WORKER_STATES[state],
+            'restarts': restarts,
+            'last_exit': last_exit,
+            'heartbeat_age': None if math.isnan(heartbeat) else round(time.time() - heartbeat, 1),
+            'uptime_seconds': None if math.isnan(started) else int(time.time() - started),
+            'total_captures': total,
+            'successful_captures': successful,
+            'failed_captures': failed,
+            'success_rate': round(successful / total * 100, 2) if total else 0.0,
+            'consecutive_failures': consecutive,
+            'camera_disconnects': disconnects,
+            'camera_reconnects': reconnects,
+            'last_success': optional(last_success),
+            'last_failure': optional(last_failure),
+            'first_capture_seconds': optional(first_capture),
+            'breaker_open': bool(breaker_open)
+        }
+    
+    def read_all(self):
+        """
+        Snapshot every slot plus fleet totals
+        
+        Returns:
+            dict: {'workers': [...], 'totals': {...}}
+        """
+        workers = [self.read(slot) for slot in range(self.slots)]
+        total = sum(w['total_captures'] for w in workers)
+        successful = sum(w['successful_captures'] for w in workers)
+        
+        return {
+            'workers': workers,
+            'totals': {
+                'workers': len(workers),
+                'running': sum(1 for w in workers if w['state'] == 'running'),
+                'restarts': sum(w['restarts'] for w in workers),
+                'total_captures': total,
+                'successful_captures': successful,
+                'failed_captures': sum(w['failed_captures'] for w in workers),
+                'success_rate': round(successful / total * 100, 2) if total else 0.0
+            }
+        }
+    
+    def close(self):
+        """Detach (and remove the block if this process created it)"""
+        if self._shm is None:
+            return
+        
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+        self._shm = None
+
+
+class MetricsPublisher:
+    """
+    Worker-side handle: the capture loop calls publish() as it makes progress,
+    so a hung loop stops the heartbeat and the supervisor notices
+    """
+    
+    def __init__(self, shm_name, slot, health, interval=5):
+        """
+        Initialize publisher
+        
+        Args:
+            shm_name: Shared memory name created by the supervisor
+            slot: This worker's slot
+            health: HealthCheck instance
+            interval: Longest gap between heartbeats while idle (seconds)
+        """
+        self.metrics = SharedMetrics(shm_name)
+        self.slot = slot
+        self.health = health
+        self.interval = interval
+        self.pid = os.getpid()
+        self.started = time.time()
+    
+    def publish(self):
+        """Publish current health metrics with a fresh heartbeat"""
+        self.metrics.publish_worker(self.slot, self.pid, self.started, self.health)
+    
+    def close(self):
+        """Detach from the block"""
+        self.metrics.close()
@@ -0,0 +1,231 @@
+"""
+Snapshot Server Module
+Serves the latest frames from the in-memory frame cache over HTTP or a Unix socket
+"""
+
+import json
+import os
+import socketserver
+import threading
+import time
+from collections import deque
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _SnapshotHandler(BaseHTTPRequestHandler):
+    """Answers snapshot requests straight from memory"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        """Access logging is too costly for high-rate polling, skip it"""
+        pass
+    
+    def address_string(self):
+        """Unix socket peers have no address"""
+        return self.client_address[0] if self.client_address else 'unix'
+    
+    def do_GET(self):
+        """Dispatch GET requests"""
+        started = time.perf_counter()
+        owner = self.server.owner
+        path = self.path.split('?', 1)[0].rstrip('/')
+        
+        if path in ('/snapshot', '/snapshot.jpg'):
+            status = self._serve_frame(owner, 0)
+        elif path.startswith('/snapshot/') and path[10:].isdigit():
+            status = self._serve_frame(owner, int(path[10:]))
+        elif path == '/stats':
+            status = self._serve_stats(owner)
+        else:
+            self.send_error(404)
+            status = 404
+        
+        owner.record_request(status, time.perf_counter() - started)
+    
+    def _serve_frame(self, owner, index):
+        """
+        Send a cached frame, or 304 if the client already has it
+        
+        Returns:
+            int: HTTP status sent
+        """
+        frame = owner.frame_cache.get(index)
+        
+        if frame is None:
+            self.send_error(404, "No frame cached")
+            return 404
+        
+        if self.headers.get('If-None-Match') == frame.etag:
+            self.send_response(304)
+            self.send_header('ETag', frame.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return 304
+        
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(frame.data)))
+        self.send_header('ETag', frame.etag)
+        self.send_header('Last-Modified', formatdate(frame.timestamp, usegmt=True))
+        self.send_header('Cache-Control', 'no-cache')
+        if frame.name:
+            self.send_header('X-Frame-Name', os.path.basename(frame.name))
+        self.end_headers()
+        self.wfile.write(frame.data)
+        return 200
+    
+    def _serve_stats(self, owner):
+        """Send server and cache statistics as JSON"""
+        body = json.dumps(owner.get_stats()).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        return 200
+
+
+class _TCPHTTPServer(ThreadingHTTPServer):
+    """HTTP over TCP with a listen backlog sized for many pollers"""
+    
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+    """HTTP over a Unix domain socket"""
+    
+    daemon_threads = True
+    request_queue_size = 128
+
+
+class SnapshotServer:
+    """
+    Local snapshot endpoint backed by FrameCache
+    Supports ETag/If-None-Match so unchanged polls cost a header round-trip
+    """
+    
+    LATENCY_SAMPLES = 10000
+    
+    def __init__(self, config, logger, frame_cache):
+        """
+        Initialize snapshot server
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            frame_cache: FrameCache instance
+        """
+        self.config = config
+        self.logger = logger
+        self.frame_cache = frame_cache
+        
+        snapshot = config.get('snapshot', {})
+        self.host = snapshot.get('host', '127.0.0.1')
+        self.port = snapshot.get('port', 8081)
+        self.unix_socket = snapshot.get('unix_socket') or None
+        
+        self.running = False
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.requests = 0
+        self.not_modified = 0
+        self._latencies = deque(maxlen=self.LATENCY_SAMPLES)
+        self._request_times = deque(maxlen=self.LATENCY_SAMPLES)
+    
+    def start(self):
+        """Start serving in a background thread"""
+        if self.unix_socket:
+            if os.path.exists(self.unix_socket):
+                os.remove(self.unix_socket)
+            self._server = _UnixHTTPServer(self.unix_socket, _SnapshotHandler)
+            where = f"unix:{self.unix_socket}"
+        else:
+            self._server = _TCPHTTPServer((self.host, self.port), _SnapshotHandler)
+            where = f"http://{self.host}:{self.server_port()}/snapshot"
+        
+        self._server.owner = self
+        self.running = True
+        
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="snapshot-server",
+            daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"Snapshot endpoint available at {where}")
+    
+    def stop(self):
+        """Stop serving"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._server.shutdown()
+        self._server.server_close()
+        
+        if self.unix_socket and os.path.exists(self.unix_socket):
+            os.remove(self.unix_socket)
+    
+    def server_port(self):
+        """
+        Get the bound TCP port (useful when configured with port 0)
+        
+        Returns:
+            int: Port number or None for Unix sockets
+        """
+        if self._server is None or self.unix_socket:
+            return None
+        return self._server.server_address[1]
+    
+    def record_request(self, status, latency):
+        """
+        Account a served request
+        
+        Args:
+            status: HTTP status sent
+            latency: Handler time in seconds
+        """
+        with self._lock:
+            self.requests += 1
+            if status == 304:
+                self.not_modified += 1
+            self._latencies.append(latency)
+            self._request_times.append(time.monotonic())
+    
+    def get_stats(self):
+        """
+        Get request statistics
+        
+        Returns:
+            dict: Request counts, recent requests/sec and latency percentiles (ms)
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+            times = list(self._request_times)
+            requests = self.requests
+            not_modified = self.not_modified
+        
+        if len(times) > 1 and times[-1] > times[0]:
+            rps = round((len(times) - 1) / (times[-1] - times[0]), 1)
+        else:
+            rps = 0.0
+        
+        def percentile(p):
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 3)
+        
+        return {
+            'requests': requests,
+            'not_modified': not_modified,
+            'requests_per_sec': rps,
+            'latency_p50_ms': percentile(0.50),
+            'latency_p99_ms': percentile(0.99),
+            'cache': self.frame_cache.get_stats()
+        }
@@ -0,0 +1,203 @@
+"""
+Stream Server Module
+MJPEG-over-HTTP live view fed from the shared frame stream
+"""
+
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+BOUNDARY = 'picamframe'
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    """Per-client request handler (one thread per connection)"""
+    
+    protocol_version = 'HTTP/1.1'
+    
+    def log_message(self, format, *args):
+        """Route access logs to the system logger at debug level"""
+        self.server.owner.logger.debug(f"Stream {self.address_string()} - {format % args}")
+    
+    def do_GET(self):
+        """Dispatch GET requests"""
+        path = self.path.split('?', 1)[0]
+        
+        if path == '/stream':
+            self._serve_stream()
+        elif path == '/':
+            self._serve_index()
+        else:
+            self.send_error(404)
+    
+    def _serve_index(self):
+        """Minimal viewer page"""
+        body = b'<html><body style="margin:0"><img src="/stream"></body></html>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _serve_stream(self):
+        """Push frames as multipart/x-mixed-replace until the client leaves"""
+        owner = self.server.owner
+        
+        if not owner.client_joined():
+            self.send_error(503, "Too many stream clients")
+            return
+        
+        try:
+            # A client that can't take a frame within client_timeout is dropped
+            self.connection.settimeout(owner.client_timeout)
+            
+            self.send_response(200)
+            self.send_header('Content-Type', f'multipart/x-mixed-replace; boundary={BOUNDARY}')
+            self.send_header('Cache-Control', 'no-cache, private')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            
+            last_seq = 0
+            while owner.running:
+                result = owner.frame_stream.wait_for_frame(last_seq, timeout=1.0)
+                if result is None:
+                    continue
+                
+                seq, _, frame = result
+                if last_seq:
+                    # Frames published while we were writing were skipped
+                    owner.record_dropped(seq - last_seq - 1)
+                last_seq = seq
+                
+                header = (
+                    f"--{BOUNDARY}\r\n"
+                    f"Content-Type: image/jpeg\r\n"
+                    f"Content-Length: {len(frame)}\r\n\r\n"
+                ).encode()
+                
+                # Header and shared frame are written separately to avoid a per-client copy
+                self.wfile.write(header)
+                self.wfile.write(frame)
+                self.wfile.write(b"\r\n")
+                owner.record_sent(len(frame))
+        
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass
+        
+        finally:
+            owner.client_left()
+            self.close_connection = True
+
+
+class StreamServer:
+    """
+    HTTP server fanning the shared frame stream out to many viewers
+    Slow viewers skip to the newest frame instead of holding up others
+    """
+    
+    def __init__(self, config, logger, frame_stream):
+        """
+        Initialize stream server
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            frame_stream: FrameStream instance
+        """
+        self.config = config
+        self.logger = logger
+        self.frame_stream = frame_stream
+        
+        stream = config.get('stream', {})
+        self.host = stream.get('host', '0.0.0.0')
+        self.port = stream.get('port', 8080)
+        self.max_clients = stream.get('max_clients', 10)
+        self.client_timeout = stream.get('client_timeout', 10)
+        
+        self.running = False
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.clients = 0
+        self.total_clients = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.bytes_sent = 0
+    
+    def start(self):
+        """Start serving in a background thread"""
+        self._server = ThreadingHTTPServer((self.host, self.port), _StreamHandler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self.running = True
+        
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            name="stream-server",
+            daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"MJPEG stream available at http://{self.host}:{self.port}/stream")
+    
+    def stop(self):
+        """Stop serving and disconnect clients"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._server.shutdown()
+        self._server.server_close()
+        self.logger.info(
+            f"Stream server stopped ({self.total_clients} clients served, "
+            f"{self.frames_sent} frames sent, {self.frames_dropped} dropped)"
+        )
+    
+    def client_joined(self):
+        """
+        Reserve a client slot
+        
+        Returns:
+            bool: False if max_clients are already connected
+        """
+        with self._lock:
+            if self.clients >= self.max_clients:
+                return False
+            self.clients += 1
+            self.total_clients += 1
+            return True
+    
+    def client_left(self):
+        """Release a client slot"""
+        with self._lock:
+            self.clients -= 1
+    
+    def record_sent(self, size):
+        """Count a frame delivered to a client"""
+        with self._lock:
+            self.frames_sent += 1
+            self.bytes_sent += size
+    
+    def record_dropped(self, count):
+        """Count frames a slow client skipped"""
+        if count > 0:
+            with self._lock:
+                self.frames_dropped += count
+    
+    def get_stats(self):
+        """
+        Get server statistics
+        
+        Returns:
+            dict: Client and frame counters
+        """
+        with self._lock:
+            return {
+                'clients': self.clients,
+                'total_clients': self.total_clients,
+                'frames_sent': self.frames_sent,
+                'frames_dropped': self.frames_dropped,
+                'sent_mb': round(self.bytes_sent / (1024 * 1024), 2)
+            }
@@ -0,0 +1,228 @@
+"""
+Supervisor Module
+Runs one capture worker process per config and restarts crashed or stalled workers
+"""
+
+import math
+import os
+import signal
+import subprocess
+import sys
+import time
+
+from .shared_metrics import SharedMetrics
+
+
+class _Worker:
+    """Supervisor-side bookkeeping for one worker process"""
+    
+    def __init__(self, slot, name, config_path):
+        self.slot = slot
+        self.name = name
+        self.config_path = config_path
+        self.process = None
+        self.state = 'stopped'
+        self.started_at = 0.0
+        self.next_start = 0.0
+        self.restarts = 0
+        self.failures = 0
+        self.last_exit = 0
+        self.kill_at = None  # SIGKILL deadline once a stalled worker was sent SIGTERM
+
+
+class Supervisor:
+    """
+    Starts `main.py --config <path>` for every worker config and watches it
+    
+    A worker that exits is restarted after an exponential backoff; one whose
+    heartbeat (published through shared memory by the capture loop) goes
+    stale is terminated and restarted the same way. The backoff resets once
+    a worker has stayed up for stable_after seconds.
+    """
+    
+    def __init__(self, config, logger, worker_configs):
+        """
+        Initialize supervisor
+        
+        Args:
+            config: Configuration dictionary (supervisor section)
+            logger: Logger instance
+            worker_configs: List of worker config file paths
+        """
+        self.config = config
+        self.logger = logger
+        
+        supervisor = config.get('supervisor', {})
+        self.shm_name = supervisor.get('shm_name', 'picam_metrics')
+        self.stall_timeout = supervisor.get('stall_timeout', 120)
+        self.startup_timeout = supervisor.get('startup_timeout', 180)
+        self.heartbeat_interval = supervisor.get('heartbeat_interval', 5)
+        self.restart_delay = supervisor.get('restart_delay', 2)
+        self.max_restart_delay = supervisor.get('max_restart_delay', 300)
+        self.stable_after = supervisor.get('stable_after', 600)
+        self.poll_interval = supervisor.get('poll_interval', 1.0)
+        self.stop_timeout = supervisor.get('stop_timeout', 15)
+        
+        self.main_script = os.path.join(os.path.dirname(__file__), '..', '..', 'main.py')
+        
+        self.workers = [
+            _Worker(slot, os.path.splitext(os.path.basename(path))[0], path)
+            for slot, path in enumerate(worker_configs)
+        ]
+        
+        self.metrics = None
+        self.running = False
+    
+    def run(self):
+        """Supervise until SIGTERM/SIGINT, then stop all workers"""
+        self.metrics = SharedMetrics(self.shm_name, len(self.workers), create=True)
+        self.running = True
+        
+        signal.signal(signal.SIGTERM, self._signal_handler)
+        signal.signal(signal.SIGINT, self._signal_handler)
+        
+        self.logger.info(
+            f"Supervisor started: {len(self.workers)} workers, metrics in shared memory '{self.shm_name}'"
+        )
+        
+        try:
+            while self.running:
+                now = time.time()
+                for worker in self.workers:
+                    self._check(worker, now)
+                time.sleep(self.poll_interval)
+        finally:
+            self._stop_all()
+            self.metrics.close()
+            self.logger.info("Supervisor stopped")
+    
+    def _signal_handler(self, signum, frame):
+        """Leave the supervision loop"""
+        self.running = False
+    
+    def _check(self, worker, now):
+        """Start, reap or kill one worker as needed"""
+        if worker.process is None:
+            if now >= worker.next_start:
+                self._start(worker)
+            return
+        
+        code = worker.process.poll()
+        if code is not None:
+            self._exited(worker, code, now)
+            return
+        
+        if worker.kill_at is not None:
+            # Terminating: escalate once the grace period is over, reap on a later pass
+            if now >= worker.kill_at:
+                self.logger.error(f"Worker {worker.name} ignored SIGTERM for {self.stop_timeout}s, killing")
+                worker.process.kill()
+                worker.kill_at = math.inf
+            return
+        
+        heartbeat = self.metrics.heartbeat(worker.slot)
+        
+        if math.isnan(heartbeat):
+            # Still validating the camera / warming up
+            if now - worker.started_at > self.startup_timeout:
+                self._stalled(worker, f"no heartbeat {self.startup_timeout}s after start", now)
+            return
+        
+        if worker.state == 'starting':
+            self._set_state(worker, 'running')
+        
+        if now - heartbeat > self.stall_timeout:
+            self._stalled(worker, f"heartbeat {now - heartbeat:.0f}s old", now)
+    
+    def _start(self, worker):
+        """Launch a worker process"""
+        self.metrics.clear_worker(worker.slot)
+        
+        env = dict(os.environ)
+        env['PICAM_METRICS_SHM'] = self.shm_name
+        env['PICAM_METRICS_SLOT'] = str(worker.slot)
+        env['PICAM_HEARTBEAT_INTERVAL'] = str(self.heartbeat_interval)
+        
+        worker.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(self.main_script), '--config', worker.config_path],
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # Own process group so terminal Ctrl+C reaches the supervisor only
+            start_new_session=True
+        )
+        worker.started_at = time.time()
+        self._set_state(worker, 'starting')
+        self.logger.info(f"Worker {worker.name} started (pid {worker.process.pid}, {worker.config_path})")
+    
+    def _exited(self, worker, code, now):
+        """Handle a worker that exited and schedule its restart"""
+        uptime = now - worker.started_at
+        worker.process = None
+        worker.last_exit = code
+        worker.kill_at = None
+        
+        if uptime >= self.stable_after:
+            worker.failures = 0
+        
+        delay = min(self.max_restart_delay, self.restart_delay * (2 ** worker.failures))
+        worker.failures += 1
+        worker.restarts += 1
+        worker.next_start = now + delay
+        
+        self._set_state(worker, 'backoff')
+        self.logger.warning(
+            f"Worker {worker.name} exited with code {code} after {uptime:.0f}s, "
+            f"restarting in {delay:g}s"
+        )
+    
+    def _stalled(self, worker, reason, now):
+        """
+        SIGTERM a hung worker without waiting for it
+        Later passes SIGKILL it after stop_timeout; it is restarted once reaped
+        """
+        self.logger.error(f"Worker {worker.name} stalled ({reason}), terminating")
+        self._set_state(worker, 'stalled')
+        worker.process.terminate()
+        worker.kill_at = now + self.stop_timeout
+    
+    def _terminate(self, process):
+        """SIGTERM, then SIGKILL if the worker does not exit in time"""
+        if process.poll() is not None:
+            return
+        
+        process.terminate()
+        try:
+            process.wait(timeout=self.stop_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+    
+    def _stop_all(self):
+        """Stop every worker (graceful first)"""
+        for worker in self.workers:
+            if worker.process and worker.process.poll() is None:
+                worker.process.terminate()
+        
+        for worker in self.workers:
+            if worker.process:
+                self._terminate(worker.process)
+                worker.process = None
+            self._set_state(worker, 'stopped')
+    
+    def _set_state(self, worker, state):
+        """Record a worker's state in the shared block"""
+        worker.state = state
+        pid = worker.process.pid if worker.process else 0
+        self.metrics.publish_supervisor(
+            worker.slot, pid, state, worker.restarts, worker.last_exit, worker.name
+        )
+    
+    def get_status(self):
+        """
+        Fleet status straight from shared memory
+        
+        Returns:
+            dict: Per-worker metrics and totals
+        """
+        return self.metrics.read_all()
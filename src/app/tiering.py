@@ -0,0 +1,468 @@
+"""
+Storage Tiering Module
+Re-encodes aging captures to smaller tiers in a low-priority process pool
+"""
+
+import fnmatch
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+
+from PIL import Image
+
+from utils.clock import SystemClock
+
+from .renditions import FORMATS, Rendition
+
+
+class Tier(namedtuple('Tier', 'after size quality format')):
+    """
+    One storage tier: captures at least `after` seconds old are re-encoded
+    to `quality`, fit inside `size` (or kept at their size) and stored as `format`
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_config(cls, entry, index=0):
+        """
+        Build a tier from its config mapping
+        
+        Args:
+            entry: Dict with after_hours plus optional size ('WxH'), quality and format
+            index: Position in the tier list (for error messages)
+            
+        Returns:
+            Tier: Parsed tier
+        """
+        after = entry['after_hours']
+        if not isinstance(after, (int, float)) or isinstance(after, bool) or after < 0:
+            raise ValueError(f"after_hours must be a number >= 0, got {after!r}")
+        
+        rendition = Rendition.from_config(entry, index)
+        return cls(after * 3600, rendition.size, rendition.quality, rendition.format)
+
+
+class TierJournal:
+    """
+    Durable record of the tier each file has reached
+    A record only counts while the file still has the recorded size and mtime
+    """
+    
+    def __init__(self, journal_path):
+        """
+        Initialize tier journal
+        
+        Args:
+            journal_path: Path to the journal file (JSON lines)
+        """
+        self.journal_path = journal_path
+        self._entries = {}
+        
+        journal_dir = os.path.dirname(journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self._entries[entry['name']] = entry
+                    except (ValueError, KeyError):
+                        # Torn write from a crash, ignore the partial record
+                        continue
+        
+        self._fh = None
+    
+    def compact(self, keep):
+        """
+        Rewrite the journal with one record per file still present
+        
+        Args:
+            keep: Set of file names that still exist
+        """
+        self._entries = {name: entry for name, entry in self._entries.items() if name in keep}
+        
+        if self._fh:
+            self._fh.close()
+        
+        tmp_path = self.journal_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            for entry in self._entries.values():
+                f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(tmp_path, self.journal_path)
+        self._fh = open(self.journal_path, 'a')
+    
+    def tier_of(self, name, size, mtime):
+        """
+        Get the tier a file is at
+        
+        Returns:
+            int: Tier number (0 = original capture)
+        """
+        entry = self._entries.get(name)
+        if entry and entry['size'] == size and entry['mtime'] == mtime:
+            return entry['tier']
+        return 0
+    
+    def record(self, name, tier, size, mtime):
+        """
+        Persist the tier a file reached
+        
+        Args:
+            name: File name
+            tier: Tier number (1-based)
+            size: File size after re-encoding
+            mtime: File modification time (unchanged by re-encoding)
+        """
+        entry = {'name': name, 'tier': tier, 'size': size, 'mtime': mtime}
+        self._entries[name] = entry
+        self._fh.write(json.dumps(entry) + '\n')
+        self._fh.flush()
+    
+    def close(self):
+        """Close journal file"""
+        if self._fh:
+            self._fh.close()
+            self._fh = None
+
+
+def _lower_priority(nice, idle):
+    """Worker initializer: step out of the capture loop's way"""
+    try:
+        os.nice(nice)
+        if idle and hasattr(os, 'SCHED_IDLE'):
+            os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+    except OSError:
+        pass
+
+
+def retier_file(path, tier):
+    """
+    Re-encode one capture into a tier and swap it in atomically
+    Runs in a worker process. The original mtime is carried over so ages,
+    retention and time-ordered listings are unaffected.
+    
+    Args:
+        path: Capture path
+        tier: Tier
+        
+    Returns:
+        dict: path, new_path, before, after (bytes), cpu (seconds), error
+    """
+    started = time.process_time()
+    result = {'path': path, 'new_path': path, 'before': 0, 'after': 0, 'cpu': 0.0, 'error': None}
+    
+    try:
+        stat = os.stat(path)
+        result['before'] = result['after'] = stat.st_size
+        
+        # The name follows the tier's format (a .webp reaching a JPEG tier becomes
+        # .jpg); an extension already of that format (.jpeg for jpg) is kept
+        stem, extension = os.path.splitext(path)
+        same_format = FORMATS.get(extension[1:].lower()) == FORMATS[tier.format]
+        target = path if same_format else f"{stem}.{tier.format}"
+        temp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(target)}.tier")
+        
+        with Image.open(path) as image:
+            if tier.size:
+                # DCT-domain downscale while decoding, then resample the rest
+                image.draft('RGB', tier.size)
+                image.thumbnail(tier.size, Image.BILINEAR)
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            
+            options = {'quality': tier.quality} if FORMATS[tier.format] in ('JPEG', 'WEBP') else {}
+            with open(temp_path, 'wb') as f:
+                image.save(f, FORMATS[tier.format], **options)
+                f.flush()
+                os.fsync(f.fileno())
+        
+        new_size = os.path.getsize(temp_path)
+        if new_size >= stat.st_size:
+            # Already as small as this tier would make it, keep the original
+            os.remove(temp_path)
+            result['error'] = 'no gain'
+        else:
+            os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            os.replace(temp_path, target)
+            if target != path:
+                os.remove(path)
+            result['new_path'] = target
+            result['after'] = new_size
+    
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+        try:
+            os.remove(temp_path)
+        except (OSError, NameError):
+            pass
+    
+    result['cpu'] = time.process_time() - started
+    return result
+
+
+class StorageTiering:
+    """
+    Periodic sweep moving captures down storage tiers as they age
+    Encoding runs in a short-lived, niced process pool so it uses spare cores
+    without competing with capture; files are swapped with os.replace so
+    readers see either the old or the new file, never a partial one
+    """
+    
+    def __init__(self, config, logger, uploader=None, catalog=None, clock=None):
+        """
+        Initialize storage tiering
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            uploader: Optional Uploader; files are only tiered once uploaded,
+                      and the re-encoded file is recorded as uploaded
+            catalog: Optional CaptureCatalog receiving the new name and size
+            clock: Optional time source (default: SystemClock)
+        """
+        self.logger = logger
+        self.uploader = uploader
+        self.catalog = catalog
+        self.clock = clock or SystemClock()
+        self.apply_config(config)
+        
+        tiering = config.get('tiering', {}) or {}
+        self.journal = TierJournal(tiering.get('journal_file') or os.path.join(
+            config['files']['log_dir'], 'tiering_journal.jsonl'
+        ))
+        
+        self.running = False
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        
+        # Metrics
+        self.files_tiered = 0
+        self.bytes_before = 0
+        self.bytes_after = 0
+        self.cpu_seconds = 0.0
+        self.errors = 0
+        self.sweeps = 0
+        self.last_sweep = None
+    
+    def apply_config(self, config):
+        """
+        Load tiering settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
+        tiering = config.get('tiering', {}) or {}
+        
+        self.capture_dir = config['files']['capture_dir']
+        self.tiers = sorted(
+            (Tier.from_config(entry, index) for index, entry in enumerate(tiering.get('tiers') or [])),
+            key=lambda tier: tier.after
+        )
+        self.interval = tiering.get('interval', 3600)
+        self.workers = tiering.get('workers') or max(1, (os.cpu_count() or 1) - 1)
+        self.nice = tiering.get('nice', 19)
+        self.idle_priority = tiering.get('idle_priority', True)
+        self.max_files = tiering.get('max_files_per_sweep', 500)
+        self.include_patterns = tiering.get('include_patterns', ['*.jpg', '*.jpeg', '*.webp'])
+    
+    def start(self):
+        """Start sweeping in a background thread"""
+        if self.running or not self.tiers:
+            return
+        
+        self.running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="tiering", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Storage tiering started ({len(self.tiers)} tiers, every {self.interval}s)")
+    
+    def stop(self):
+        """Stop sweeping (a sweep in progress finishes its current batch)"""
+        if not self.running:
+            return
+        
+        self.running = False
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join(60)
+            self._thread = None
+        self.journal.close()
+    
+    def _run(self):
+        """Sweep loop"""
+        while not self._stop_event.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                self.logger.error(f"Tiering sweep failed: {e}")
+            self._stop_event.wait(self.interval)
+    
+    def _tier_for_age(self, age):
+        """Deepest tier (1-based) a capture of this age belongs in, 0 for none"""
+        level = 0
+        for index, tier in enumerate(self.tiers, 1):
+            if age >= tier.after:
+                level = index
+        return level
+    
+    def plan(self):
+        """
+        Find captures due for a deeper tier, oldest first
+        
+        Returns:
+            list: (path, tier number, size, mtime) tuples, at most max_files_per_sweep
+        """
+        now = self.clock.time()
+        due = []
+        present = set()
+        
+        try:
+            entries = list(os.scandir(self.capture_dir))
+        except OSError as e:
+            self.logger.error(f"Tiering scan failed: {e}")
+            return []
+        
+        for entry in entries:
+            if not entry.is_file() or entry.name.startswith('.'):
+                continue
+            present.add(entry.name)
+            
+            if not any(fnmatch.fnmatch(entry.name, p) for p in self.include_patterns):
+                continue
+            
+            stat = entry.stat()
+            level = self._tier_for_age(now - stat.st_mtime)
+            if level <= self.journal.tier_of(entry.name, stat.st_size, stat.st_mtime):
+                continue
+            
+            # Keep the full-quality original until it has been uploaded
+            if self.uploader and not self.uploader.journal.is_done(entry.name, stat.st_size, stat.st_mtime):
+                continue
+            
+            due.append((stat.st_mtime, entry.path, level, stat.st_size))
+        
+        self.journal.compact(present)
+        
+        due.sort()
+        return [(path, level, size, mtime) for mtime, path, level, size in due[:self.max_files]]
+    
+    def sweep(self, dry_run=False):
+        """
+        Re-encode every capture that is due, in parallel
+        
+        Args:
+            dry_run: Only plan, report what would be re-encoded
+            
+        Returns:
+            dict: files, bytes_before, bytes_after, reclaimed, cpu_seconds,
+                  bytes_per_cpu_second, errors, elapsed
+        """
+        started = time.monotonic()
+        jobs = self.plan()
+        summary = {'files': 0, 'bytes_before': 0, 'bytes_after': 0, 'cpu_seconds': 0.0, 'errors': 0}
+        
+        if dry_run or not jobs:
+            summary['planned'] = len(jobs)
+            return self._finish(summary, started)
+        
+        # Deferred: config validation imports this module at every start, and
+        # multiprocessing pulls in subprocess
+        from concurrent.futures import ProcessPoolExecutor
+        
+        with ProcessPoolExecutor(
+            max_workers=min(self.workers, len(jobs)),
+            initializer=_lower_priority,
+            initargs=(self.nice, self.idle_priority)
+        ) as executor:
+            futures = [
+                (executor.submit(retier_file, path, self.tiers[level - 1]), level, mtime)
+                for path, level, size, mtime in jobs
+            ]
+            
+            for future, level, mtime in futures:
+                if self._stop_event.is_set():
+                    future.cancel()
+                    continue
+                
+                result = future.result()
+                summary['cpu_seconds'] += result['cpu']
+                
+                if result['error'] == 'no gain':
+                    # Nothing to reclaim at this tier, don't try again
+                    self.journal.record(os.path.basename(result['path']), level, result['before'], mtime)
+                    continue
+                
+                if result['error']:
+                    summary['errors'] += 1
+                    self.logger.warning(f"Tiering failed for {os.path.basename(result['path'])}: {result['error']}")
+                    continue
+                
+                name = os.path.basename(result['new_path'])
+                self.journal.record(name, level, result['after'], mtime)
+                
+                if self.catalog:
+                    self.catalog.update(os.path.basename(result['path']), mtime,
+                                        name=name, size=result['after'], tier=level)
+                
+                # The smaller copy must not be mistaken for a new file to upload
+                if self.uploader:
+                    self.uploader.journal.record(name, result['after'], mtime, result['after'], done=True)
+                
+                summary['files'] += 1
+                summary['bytes_before'] += result['before']
+                summary['bytes_after'] += result['after']
+        
+        with self._lock:
+            self.files_tiered += summary['files']
+            self.bytes_before += summary['bytes_before']
+            self.bytes_after += summary['bytes_after']
+            self.cpu_seconds += summary['cpu_seconds']
+            self.errors += summary['errors']
+        
+        summary = self._finish(summary, started)
+        if summary['files']:
+            self.logger.info(
+                f"Tiering: {summary['files']} files re-encoded, {summary['reclaimed'] / (1024 * 1024):.1f} MB "
+                f"reclaimed ({summary['bytes_per_cpu_second'] / (1024 * 1024):.1f} MB per CPU-second)"
+            )
+        return summary
+    
+    def _finish(self, summary, started):
+        """Add derived totals to a sweep summary"""
+        summary['reclaimed'] = summary['bytes_before'] - summary['bytes_after']
+        summary['bytes_per_cpu_second'] = (
+            round(summary['reclaimed'] / summary['cpu_seconds']) if summary['cpu_seconds'] else 0
+        )
+        summary['elapsed'] = round(time.monotonic() - started, 2)
+        
+        self.sweeps += 1
+        self.last_sweep = self.clock.now()
+        return summary
+    
+    def get_stats(self):
+        """
+        Get tiering statistics
+        
+        Returns:
+            dict: Files re-encoded, bytes reclaimed and reclaim efficiency
+        """
+        with self._lock:
+            reclaimed = self.bytes_before - self.bytes_after
+            return {
+                'tiered_files': self.files_tiered,
+                'tiering_reclaimed_mb': round(reclaimed / (1024 * 1024), 2),
+                'tiering_cpu_seconds': round(self.cpu_seconds, 2),
+                'tiering_mb_per_cpu_second': round(reclaimed / (1024 * 1024) / self.cpu_seconds, 2) if self.cpu_seconds else 0.0,
+                'tiering_errors': self.errors,
+                'tiering_last_sweep': self.last_sweep.strftime('%Y-%m-%d %H:%M:%S') if self.last_sweep else 'Never'
+            }
@@ -0,0 +1,687 @@
+"""
+Upload Module
+Offloads captured images and archives to a remote HTTP PUT endpoint
+"""
+
+import fnmatch
+import http.client
+import json
+import os
+import queue
+import random
+import re
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit, quote
+
+
+class UploadJournal:
+    """
+    Durable append-only record of upload progress
+    Lets a restarted uploader skip finished files and resume partial ones
+    """
+    
+    def __init__(self, journal_path):
+        """
+        Initialize upload journal
+        
+        Args:
+            journal_path: Path to the journal file (JSON lines)
+        """
+        self.journal_path = journal_path
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._fh = None
+        
+        # Records appended since the last compaction
+        self.appended = 0
+        
+        journal_dir = os.path.dirname(journal_path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        
+        self._load()
+        self.compact()
+    
+    def _load(self):
+        """Replay journal file into memory (last record for a name wins)"""
+        if not os.path.exists(self.journal_path):
+            return
+        
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry['name']] = entry
+                except (ValueError, KeyError):
+                    # Torn write from a crash, ignore the partial record
+                    continue
+    
+    def compact(self, keep=None):
+        """
+        Rewrite journal with one record per file
+        
+        Args:
+            keep: Optional set of names to keep (entries of deleted files are dropped)
+        """
+        with self._lock:
+            if keep is not None:
+                self._entries = {name: entry for name, entry in self._entries.items() if name in keep}
+            
+            if self._fh:
+                self._fh.close()
+            
+            tmp_path = self.journal_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                for entry in self._entries.values():
+                    f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            
+            os.replace(tmp_path, self.journal_path)
+            self._fh = open(self.journal_path, 'a')
+            self.appended = 0
+    
+    def names(self):
+        """
+        Get the names the journal has entries for
+        
+        Returns:
+            set: Remote object names
+        """
+        with self._lock:
+            return set(self._entries)
+    
+    def _matches(self, entry, size, mtime):
+        """Check a journal entry still describes the file on disk"""
+        return entry['size'] == size and entry['mtime'] == mtime
+    
+    def record(self, name, size, mtime, offset, done=False):
+        """
+        Persist upload progress for a file
+        
+        Args:
+            name: Remote object name
+            size: File size in bytes
+            mtime: File modification time
+            offset: Bytes confirmed by the server
+            done: True once the upload is complete
+        """
+        entry = {
+            'name': name,
+            'size': size,
+            'mtime': mtime,
+            'offset': offset,
+            'done': done
+        }
+        
+        with self._lock:
+            self._entries[name] = entry
+            if self._fh is None:
+                # Closed by stop() while an upload was still finishing
+                return
+            self._fh.write(json.dumps(entry) + '\n')
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+            self.appended += 1
+    
+    def is_done(self, name, size, mtime):
+        """
+        Check whether a file has already been uploaded
+        
+        Returns:
+            bool: True if the same file content was fully uploaded
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        
+        return bool(entry and entry['done'] and self._matches(entry, size, mtime))
+    
+    def get_offset(self, name, size, mtime):
+        """
+        Get resume offset for a partially uploaded file
+        
+        Returns:
+            int: Byte offset to resume from (0 if unknown or file changed)
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+        
+        if entry and self._matches(entry, size, mtime):
+            return entry['offset']
+        
+        return 0
+    
+    def close(self):
+        """Close journal file"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+
+
+class ConnectionPool:
+    """
+    Bounded pool of persistent keep-alive HTTP connections
+    """
+    
+    def __init__(self, endpoint, size, timeout):
+        """
+        Initialize connection pool
+        
+        Args:
+            endpoint: Base URL of the upload endpoint
+            size: Maximum number of open connections
+            timeout: Socket timeout in seconds
+        """
+        parts = urlsplit(endpoint)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.timeout = timeout
+        
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self.connections_opened = 0
+    
+    def _connect(self):
+        """Open a new connection to the endpoint host"""
+        self.connections_opened += 1
+        
+        if self.scheme == 'https':
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+    
+    def acquire(self):
+        """
+        Take a connection from the pool, opening one if none are idle
+        
+        Returns:
+            http.client.HTTPConnection: Connection reserved for the caller
+        """
+        self._slots.acquire()
+        
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            return self._connect()
+    
+    def release(self, conn, reuse=True):
+        """
+        Return a connection to the pool
+        
+        Args:
+            conn: Connection from acquire()
+            reuse: False to discard a connection in an unknown state
+        """
+        if reuse:
+            self._idle.put(conn)
+        else:
+            conn.close()
+        
+        self._slots.release()
+    
+    def close_all(self):
+        """Close all idle connections"""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class UploadError(Exception):
+    """Raised when the endpoint rejects an upload request"""
+
+
+class Uploader:
+    """
+    Background uploader for captured files
+    Uses bounded worker threads sharing a pool of keep-alive connections
+    """
+    
+    # Status codes accepted for a finished upload or an accepted chunk
+    DONE_STATUSES = (200, 201, 204)
+    INCOMPLETE_STATUS = 308
+    RANGE_MISMATCH_STATUS = 416
+    
+    # Range header of a resumable-upload status reply: bytes=0-<last byte stored>
+    STORED_RANGE = re.compile(r'^\s*bytes=0-(\d+)\s*$')
+    
+    # Deleted-file entries (or appended records beyond one per file) that trigger a compaction
+    JOURNAL_PRUNE_MIN = 1000
+    
+    def __init__(self, config, logger):
+        """
+        Initialize uploader
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+        """
+        self.config = config
+        self.logger = logger
+        
+        upload = config.get('upload', {})
+        self.enabled = upload.get('enabled', False)
+        self.endpoint = upload.get('endpoint', 'http://127.0.0.1:8000/uploads')
+        self.concurrency = max(1, upload.get('concurrency', 2))
+        self.chunk_size = int(upload.get('chunk_size_mb', 4) * 1024 * 1024)
+        self.max_retries = upload.get('max_retries', 5)
+        self.backoff_base = upload.get('backoff_base', 1)
+        self.backoff_max = upload.get('backoff_max', 60)
+        self.scan_interval = upload.get('scan_interval', 30)
+        self.settle_time = upload.get('settle_time', 2)
+        self.timeout = upload.get('timeout', 30)
+        self.include_patterns = upload.get('include_patterns', ['*.jpg'])
+        self.delete_after_upload = upload.get('delete_after_upload', False)
+        self.headers = upload.get('headers', {})
+        
+        self.watch_dir = config['files']['capture_dir']
+        journal_file = upload.get(
+            'journal_file',
+            os.path.join(config['files']['log_dir'], 'upload_journal.jsonl')
+        )
+        
+        self.journal = UploadJournal(journal_file)
+        self.pool = ConnectionPool(self.endpoint, self.concurrency, self.timeout)
+        
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._threads = []
+        
+        # Metrics
+        self.uploaded_files = 0
+        self.uploaded_bytes = 0
+        self.failed_uploads = 0
+        self.retries = 0
+        self.in_flight = 0
+        self._recent = deque()  # (timestamp, bytes) for throughput window
+        self._stats_lock = threading.Lock()
+    
+    def start(self):
+        """Start scanner and upload worker threads"""
+        if not self.enabled:
+            return
+        
+        self._stop_event.clear()
+        
+        for i in range(self.concurrency):
+            worker = threading.Thread(
+                target=self._worker_loop,
+                name=f"uploader-{i}",
+                daemon=True
+            )
+            worker.start()
+            self._threads.append(worker)
+        
+        scanner = threading.Thread(target=self._scan_loop, name="uploader-scan", daemon=True)
+        scanner.start()
+        self._threads.append(scanner)
+        
+        self.logger.info(
+            f"Uploader started: {self.endpoint} "
+            f"({self.concurrency} connections, chunk {self.chunk_size // 1024} KB)"
+        )
+    
+    def stop(self, timeout=5):
+        """
+        Stop uploader threads, leaving queued files for the next run
+        
+        Args:
+            timeout: Seconds to wait for each thread
+        """
+        if not self._threads:
+            return
+        
+        self._stop_event.set()
+        
+        for _ in range(self.concurrency):
+            self._queue.put(None)
+        
+        for thread in self._threads:
+            thread.join(timeout)
+        
+        alive = [thread.name for thread in self._threads if thread.is_alive()]
+        self._threads = []
+        self.pool.close_all()
+        
+        if alive:
+            # Progress they record from now on is not persisted (the upload resumes
+            # from the last recorded offset next run)
+            self.logger.warning(f"Upload threads still running at stop: {', '.join(alive)}")
+        self.journal.close()
+        self.logger.info(f"Uploader stopped ({self.get_queue_depth()} files still queued)")
+    
+    def enqueue(self, filepath):
+        """
+        Queue a file for upload
+        
+        Args:
+            filepath: Path to a local file
+            
+        Returns:
+            bool: True if the file was queued
+        """
+        filepath = os.path.abspath(filepath)
+        
+        with self._pending_lock:
+            if filepath in self._pending:
+                return False
+            self._pending.add(filepath)
+        
+        self._queue.put(filepath)
+        return True
+    
+    def scan_once(self):
+        """
+        Queue files in the capture directory that were not uploaded yet
+        
+        Returns:
+            int: Number of files queued
+        """
+        queued = 0
+        now = time.time()
+        
+        try:
+            entries = list(os.scandir(self.watch_dir))
+        except OSError as e:
+            self.logger.error(f"Upload scan failed: {e}")
+            return 0
+        
+        for entry in sorted(entries, key=lambda e: e.name):
+            if not entry.is_file():
+                continue
+            
+            if not any(fnmatch.fnmatch(entry.name, p) for p in self.include_patterns):
+                continue
+            
+            stat = entry.stat()
+            
+            # Skip files that may still be being written
+            if now - stat.st_mtime < self.settle_time:
+                continue
+            
+            if self.journal.is_done(entry.name, stat.st_size, stat.st_mtime):
+                continue
+            
+            if self.enqueue(entry.path):
+                queued += 1
+        
+        if queued:
+            self.logger.debug(f"Upload scan queued {queued} files")
+        
+        self._prune_journal({entry.name for entry in entries})
+        
+        return queued
+    
+    def _prune_journal(self, listed):
+        """
+        Compact the journal once enough of it describes deleted files or stale progress
+        
+        Args:
+            listed: Names in the capture directory at the start of the scan
+        """
+        names = self.journal.names()
+        
+        # A file created after the listing may already be recorded; check again
+        gone = {name for name in names - listed
+                if not os.path.exists(os.path.join(self.watch_dir, name))}
+        
+        if len(gone) >= self.JOURNAL_PRUNE_MIN or self.journal.appended > len(names) + self.JOURNAL_PRUNE_MIN:
+            self.journal.compact(names - gone)
+            self.logger.debug(f"Upload journal compacted ({len(gone)} entries of deleted files dropped)")
+    
+    def _scan_loop(self):
+        """Periodically scan the capture directory"""
+        while not self._stop_event.is_set():
+            self.scan_once()
+            self._stop_event.wait(self.scan_interval)
+    
+    def _worker_loop(self):
+        """Upload files from the queue until stopped"""
+        while not self._stop_event.is_set():
+            filepath = self._queue.get()
+            
+            if filepath is None:
+                break
+            
+            try:
+                self._upload_with_retry(filepath)
+            except Exception as e:
+                # Keep the worker; a dead one would stall the queue silently
+                with self._stats_lock:
+                    self.failed_uploads += 1
+                self.logger.error(f"Upload error: {os.path.basename(filepath)} ({e!r})")
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(filepath)
+    
+    def _backoff_delay(self, attempt):
+        """
+        Exponential backoff with full jitter
+        
+        Args:
+            attempt: Retry number (1-based)
+            
+        Returns:
+            float: Seconds to wait
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+    
+    def _upload_with_retry(self, filepath):
+        """
+        Upload a single file, retrying transient failures
+        
+        Args:
+            filepath: Path to local file
+            
+        Returns:
+            bool: True if the file was uploaded
+        """
+        name = os.path.basename(filepath)
+        
+        for attempt in range(1, self.max_retries + 1):
+            if self._stop_event.is_set():
+                return False
+            
+            try:
+                stat = os.stat(filepath)
+            except FileNotFoundError:
+                self.logger.debug(f"Upload skipped, file removed: {name}")
+                return False
+            
+            if self.journal.is_done(name, stat.st_size, stat.st_mtime):
+                return True
+            
+            try:
+                self._upload_file(filepath, name, stat)
+                break
+            
+            except (OSError, http.client.HTTPException, UploadError) as e:
+                self.logger.warning(f"Upload failed: {name} ({e}). Retry {attempt}/{self.max_retries}")
+                
+                if attempt < self.max_retries:
+                    with self._stats_lock:
+                        self.retries += 1
+                    self._stop_event.wait(self._backoff_delay(attempt))
+        else:
+            with self._stats_lock:
+                self.failed_uploads += 1
+            self.logger.error(f"Upload gave up after {self.max_retries} attempts: {name}")
+            return False
+        
+        if self.delete_after_upload:
+            try:
+                os.remove(filepath)
+            except OSError as e:
+                self.logger.error(f"Failed to delete uploaded file {name}: {e}")
+        
+        return True
+    
+    def _upload_file(self, filepath, name, stat):
+        """
+        Send a file, resuming from the journal offset for chunked uploads
+        
+        Args:
+            filepath: Path to local file
+            name: Remote object name
+            stat: os.stat_result of the file
+            
+        Raises:
+            UploadError: If the endpoint returns an unexpected status
+        """
+        size = stat.st_size
+        mtime = stat.st_mtime
+        offset = self.journal.get_offset(name, size, mtime) if size > self.chunk_size else 0
+        
+        with self._stats_lock:
+            self.in_flight += 1
+        
+        conn = self.pool.acquire()
+        reuse = False
+        
+        try:
+            with open(filepath, 'rb') as f:
+                while True:
+                    f.seek(offset)
+                    if size > self.chunk_size:
+                        body = f.read(self.chunk_size)
+                        end = offset + len(body) - 1
+                        headers = {'Content-Range': f"bytes {offset}-{end}/{size}"}
+                    else:
+                        body = f.read()
+                        headers = {}
+                    
+                    status, confirmed = self._put(conn, name, body, headers)
+                    self._record_bytes(len(body))
+                    
+                    if status in self.DONE_STATUSES:
+                        break
+                    
+                    if size <= self.chunk_size:
+                        raise UploadError(f"HTTP {status} for single-request upload")
+                    
+                    # Server may have stored less than we sent, trust its Range
+                    offset = confirmed if confirmed is not None else offset + len(body)
+                    if offset >= size:
+                        raise UploadError("Endpoint did not finalize completed upload")
+                    
+                    self.journal.record(name, size, mtime, offset)
+            
+            self.journal.record(name, size, mtime, size, done=True)
+            reuse = True
+            
+            with self._stats_lock:
+                self.uploaded_files += 1
+            
+            self.logger.debug(f"Uploaded {name} ({size} bytes)")
+        
+        except UploadError:
+            # Endpoint answered cleanly, the connection is still usable
+            reuse = True
+            raise
+        
+        finally:
+            self.pool.release(conn, reuse=reuse)
+            with self._stats_lock:
+                self.in_flight -= 1
+    
+    def _put(self, conn, name, body, headers):
+        """
+        Issue one PUT request on a pooled connection
+        
+        Args:
+            conn: Connection from the pool
+            name: Remote object name
+            body: Request body bytes
+            headers: Extra request headers
+            
+        Returns:
+            tuple: (status: int, confirmed_offset: int or None)
+            
+        Raises:
+            UploadError: If the status is neither complete nor incomplete
+        """
+        request_headers = {
+            'Content-Type': 'application/octet-stream',
+            'Content-Length': str(len(body)),
+            'Connection': 'keep-alive'
+        }
+        request_headers.update(self.headers)
+        request_headers.update(headers)
+        
+        path = f"{self.pool.base_path}/{quote(name)}"
+        conn.request('PUT', path, body=body, headers=request_headers)
+        response = conn.getresponse()
+        response.read()
+        
+        if response.status in self.DONE_STATUSES:
+            return response.status, None
+        
+        if response.status in (self.INCOMPLETE_STATUS, self.RANGE_MISMATCH_STATUS):
+            # Range: bytes=0-<last byte stored>, absent if nothing is stored
+            confirmed = None
+            range_header = response.getheader('Range')
+            if range_header:
+                match = self.STORED_RANGE.match(range_header)
+                if not match:
+                    raise UploadError(f"HTTP {response.status} with unparsable Range: {range_header!r}")
+                confirmed = int(match.group(1)) + 1
+            elif response.status == self.RANGE_MISMATCH_STATUS:
+                confirmed = 0
+            return response.status, confirmed
+        
+        raise UploadError(f"HTTP {response.status} {response.reason}")
+    
+    def _record_bytes(self, count):
+        """Account transferred bytes for throughput reporting"""
+        now = time.time()
+        
+        with self._stats_lock:
+            self.uploaded_bytes += count
+            self._recent.append((now, count))
+            while self._recent and now - self._recent[0][0] > 60:
+                self._recent.popleft()
+    
+    def get_queue_depth(self):
+        """
+        Get number of files waiting for upload
+        
+        Returns:
+            int: Queued plus in-flight files
+        """
+        with self._pending_lock:
+            return len(self._pending)
+    
+    def get_stats(self):
+        """
+        Get uploader statistics
+        
+        Returns:
+            dict: Queue depth, totals, and throughput over the last minute
+        """
+        with self._stats_lock:
+            if self._recent:
+                window = max(1.0, time.time() - self._recent[0][0])
+                recent_bytes = sum(count for _, count in self._recent)
+            else:
+                window = 1.0
+                recent_bytes = 0
+            
+            return {
+                'queue_depth': self.get_queue_depth(),
+                'in_flight': self.in_flight,
+                'uploaded_files': self.uploaded_files,
+                'uploaded_mb': round(self.uploaded_bytes / (1024 * 1024), 2),
+                'failed_uploads': self.failed_uploads,
+                'retries': self.retries,
+                'connections_opened': self.pool.connections_opened,
+                'throughput_kbps': round(recent_bytes / window / 1024, 1)
+            }
@@ -0,0 +1,158 @@
+"""
+Validation Cache Module
+Remembers the last successful system validation for fast restarts
+"""
+
+import hashlib
+import json
+import os
+import time
+
+
+class ValidationCache:
+    """
+    Persists a fingerprint of the last validated device and configuration
+    A restart with the same camera, driver and settings can skip the test capture
+    """
+    
+    def __init__(self, config, logger):
+        """
+        Initialize validation cache
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+        """
+        from .device_monitor import SYSFS_VIDEO_ROOT
+        
+        self.config = config
+        self.logger = logger
+        
+        startup = config.get('startup', {})
+        self.cache_file = startup.get(
+            'cache_file',
+            os.path.join(config['files']['log_dir'], '.validation_cache.json')
+        )
+        self.max_age = startup.get('cache_max_age_hours', 24) * 3600
+        # Same video4linux tree as CameraInterface and DeviceMonitor
+        self.sysfs_root = (config.get('hotplug', {}) or {}).get('sysfs_root', SYSFS_VIDEO_ROOT)
+    
+    def _read_sysfs(self, path):
+        """Read a sysfs attribute, returning None if unavailable"""
+        try:
+            with open(path, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def get_device_identity(self):
+        """
+        Describe the camera device from devfs and sysfs
+        
+        Returns:
+            dict: Device number, name, USB ids, serial and driver (None where unknown)
+        """
+        device = self.config['camera']['device']
+        real_device = os.path.realpath(device)
+        
+        try:
+            rdev = os.stat(real_device).st_rdev
+            dev_number = f"{os.major(rdev)}:{os.minor(rdev)}"
+        except OSError:
+            dev_number = None
+        
+        node = os.path.join(self.sysfs_root, os.path.basename(real_device))
+        device_dir = os.path.realpath(os.path.join(node, 'device'))
+        driver_link = os.path.join(node, 'device', 'driver')
+        
+        # USB attributes live on the parent of the interface directory
+        usb_dir = os.path.dirname(device_dir)
+        
+        return {
+            'device': real_device,
+            'dev_number': dev_number,
+            'name': self._read_sysfs(os.path.join(node, 'name')),
+            'vendor': self._read_sysfs(os.path.join(usb_dir, 'idVendor')),
+            'product': self._read_sysfs(os.path.join(usb_dir, 'idProduct')),
+            'serial': self._read_sysfs(os.path.join(usb_dir, 'serial')),
+            'driver': (
+                os.path.basename(os.path.realpath(driver_link))
+                if os.path.exists(driver_link) else None
+            )
+        }
+    
+    def _config_fingerprint(self):
+        """Hash of every setting that influences how a capture is taken"""
+        relevant = {
+            'camera': self.config.get('camera'),
+            'capture': {'quality': self.config['capture'].get('quality')},
+            'fswebcam': self.config.get('fswebcam')
+        }
+        encoded = json.dumps(relevant, sort_keys=True, default=str).encode()
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def compute_key(self):
+        """
+        Build the cache key for the current device and configuration
+        
+        Returns:
+            str: Hex digest identifying device, driver and config
+        """
+        identity = self.get_device_identity()
+        encoded = json.dumps(
+            {'identity': identity, 'config': self._config_fingerprint()},
+            sort_keys=True
+        ).encode()
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def is_valid(self):
+        """
+        Check whether the cached validation still applies
+        
+        Returns:
+            bool: True if the key matches and the entry hasn't expired
+        """
+        try:
+            with open(self.cache_file, 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return False
+        
+        age = time.time() - cached.get('validated_at', 0)
+        if age < 0 or age > self.max_age:
+            self.logger.debug("Validation cache expired")
+            return False
+        
+        if cached.get('key') != self.compute_key():
+            self.logger.debug("Validation cache stale (device, driver or config changed)")
+            return False
+        
+        return True
+    
+    def store(self):
+        """Record a successful full validation"""
+        entry = {
+            'key': self.compute_key(),
+            'validated_at': time.time(),
+            'identity': self.get_device_identity()
+        }
+        
+        cache_dir = os.path.dirname(self.cache_file)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+        
+        tmp_path = self.cache_file + '.tmp'
+        
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, indent=2)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            self.logger.warning(f"Could not write validation cache: {e}")
+    
+    def invalidate(self):
+        """Forget the cached validation (e.g. after repeated capture failures)"""
+        try:
+            os.remove(self.cache_file)
+        except FileNotFoundError:
+            pass
@@ -1,8 +1,32 @@
 """
 Utilities package for Pi Camera Integration System
+Classes are imported on first access so startup only loads what it uses
 """
 
-from .logger import Logger
-from .file_manager import FileManager
+import importlib
 
-__all__ = ['Logger', 'FileManager']
+_EXPORTS = {
+    'Logger': '.logger',
+    'FileManager': '.file_manager',
+    'FrameCache': '.frame_cache',
+    'validate_jpeg': '.jpeg_validator',
+    'RingStore': '.ring_store',
+    'analyze_logs': '.log_analytics',
+    'SystemClock': '.clock',
+    'VirtualClock': '.clock',
+    'mean_luminance': '.luminance',
+    'frame_statistics': '.luminance',
+    'CaptureCatalog': '.catalog',
+    'EventJournal': '.event_journal',
+    'JournalReader': '.event_journal',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    """Lazily import exported names"""
+    if name in _EXPORTS:
+        module = importlib.import_module(_EXPORTS[name], __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
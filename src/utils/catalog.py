@@ -0,0 +1,286 @@
+"""
+Capture Catalog Module
+Per-frame records (sequence number, name, time, size) in daily JSON-lines segments
+"""
+
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class CaptureCatalog:
+    """
+    Append-only catalog of every stored frame
+    One segment file per day keeps retention a file delete and range queries
+    to the days asked for. Records are buffered and flushed every
+    flush_interval seconds, so a crash loses at most that much of the catalog
+    (never frames). Later changes to a frame (e.g. re-encoding) are appended
+    as update records for the same name.
+    """
+    
+    SEGMENT_FORMAT = '%Y%m%d'
+    BUFFER_SIZE = 64 * 1024
+    
+    def __init__(self, config, logger):
+        """
+        Initialize capture catalog
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+        """
+        self.logger = logger
+        
+        catalog = config.get('catalog', {}) or {}
+        self.directory = catalog.get('dir') or os.path.join(config['files']['log_dir'], 'catalog')
+        self.flush_interval = catalog.get('flush_interval', 1.0)
+        self.retention_days = catalog.get('retention_days') or config['files'].get('max_capture_age_days', 0)
+        
+        os.makedirs(self.directory, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._fh = None
+        self._segment = None
+        self._last_flush = time.monotonic()
+        
+        # Metrics
+        self.added = 0
+        self.updated = 0
+        
+        self.expire()
+        self.last_seq = self._read_last_seq()
+    
+    def _segment_path(self, day):
+        """Segment file for a day string"""
+        return os.path.join(self.directory, f"catalog_{day}.jsonl")
+    
+    @staticmethod
+    def _segment_day(path):
+        """Day string of a segment path"""
+        return os.path.basename(path)[len('catalog_'):-len('.jsonl')]
+    
+    def segments(self):
+        """
+        List segment files, oldest first
+        
+        Returns:
+            list: Segment paths
+        """
+        return sorted(glob.glob(os.path.join(self.directory, 'catalog_*.jsonl')))
+    
+    def expire(self):
+        """
+        Delete segments older than retention_days
+        
+        Returns:
+            int: Segments deleted
+        """
+        if not self.retention_days or self.retention_days <= 0:
+            return 0
+        
+        cutoff = self._segment_path((datetime.now() - timedelta(days=self.retention_days)).strftime(self.SEGMENT_FORMAT))
+        deleted = 0
+        
+        for path in self.segments():
+            if path < cutoff and path != self._segment:
+                os.remove(path)
+                deleted += 1
+        
+        if deleted:
+            self.logger.debug(f"Catalog: removed {deleted} expired segments")
+        return deleted
+    
+    def _read_last_seq(self):
+        """Highest sequence number in the newest segment (read from its tail)"""
+        for path in reversed(self.segments()):
+            with open(path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - self.BUFFER_SIZE))
+                lines = f.read().splitlines()
+            
+            for line in reversed(lines):
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Torn tail or a line cut by the seek
+                    continue
+                if 'seq' in entry:
+                    return entry['seq']
+        return 0
+    
+    def add(self, seq, name, timestamp, size):
+        """
+        Record a stored frame
+        
+        Args:
+            seq: Frame sequence number
+            name: File name
+            timestamp: Capture time (Unix seconds)
+            size: File size in bytes
+        """
+        day = datetime.fromtimestamp(timestamp).strftime(self.SEGMENT_FORMAT)
+        line = json.dumps({'seq': seq, 'name': name, 'time': round(timestamp, 3), 'size': size},
+                          separators=(',', ':'))
+        
+        with self._lock:
+            if day != self._segment:
+                self._roll(day)
+            
+            self._fh.write(line + '\n')
+            self.added += 1
+            self.last_seq = max(self.last_seq, seq)
+            
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._fh.flush()
+                self._last_flush = now
+    
+    def _roll(self, day):
+        """Switch appends to a new day's segment"""
+        if self._fh:
+            self._fh.close()
+        self._segment = day
+        self._fh = open(self._segment_path(day), 'a', buffering=self.BUFFER_SIZE)
+        self.expire()
+    
+    def update(self, filename, timestamp, **fields):
+        """
+        Record a change to a stored frame
+        
+        Args:
+            filename: Current name of the frame
+            timestamp: Original capture time (selects the segment)
+            **fields: Changed fields, e.g. name (renamed), size, tier
+        """
+        day = datetime.fromtimestamp(timestamp).strftime(self.SEGMENT_FORMAT)
+        line = json.dumps({'update': filename, 'time': round(timestamp, 3), **fields}, separators=(',', ':'))
+        
+        with self._lock:
+            if day == self._segment:
+                self._fh.write(line + '\n')
+            else:
+                # Older day: one appended line, no buffer held open
+                with open(self._segment_path(day), 'a') as f:
+                    f.write(line + '\n')
+            self.updated += 1
+    
+    def flush(self):
+        """Write buffered records to the segment file"""
+        with self._lock:
+            if self._fh:
+                self._fh.flush()
+                self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Flush and close the open segment"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+                self._segment = None
+    
+    def read_from(self, cursor=None, limit=10000):
+        """
+        Read records appended after a cursor (for shipping catalog deltas)
+        
+        Args:
+            cursor: (segment day, byte offset) from a previous call, or None
+                    to start at the end of the catalog (no history)
+            limit: Maximum records returned; the cursor stops after the last one
+            
+        Returns:
+            tuple: (records: list of dicts, cursor: (day, offset))
+        """
+        self.flush()
+        
+        segments = self.segments()
+        if not segments:
+            # Anything written later is new
+            return [], cursor or ('', 0)
+        
+        if cursor is None:
+            last = segments[-1]
+            return [], (self._segment_day(last), os.path.getsize(last))
+        
+        day, offset = cursor
+        records = []
+        
+        for path in segments:
+            segment_day = self._segment_day(path)
+            if segment_day < day:
+                continue
+            if segment_day > day:
+                day, offset = segment_day, 0
+            
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        # Record still being written
+                        break
+                    offset += len(line)
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+                    if len(records) >= limit:
+                        return records, (day, offset)
+        
+        return records, (day, offset)
+    
+    def entries(self, since=None, until=None):
+        """
+        Read frames captured in a time range, with updates applied
+        
+        Args:
+            since: Start (Unix seconds), None for the oldest segment
+            until: End (Unix seconds), None for now
+            
+        Returns:
+            list: Entry dicts (seq, name, time, size and any updated fields), in sequence order
+        """
+        self.flush()
+        
+        first = self._segment_path(datetime.fromtimestamp(since).strftime(self.SEGMENT_FORMAT)) if since else ''
+        last = self._segment_path(datetime.fromtimestamp(until).strftime(self.SEGMENT_FORMAT)) if until else None
+        
+        frames = {}
+        for path in self.segments():
+            if path < first or (last and path > last):
+                continue
+            
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    
+                    if (since and entry['time'] < since) or (until and entry['time'] >= until):
+                        continue
+                    
+                    if 'update' in entry:
+                        frame = frames.pop(entry.pop('update'), None)
+                        if frame:
+                            frame.update(entry)
+                            frames[frame['name']] = frame
+                    else:
+                        frames[entry['name']] = entry
+        
+        return sorted(frames.values(), key=lambda entry: entry['seq'])
+    
+    def get_stats(self):
+        """
+        Get catalog statistics
+        
+        Returns:
+            dict: Records written this run and the last sequence number
+        """
+        return {
+            'catalog_added': self.added,
+            'catalog_updated': self.updated,
+            'catalog_last_seq': self.last_seq
+        }
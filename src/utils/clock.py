@@ -0,0 +1,120 @@
+"""
+Clock Module
+Time source shared by the capture loop, health checks and file management
+"""
+
+import os
+import threading
+import time
+from datetime import datetime
+
+
+class SystemClock:
+    """
+    Real time: thin wrappers over time, datetime and threading
+    Components take a clock instead of calling these directly so that a
+    VirtualClock can stand in for soak tests
+    """
+    
+    def time(self):
+        """Wall-clock Unix time"""
+        return time.time()
+    
+    def monotonic(self):
+        """Monotonic seconds for measuring intervals"""
+        return time.monotonic()
+    
+    def now(self):
+        """Local datetime"""
+        return datetime.now()
+    
+    def sleep(self, seconds):
+        """Block for a number of seconds"""
+        if seconds > 0:
+            time.sleep(seconds)
+    
+    def wait(self, event, timeout):
+        """
+        Wait for an event or a timeout
+        
+        Args:
+            event: threading.Event
+            timeout: Seconds
+            
+        Returns:
+            bool: True if the event was set
+        """
+        return event.wait(timeout)
+    
+    def stamp(self, path):
+        """Give a file this clock's modification time (no-op in real time)"""
+        pass
+
+
+class VirtualClock(SystemClock):
+    """
+    Simulated time that only moves when something sleeps or waits
+    A day of 10-second captures runs as fast as the loop itself; file mtimes
+    are set to simulated time so age-based retention sees the simulated days
+    """
+    
+    def __init__(self, start=None, on_advance=None):
+        """
+        Initialize virtual clock
+        
+        Args:
+            start: Unix time the simulation starts at (default: now)
+            on_advance: Optional callback(clock) after every advance (lets a
+                        runner sample metrics or stop the simulation)
+        """
+        self._start = time.time() if start is None else start
+        self._now = self._start
+        self._lock = threading.Lock()
+        self.on_advance = on_advance
+    
+    def time(self):
+        """Simulated Unix time"""
+        return self._now
+    
+    def monotonic(self):
+        """Simulated seconds since the clock started"""
+        return self._now - self._start
+    
+    def now(self):
+        """Simulated local datetime"""
+        return datetime.fromtimestamp(self._now)
+    
+    def advance(self, seconds):
+        """
+        Move simulated time forward
+        
+        Args:
+            seconds: Seconds to skip (negative values are ignored)
+        """
+        if seconds > 0:
+            with self._lock:
+                self._now += seconds
+        
+        if self.on_advance:
+            self.on_advance(self)
+    
+    def sleep(self, seconds):
+        """Skip ahead instead of blocking"""
+        self.advance(seconds)
+    
+    def wait(self, event, timeout):
+        """
+        Return at once if the event is set, otherwise skip the whole timeout
+        
+        Returns:
+            bool: True if the event was set
+        """
+        if event.is_set():
+            return True
+        
+        self.advance(timeout if timeout is not None else 0)
+        return event.is_set()
+    
+    def stamp(self, path):
+        """Set a file's mtime to simulated time"""
+        os.utime(path, (self._now, self._now))
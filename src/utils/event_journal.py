@@ -0,0 +1,336 @@
+"""
+Event Journal Module
+Compact append-only binary journal of capture attempts
+"""
+
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from collections import namedtuple
+
+
+JournalEvent = namedtuple('JournalEvent', ['timestamp', 'seq', 'size', 'latency', 'outcome', 'attempt', 'error'])
+
+OUTCOMES = ('ok', 'failed', 'bad_frame', 'missed')
+
+# Error codes; index 0 is "no error". Append only: codes are stored on disk.
+ERRORS = ('', 'timeout', 'exit', 'busy', 'device', 'missing_file', 'empty_file', 'corrupt',
+          'blank', 'underexposed', 'overexposed', 'exception', 'breaker_open')
+
+# Checked in order against an attempt's error message
+ERROR_PATTERNS = [
+    (re.compile(r'^File verification failed: file not found'), 'missing_file'),
+    (re.compile(r'^File verification failed: empty file'), 'empty_file'),
+    (re.compile(r'^File verification failed'), 'corrupt'),
+    (re.compile(r'timeout|timed out|No stream frame', re.IGNORECASE), 'timeout'),
+    (re.compile(r'resource busy|device busy', re.IGNORECASE), 'busy'),
+    (re.compile(r'No such (file or )?device|not found|open(ing)? device|Unable to open', re.IGNORECASE), 'device'),
+    (re.compile(r'exception', re.IGNORECASE), 'exception'),
+]
+
+
+def error_code(error):
+    """
+    Map an error message (or quality verdict / error name) to its code
+    
+    Args:
+        error: Error message, an ERRORS name, or None
+        
+    Returns:
+        int: Index into ERRORS (an unrecognized message counts as a camera exit)
+    """
+    if not error:
+        return 0
+    if error in ERRORS:
+        return ERRORS.index(error)
+    
+    for pattern, name in ERROR_PATTERNS:
+        if pattern.search(error):
+            return ERRORS.index(name)
+    return ERRORS.index('exit')
+
+
+def event_to_dict(event):
+    """
+    Plain dict of a journal event (for JSON lines)
+    
+    Args:
+        event: JournalEvent
+        
+    Returns:
+        dict: Event fields; error is omitted when there was none
+    """
+    record = {
+        'time': round(event.timestamp, 3),
+        'outcome': event.outcome,
+        'attempt': event.attempt,
+        'latency': round(event.latency, 3),
+        'size': event.size,
+        'seq': event.seq
+    }
+    if event.error:
+        record['error'] = event.error
+    return record
+
+
+class _Format:
+    """On-disk layout shared by writer and reader"""
+    
+    MAGIC = b'PCEJ'
+    VERSION = 1
+    
+    # magic, version, record size
+    HEADER = struct.Struct('<4sHH')
+    # timestamp, seq, size, latency, outcome, attempt, error code
+    RECORD = struct.Struct('<dIIfBBH')
+    
+    @classmethod
+    def check_header(cls, data, path):
+        """
+        Raises:
+            ValueError: If data does not start a journal of this version
+        """
+        magic, version, record_size = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version != cls.VERSION or record_size != cls.RECORD.size:
+            raise ValueError(f"{path} is not a version {cls.VERSION} event journal")
+
+
+class EventJournal:
+    """
+    Appends one fixed-size record (24 bytes) per capture attempt
+    
+    Records are packed into the file's write buffer and flushed every
+    flush_interval, so an attempt costs a struct pack and a memory copy.
+    A crash can lose the unflushed records and leave a partial record at
+    the end; the partial record is cut off when the journal is next opened.
+    """
+    
+    BUFFER_SIZE = 64 * 1024
+    
+    def __init__(self, config, logger):
+        """
+        Initialize event journal
+        
+        Args:
+            config: Configuration dictionary
+            logger: Logger instance
+            
+        Raises:
+            ValueError: If the journal file exists but is not an event journal
+        """
+        self.config = config
+        self.logger = logger
+        
+        journal = config.get('event_journal', {}) or {}
+        self.path = journal.get('path') or os.path.join(config['files']['log_dir'], 'capture_events.bin')
+        self.flush_interval = journal.get('flush_interval', 5.0)
+        self.log_successes = journal.get('log_successes', True)
+        
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        
+        # Metrics
+        self.written = 0
+        
+        self._fh = self._open()
+    
+    def _open(self):
+        """Open for appending, writing the header or cutting a torn tail"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        
+        header_size = _Format.HEADER.size
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        
+        if size < header_size:
+            with open(self.path, 'wb') as f:
+                f.write(_Format.HEADER.pack(_Format.MAGIC, _Format.VERSION, _Format.RECORD.size))
+        else:
+            with open(self.path, 'r+b') as f:
+                _Format.check_header(f.read(header_size), self.path)
+                
+                torn = (size - header_size) % _Format.RECORD.size
+                if torn:
+                    f.truncate(size - torn)
+                    self.logger.warning(f"Event journal: cut {torn} bytes of a partial record")
+        
+        return open(self.path, 'ab', buffering=self.BUFFER_SIZE)
+    
+    def record(self, outcome, attempt, latency, size=0, error=None, seq=0, timestamp=None):
+        """
+        Append one capture attempt
+        
+        Args:
+            outcome: One of OUTCOMES
+            attempt: Attempt number within the capture
+            latency: Seconds the attempt took
+            size: Stored file size in bytes (successful attempts)
+            error: Error message, quality verdict or ERRORS name (None for success)
+            seq: Frame sequence number
+            timestamp: Attempt time (Unix seconds, default now)
+        """
+        data = _Format.RECORD.pack(
+            time.time() if timestamp is None else timestamp,
+            seq & 0xFFFFFFFF,
+            min(size, 0xFFFFFFFF),
+            latency,
+            OUTCOMES.index(outcome),
+            min(attempt, 255),
+            error_code(error)
+        )
+        
+        with self._lock:
+            if self._fh is None:
+                return
+            self._fh.write(data)
+            self.written += 1
+            
+            now = time.monotonic()
+            if now - self._last_flush >= self.flush_interval:
+                self._fh.flush()
+                self._last_flush = now
+    
+    def flush(self):
+        """Write buffered records to the journal file"""
+        with self._lock:
+            if self._fh:
+                self._fh.flush()
+                self._last_flush = time.monotonic()
+    
+    def close(self):
+        """Flush and close the journal"""
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+    
+    def get_stats(self):
+        """
+        Get journal statistics
+        
+        Returns:
+            dict: Records written this run and journal size
+        """
+        return {
+            'journal_records': self.written,
+            'journal_kb': round(os.path.getsize(self.path) / 1024, 1)
+        }
+
+
+class JournalReader:
+    """
+    Random access to an event journal through a read-only memory map
+    
+    Records are appended in time order, so a time range is found by
+    binary search. A backwards clock step breaks the order locally; the
+    search then lands at one of the matching positions rather than the first.
+    """
+    
+    def __init__(self, path):
+        """
+        Open a journal for reading (records written after this are not seen)
+        
+        Args:
+            path: Journal file path
+            
+        Raises:
+            ValueError: If the file is not an event journal
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        self._map = None
+        
+        size = os.fstat(self._file.fileno()).st_size
+        if size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        if size < _Format.HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not an event journal")
+        _Format.check_header(self._map, path)
+        
+        # A partial trailing record (writer crashed mid-record) is ignored
+        self.count = (size - _Format.HEADER.size) // _Format.RECORD.size
+    
+    def __len__(self):
+        return self.count
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """Release the map and file"""
+        if self._map:
+            self._map.close()
+            self._map = None
+        self._file.close()
+    
+    def _timestamp(self, index):
+        """Timestamp of a record (reads only its first field)"""
+        return struct.unpack_from('<d', self._map, _Format.HEADER.size + index * _Format.RECORD.size)[0]
+    
+    def __getitem__(self, index):
+        """
+        Decode one record
+        
+        Args:
+            index: Record number (negative counts from the end)
+            
+        Returns:
+            JournalEvent: Outcome and error as names
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        
+        timestamp, seq, size, latency, outcome, attempt, error = _Format.RECORD.unpack_from(
+            self._map, _Format.HEADER.size + index * _Format.RECORD.size
+        )
+        return JournalEvent(
+            timestamp, seq, size, latency,
+            OUTCOMES[outcome] if outcome < len(OUTCOMES) else str(outcome),
+            attempt,
+            ERRORS[error] if error < len(ERRORS) else str(error)
+        )
+    
+    def bisect(self, timestamp):
+        """
+        Index of the first record at or after a time
+        
+        Args:
+            timestamp: Unix seconds
+            
+        Returns:
+            int: Record index (len(self) if every record is earlier)
+        """
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._timestamp(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def events(self, since=None, until=None):
+        """
+        Iterate events in a time range
+        
+        Args:
+            since: Start (Unix seconds, inclusive) or None
+            until: End (Unix seconds, exclusive) or None
+            
+        Yields:
+            JournalEvent: Events in file order
+        """
+        start = self.bisect(since) if since is not None else 0
+        end = self.bisect(until) if until is not None else self.count
+        
+        for index in range(start, end):
+            yield self[index]
@@ -8,28 +8,98 @@ import shutil
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from .clock import SystemClock
+from .jpeg_validator import validate_jpeg
+
 
 class FileManager:
     """
     Manages capture directory, file naming, and cleanup operations
     """
     
-    def __init__(self, config, logger):
+    # Captures and their derived renditions
+    IMAGE_PATTERNS = ('*.jpg', '*.jpeg', '*.webp', '*.png')
+    
+    # Default names in high-rate mode (milliseconds and sequence number)
+    HIGH_RATE_PATTERN = 'img_%Y%m%d_%H%M%S_{ms}_{seq}'
+    
+    def __init__(self, config, logger, clock=None):
         """
         Initialize file manager
         
         Args:
             config: Configuration dictionary
             logger: Logger instance
+            clock: Optional time source (default: SystemClock)
         """
         self.config = config
         self.logger = logger
+        self.clock = clock or SystemClock()
+        self.ring = None
+        
+        # Frame sequence number (continued from the catalog when there is one)
+        self.seq = 0
+        self._last_name = None
+        self.collisions = 0
+        
+        self.apply_config(config)
+    
+    def apply_config(self, config):
+        """
+        Load file settings (called at init and on live config reload)
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
         self.capture_dir = config['files']['capture_dir']
         self.filename_pattern = config['files']['filename_pattern']
+        self.cleanup_interval = config['files'].get('cleanup_interval', 0)
+        
+        # Many frames per second: sub-second names, cleanup by time not count
+        high_rate = config.get('high_rate', {}) or {}
+        if high_rate.get('enabled', False):
+            self.filename_pattern = high_rate.get('filename_pattern') or self.HIGH_RATE_PATTERN
+            self.cleanup_interval = self.cleanup_interval or 60
         self.max_age_days = config['files']['max_capture_age_days']
+        self.verify_jpeg = config['files'].get('verify_jpeg', True)
+        self.storage = config['files'].get('storage', 'files')
         
         # Ensure capture directory exists
         self._ensure_directories()
+        
+        self._open_storage()
+    
+    def _open_storage(self):
+        """Open the ring store when ring storage is configured"""
+        if self.storage != 'ring':
+            self.close()
+            return
+        
+        ring = self.config['files'].get('ring', {}) or {}
+        path = ring.get('path') or os.path.join(self.capture_dir, 'frames.ring')
+        slots = ring.get('slots', 1000)
+        slot_size = int(ring.get('slot_size_kb', 1024) * 1024)
+        sync = ring.get('sync', False)
+        
+        if self.ring and (self.ring.path, self.ring.slots, self.ring.slot_size) == (path, slots, slot_size):
+            self.ring.sync = sync
+            return
+        
+        from .ring_store import RingStore
+        
+        self.close()
+        self.ring = RingStore(path, slots, slot_size, sync=sync)
+        self.logger.info(
+            f"Ring storage: {path} ({slots} frames x {slot_size // 1024} KB, "
+            f"head seq {self.ring.head_seq})"
+        )
+    
+    def close(self):
+        """Release the ring store (no-op for file storage)"""
+        if self.ring:
+            self.ring.close()
+            self.ring = None
     
     def _ensure_directories(self):
         """Create required directories if they don't exist"""
@@ -39,6 +109,10 @@ class FileManager:
     def generate_filename(self, extension='jpg'):
         """
         Generate timestamped filename for capture
+        Besides strftime codes the pattern may use {ms} (milliseconds) and
+        {seq} (frame sequence number). A name that would repeat the previous
+        one (sub-second intervals with a one-second pattern) gets _<seq>
+        appended instead of overwriting that frame.
         
         Args:
             extension: File extension (default: jpg)
@@ -46,32 +120,94 @@ class FileManager:
         Returns:
             str: Full path to output file
         """
-        timestamp = datetime.now()
-        filename = timestamp.strftime(self.filename_pattern) + f".{extension}"
-        filepath = os.path.join(self.capture_dir, filename)
-        return filepath
+        timestamp = self.clock.now()
+        self.seq += 1
+        
+        stem = timestamp.strftime(self.filename_pattern)
+        if '{' in stem:
+            stem = stem.format(ms=f"{timestamp.microsecond // 1000:03d}", seq=f"{self.seq:06d}")
+        
+        path = os.path.join(self.capture_dir, f"{stem}.{extension}")
+        if stem == self._last_name or (self._last_name is None and os.path.exists(path)):
+            self.collisions += 1
+            path = os.path.join(self.capture_dir, f"{stem}_{self.seq:06d}.{extension}")
+        
+        self._last_name = stem
+        return path
     
     def verify_file_exists(self, filepath):
         """
-        Verify that a file was created and is not empty
+        Verify that a file was created and is a structurally complete image
+        
+        Args:
+            filepath: Path to file to verify
+            
+        Returns:
+            bool: True if file exists and passes verification
+        """
+        return self.verify_capture(filepath)[0]
+    
+    def verify_capture(self, filepath):
+        """
+        Verify a captured file
+        JPEGs get a marker-structure check (catches truncated or corrupt
+        transfers without decoding); other files only need content
         
         Args:
             filepath: Path to file to verify
             
         Returns:
-            bool: True if file exists and has content
+            tuple: (valid: bool, reason: str or None)
         """
         if not os.path.exists(filepath):
             self.logger.error(f"File not found: {filepath}")
-            return False
+            return (False, "file not found")
         
         file_size = os.path.getsize(filepath)
         if file_size == 0:
             self.logger.error(f"File is empty: {filepath}")
-            return False
+            return (False, "empty file")
+        
+        if self.verify_jpeg and filepath.lower().endswith(('.jpg', '.jpeg')):
+            valid, reason = validate_jpeg(filepath)
+            if not valid:
+                self.logger.error(f"Corrupt JPEG ({reason}): {filepath}")
+                return (False, reason)
         
         self.logger.debug(f"File verified: {filepath} ({file_size} bytes)")
-        return True
+        return (True, None)
+    
+    def store_capture(self, filepath):
+        """
+        Hand a verified capture to the storage engine
+        With ring storage the frame is appended to the ring and the file removed;
+        it never outlives the capture tick, so no per-frame file reaches disk
+        
+        Args:
+            filepath: Path of the verified capture
+            
+        Returns:
+            str: Path if the capture remains a file, None if it moved into the ring
+        """
+        # Age-based cleanup and the ring timestamp both go by the file's mtime
+        self.clock.stamp(filepath)
+        
+        if not self.ring:
+            return filepath
+        
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+            
+            seq = self.ring.append(data, os.path.basename(filepath), os.path.getmtime(filepath))
+            os.remove(filepath)
+        
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Ring append failed, keeping file {filepath}: {e}")
+            return filepath
+        
+        self.logger.debug(f"Stored {os.path.basename(filepath)} in ring (seq {seq})")
+        return None
     
     def cleanup_old_captures(self):
         """
@@ -83,11 +219,13 @@ class FileManager:
         if self.max_age_days <= 0:
             return 0
         
-        cutoff_date = datetime.now() - timedelta(days=self.max_age_days)
+        # The ring overwrites its oldest frame; only stray files are aged out
+        
+        cutoff_date = self.clock.now() - timedelta(days=self.max_age_days)
         deleted_count = 0
         
         try:
-            for filepath in Path(self.capture_dir).glob('*.jpg'):
+            for filepath in self._list_images():
                 file_mtime = datetime.fromtimestamp(filepath.stat().st_mtime)
                 
                 if file_mtime < cutoff_date:
@@ -110,7 +248,20 @@ class FileManager:
         Returns:
             dict: Statistics including count, total size, oldest/newest
         """
-        captures = list(Path(self.capture_dir).glob('*.jpg'))
+        if self.ring:
+            entries = self.ring.entries()
+            
+            if not entries:
+                return {'count': 0, 'total_size_mb': 0, 'oldest': None, 'newest': None}
+            
+            return {
+                'count': len(entries),
+                'total_size_mb': round(sum(e.length for e in entries) / (1024 * 1024), 2),
+                'oldest': datetime.fromtimestamp(entries[0].timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+                'newest': datetime.fromtimestamp(entries[-1].timestamp).strftime('%Y-%m-%d %H:%M:%S')
+            }
+        
+        captures = self._list_images()
         
         if not captures:
             return {
@@ -141,7 +292,7 @@ class FileManager:
             str: Path to created archive or None on failure
         """
         if archive_name is None:
-            archive_name = f"captures_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+            archive_name = f"captures_{self.clock.now().strftime('%Y%m%d_%H%M%S')}"
         
         try:
             archive_path = shutil.make_archive(
@@ -177,6 +328,16 @@ class FileManager:
             self.logger.error(f"Failed to delete {filepath}: {e}")
             return False
     
+    def _list_images(self):
+        """
+        List image files in the capture directory
+        
+        Returns:
+            list: Path objects for captures and renditions
+        """
+        directory = Path(self.capture_dir)
+        return [path for pattern in self.IMAGE_PATTERNS for path in directory.glob(pattern)]
+    
     def _get_filename(self, filepath):
         """
         Extract filename from full path
@@ -0,0 +1,122 @@
+"""
+Frame Cache Module
+Keeps the most recent captured frames in memory
+"""
+
+import threading
+import time
+import zlib
+from collections import deque, namedtuple
+
+
+CachedFrame = namedtuple('CachedFrame', ['seq', 'timestamp', 'name', 'data', 'etag'])
+
+
+class FrameCache:
+    """
+    Bounded in-memory cache of the latest frames
+    Entries are immutable so readers can hold them without locking
+    """
+    
+    def __init__(self, max_frames=3):
+        """
+        Initialize frame cache
+        
+        Args:
+            max_frames: Number of recent frames to keep
+        """
+        self.max_frames = max(1, max_frames)
+        self._frames = deque(maxlen=self.max_frames)
+        self._lock = threading.Lock()
+        self._seq = 0
+    
+    def put(self, data, name=None, timestamp=None):
+        """
+        Add a frame, evicting the oldest one if the cache is full
+        
+        Args:
+            data: JPEG bytes
+            name: Optional filename the frame was saved as
+            timestamp: Capture time (defaults to now)
+            
+        Returns:
+            CachedFrame: The cached entry
+        """
+        # Content-based tag so it stays valid across restarts
+        etag = f'"{zlib.crc32(data):08x}-{len(data):x}"'
+        
+        with self._lock:
+            self._seq += 1
+            frame = CachedFrame(
+                self._seq,
+                timestamp if timestamp is not None else time.time(),
+                name,
+                data,
+                etag
+            )
+            self._frames.append(frame)
+        
+        return frame
+    
+    def put_file(self, filepath, name=None):
+        """
+        Cache a frame that was just written to disk
+        
+        Args:
+            filepath: Path to the image file
+            name: Optional name (defaults to the file path)
+            
+        Returns:
+            CachedFrame: The cached entry or None if the file couldn't be read
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        
+        return self.put(data, name or filepath)
+    
+    def latest(self):
+        """
+        Get the newest frame
+        
+        Returns:
+            CachedFrame: Newest entry or None if empty
+        """
+        with self._lock:
+            return self._frames[-1] if self._frames else None
+    
+    def get(self, index=0):
+        """
+        Get a recent frame by age
+        
+        Args:
+            index: 0 for the newest frame, 1 for the one before, ...
+            
+        Returns:
+            CachedFrame: Entry or None if out of range
+        """
+        with self._lock:
+            if 0 <= index < len(self._frames):
+                return self._frames[-1 - index]
+        return None
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._frames)
+    
+    def get_stats(self):
+        """
+        Get cache statistics
+        
+        Returns:
+            dict: Frame count, bytes held and newest sequence number
+        """
+        with self._lock:
+            return {
+                'frames': len(self._frames),
+                'max_frames': self.max_frames,
+                'cached_kb': round(sum(len(f.data) for f in self._frames) / 1024, 1),
+                'seq': self._seq
+            }
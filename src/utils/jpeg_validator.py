@@ -0,0 +1,151 @@
+"""
+JPEG Validator Module
+Structural JPEG integrity check (markers and segment lengths, no decoding)
+"""
+
+import mmap
+import os
+
+
+SOI = b'\xff\xd8'
+EOI = b'\xff\xd9'
+
+SOS = 0xDA
+EOI_MARKER = 0xD9
+
+# Markers without a length field (RSTn, TEM)
+STANDALONE = frozenset(range(0xD0, 0xD8)) | {0x01}
+
+# Start-of-frame markers (C4 DHT, C8 JPG and CC DAC share the range but are not frames)
+SOF = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Some encoders pad the file after EOI; more than this is treated as garbage
+MAX_TRAILING_BYTES = 1024
+
+
+def check_jpeg(data):
+    """
+    Walk the marker structure of a JPEG buffer
+    Checks SOI, every header segment length up to SOS, a frame header,
+    and a trailing EOI after the scan data
+    
+    Args:
+        data: bytes, bytearray or mmap of the whole file
+        
+    Returns:
+        tuple: (valid: bool, reason: str or None)
+    """
+    size = len(data)
+    
+    if size < 4 or data[0:2] != SOI:
+        return (False, "missing SOI")
+    
+    pos = 2
+    seen_frame = False
+    
+    while True:
+        if pos + 2 > size:
+            return (False, "truncated before SOS")
+        
+        if data[pos] != 0xFF:
+            return (False, f"expected marker at offset {pos}")
+        
+        marker = data[pos + 1]
+        
+        # 0xFF fill bytes may precede a marker
+        if marker == 0xFF:
+            pos += 1
+            continue
+        
+        if marker in STANDALONE:
+            pos += 2
+            continue
+        
+        if marker == EOI_MARKER:
+            return (False, "EOI before SOS")
+        
+        if pos + 4 > size:
+            return (False, "truncated segment header")
+        
+        length = (data[pos + 2] << 8) | data[pos + 3]
+        if length < 2:
+            return (False, f"invalid segment length at offset {pos}")
+        
+        end = pos + 2 + length
+        if end > size:
+            return (False, f"segment 0x{marker:02X} truncated")
+        
+        if marker in SOF:
+            seen_frame = True
+        
+        if marker == SOS:
+            if not seen_frame:
+                return (False, "SOS without frame header")
+            break
+        
+        pos = end
+    
+    # Entropy-coded data runs to EOI; a cut-off transfer loses the tail
+    eoi = data.rfind(EOI, end)
+    if eoi < 0:
+        return (False, "missing EOI")
+    
+    if size - (eoi + 2) > MAX_TRAILING_BYTES:
+        return (False, "data after EOI")
+    
+    return (True, None)
+
+
+def validate_jpeg(filepath):
+    """
+    Validate a JPEG file without decoding it
+    The file is memory-mapped so only the header pages and the tail are read
+    
+    Args:
+        filepath: Path to the file
+        
+    Returns:
+        tuple: (valid: bool, reason: str or None)
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return (False, "empty file")
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return check_jpeg(data)
+    
+    except OSError as e:
+        return (False, f"unreadable: {e.strerror or e}")
+
+
+def _validate_entry(filepath):
+    """Worker entry point for audit_files (module level so it can be pickled)"""
+    valid, reason = validate_jpeg(filepath)
+    return (filepath, valid, reason)
+
+
+def audit_files(paths, workers=None, chunksize=64):
+    """
+    Validate many files in parallel worker processes
+    
+    Args:
+        paths: Iterable of file paths
+        workers: Number of processes (default: CPU count)
+        chunksize: Files handed to a worker at a time
+        
+    Yields:
+        tuple: (path: str, valid: bool, reason: str or None), in input order
+    """
+    workers = workers or os.cpu_count() or 1
+    
+    if workers == 1:
+        for path in paths:
+            yield _validate_entry(path)
+        return
+    
+    # Deferred: multiprocessing pulls in subprocess, and every capture imports this module
+    from concurrent.futures import ProcessPoolExecutor
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_validate_entry, paths, chunksize=chunksize)
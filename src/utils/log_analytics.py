@@ -0,0 +1,318 @@
+"""
+Log Analytics Module
+Aggregates capture outcomes from current, rotated and compressed capture logs
+"""
+
+import bz2
+import functools
+import glob
+import gzip
+import lzma
+import mmap
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+
+# Successes are nearly every line, so they are counted without per-match
+# Python work: findall yields (bucket, attempts) tuples and Counter tallies them.
+# Timestamps stay bytes; ISO order means prefixes bucket and compare without
+# parsing dates.
+SUCCESS_TEMPLATE = rb'\[(.{%d}).{%d}\] \[INFO\] SUCCESS: Captured [^\s]+(?: \(after (\d+) attempts\))?'
+
+# First success at or after a position (closes a disconnect window)
+FIRST_SUCCESS = re.compile(rb'\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] \[INFO\] SUCCESS: Captured ')
+
+# Everything else is rare. The pattern leads with literals so the scanner
+# skips ordinary lines quickly (a capture group in the top-level alternation
+# would defeat that); the timestamp is read back from the line start.
+EVENT_PATTERN = re.compile(
+    rb'Ca(?:pture failed: (.*?)\. Retry (\d+)/(\d+)'
+    rb'|mera (?:(removed), capture paused|reconnected successfully|reattached, resuming capture))'
+    rb'|CRITICAL: Camera disconnected!'
+)
+
+STAMP_SIZE = 19
+
+# Collapses variable parts of failure messages so identical causes group together
+REASON_NOISE = [
+    (re.compile(r'(?:/[\w.\-]+)+'), '<path>'),
+    (re.compile(r'\d+(?:\.\d+)?'), 'N'),
+]
+
+BUCKETS = {'minute': 16, 'hour': 13, 'day': 10}
+
+COMPRESSED = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+# Compressed logs are decompressed in chunks of this many bytes (memory stays bounded)
+CHUNK_SIZE = 4 * 1024 * 1024
+
+
+def find_logs(log_dir, log_file):
+    """
+    Find the current log and its rotations (plain or compressed)
+    
+    Args:
+        log_dir: Log directory
+        log_file: Base log file name
+        
+    Returns:
+        list: Paths, largest first (so the slowest files start first)
+    """
+    base = os.path.join(log_dir, log_file)
+    paths = [p for p in glob.glob(glob.escape(base) + '*') if os.path.isfile(p)]
+    return sorted(paths, key=os.path.getsize, reverse=True)
+
+
+def normalize_reason(reason):
+    """Strip paths and numbers from a failure message"""
+    for pattern, replacement in REASON_NOISE:
+        reason = pattern.sub(replacement, reason)
+    return reason.strip()
+
+
+@functools.lru_cache(maxsize=None)
+def _success_pattern(prefix):
+    """Success pattern capturing the first `prefix` timestamp characters"""
+    return re.compile(SUCCESS_TEMPLATE % (prefix, STAMP_SIZE - prefix))
+
+
+def _line_stamp(buffer, line):
+    """Timestamp bytes of the line starting at offset `line`"""
+    return buffer[line + 1:line + 1 + STAMP_SIZE]
+
+
+def _first_line_from(buffer, stamp, lo, hi):
+    """
+    Binary search for the first line in [lo, hi) stamped at or after `stamp`
+    Relies on each log being appended in time order
+    """
+    while lo < hi:
+        line = buffer.rfind(b'\n', lo, (lo + hi) // 2) + 1 or lo
+        if _line_stamp(buffer, line) < stamp:
+            lo = buffer.find(b'\n', line, hi) + 1 or hi
+        else:
+            hi = line
+    return lo
+
+
+def _scan_buffer(buffer, result, prefix, since, until):
+    """Accumulate events from one in-memory or mapped buffer into result"""
+    timeline = result['timeline']
+    retries = result['retries']
+    reasons = result['reasons']
+    events = result['connection_events']
+    
+    # Restrict the scan to the requested time range instead of testing every line
+    start, end = 0, len(buffer)
+    if since:
+        start = _first_line_from(buffer, since, start, end)
+    if until:
+        # Any stamp extending `until` sorts after it but before the next value
+        end = _first_line_from(buffer, until + b'\xff', start, end)
+    if start >= end:
+        return
+    
+    for (bucket, attempts), count in Counter(_success_pattern(prefix).findall(buffer, start, end)).items():
+        timeline[bucket][0] += count
+        retries[int(attempts or 1)] += count
+    
+    # Only the first "connected" event after a disconnect (or at the start of
+    # the file, which may continue a window from an older rotation) matters.
+    # A success ends a window too; it is looked up only while one is open.
+    awaiting = result['awaiting_connect']
+    success = FIRST_SUCCESS.search(buffer, start, end) if awaiting else None
+    
+    for match in EVENT_PATTERN.finditer(buffer, start, end):
+        if success and success.start() < match.start():
+            events.append((success.group(1), 1))
+            awaiting, success = False, None
+        
+        stamp = _line_stamp(buffer, buffer.rfind(b'\n', 0, match.start()) + 1)
+        
+        if match.group(1) is not None:
+            attempt, attempts = int(match.group(2)), int(match.group(3))
+            reasons[match.group(1)] += 1
+            if attempt >= attempts:
+                # Last retry failed: the capture as a whole failed
+                timeline[stamp[:prefix]][1] += 1
+                retries['failed'] += 1
+        
+        elif match.group(4) or match.group(0).startswith(b'CRITICAL'):
+            events.append((stamp, 0))
+            awaiting = True
+            success = FIRST_SUCCESS.search(buffer, match.end(), end)
+        
+        elif awaiting:
+            events.append((stamp, 1))
+            awaiting, success = False, None
+    
+    if success:
+        events.append((success.group(1), 1))
+        awaiting = False
+    
+    result['awaiting_connect'] = awaiting
+
+
+def analyze_file(path, bucket='hour', since=None, until=None):
+    """
+    Aggregate one log file
+    Plain files are memory-mapped and scanned in place; compressed files are
+    decompressed in chunks split at line boundaries
+    
+    Args:
+        path: Log file path
+        bucket: Timeline resolution ('minute', 'hour' or 'day')
+        since: Optional 'YYYY-MM-DD HH:MM:SS' lower bound
+        until: Optional 'YYYY-MM-DD HH:MM:SS' upper bound
+        
+    Returns:
+        dict: Partial aggregates (merge with merge_results)
+    """
+    prefix = BUCKETS[bucket]
+    since = since.encode() if since else None
+    until = until.encode() if until else None
+    
+    result = {
+        'files': [path],
+        'bytes': os.path.getsize(path),
+        'timeline': defaultdict(lambda: [0, 0]),
+        'retries': Counter(),
+        'reasons': Counter(),
+        'connection_events': [],
+        'awaiting_connect': True
+    }
+    
+    opener = COMPRESSED.get(os.path.splitext(path)[1])
+    
+    if opener:
+        with opener(path, 'rb') as f:
+            tail = b''
+            while True:
+                chunk = f.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunk = tail + chunk
+                cut = chunk.rfind(b'\n') + 1
+                tail = chunk[cut:]
+                _scan_buffer(chunk[:cut], result, prefix, since, until)
+            if tail:
+                _scan_buffer(tail, result, prefix, since, until)
+    
+    elif result['bytes']:
+        with open(path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                _scan_buffer(buffer, result, prefix, since, until)
+    
+    # Plain types only, so results cross the process boundary cheaply
+    result['timeline'] = {k.decode(): tuple(v) for k, v in result['timeline'].items()}
+    result['reasons'] = {
+        k.decode('utf-8', 'replace'): v for k, v in result['reasons'].items()
+    }
+    result['retries'] = dict(result['retries'])
+    result['connection_events'] = [(k.decode(), v) for k, v in result['connection_events']]
+    del result['awaiting_connect']
+    return result
+
+
+def merge_results(parts):
+    """
+    Combine per-file aggregates into a report
+    
+    Args:
+        parts: Iterable of analyze_file results
+        
+    Returns:
+        dict: timeline, totals, failure_reasons, retry_distribution, disconnect_windows
+    """
+    timeline = {}
+    retries = Counter()
+    raw_reasons = Counter()
+    events = []
+    files = []
+    total_bytes = 0
+    
+    for part in parts:
+        files.extend(part['files'])
+        total_bytes += part['bytes']
+        for key, (ok, failed) in part['timeline'].items():
+            current = timeline.get(key, (0, 0))
+            timeline[key] = (current[0] + ok, current[1] + failed)
+        retries.update(part['retries'])
+        raw_reasons.update(part['reasons'])
+        events.extend(part['connection_events'])
+    
+    reasons = Counter()
+    for reason, count in raw_reasons.items():
+        reasons[normalize_reason(reason)] += count
+    
+    successful = sum(ok for ok, _ in timeline.values())
+    failed = sum(bad for _, bad in timeline.values())
+    
+    return {
+        'files': files,
+        'bytes': total_bytes,
+        'totals': {
+            'captures': successful + failed,
+            'successful': successful,
+            'failed': failed,
+            'success_rate': round(successful / (successful + failed) * 100, 2) if successful + failed else 0.0
+        },
+        'timeline': [
+            {
+                'bucket': key,
+                'successful': ok,
+                'failed': bad,
+                'success_rate': round(ok / (ok + bad) * 100, 2) if ok + bad else 0.0
+            }
+            for key, (ok, bad) in sorted(timeline.items())
+        ],
+        'failure_reasons': reasons.most_common(),
+        'retry_distribution': sorted(retries.items(), key=lambda item: (isinstance(item[0], str), item[0])),
+        'disconnect_windows': _disconnect_windows(events)
+    }
+
+
+def _disconnect_windows(events):
+    """Pair each disconnect with the next reconnect or success"""
+    windows = []
+    opened = None
+    
+    for stamp, connected in sorted(events):
+        if not connected and opened is None:
+            opened = stamp
+        elif connected and opened is not None:
+            seconds = (datetime.fromisoformat(stamp) - datetime.fromisoformat(opened)).total_seconds()
+            windows.append({'start': opened, 'end': stamp, 'seconds': int(seconds)})
+            opened = None
+    
+    if opened is not None:
+        windows.append({'start': opened, 'end': None, 'seconds': None})
+    
+    return windows
+
+
+def analyze_logs(paths, bucket='hour', since=None, until=None, workers=None):
+    """
+    Aggregate many log files, one worker process per file
+    
+    Args:
+        paths: Log file paths
+        bucket: Timeline resolution ('minute', 'hour' or 'day')
+        since: Optional 'YYYY-MM-DD HH:MM:SS' lower bound
+        until: Optional 'YYYY-MM-DD HH:MM:SS' upper bound
+        workers: Worker processes (default: CPU count; 1 runs inline)
+        
+    Returns:
+        dict: Report from merge_results
+    """
+    workers = min(workers or os.cpu_count() or 1, max(1, len(paths)))
+    
+    if workers == 1:
+        return merge_results(analyze_file(path, bucket, since, until) for path in paths)
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(analyze_file, path, bucket, since, until) for path in paths]
+        return merge_results(future.result() for future in futures)
@@ -23,6 +23,17 @@ class Logger:
             config: Configuration dictionary with logging settings
         """
         self.config = config
+        self.apply_config(config)
+    
+    def apply_config(self, config):
+        """
+        Load logging settings and (re)build handlers
+        Called at init and on live config reload
+        
+        Args:
+            config: Configuration dictionary
+        """
+        self.config = config
         self.log_dir = config['files']['log_dir']
         self.log_file = config['logging']['log_file']
         self.level = config['logging']['level']
@@ -46,7 +57,9 @@ class Logger:
         logger = logging.getLogger('PiCameraSystem')
         logger.setLevel(getattr(logging, self.level))
         
-        # Clear existing handlers
+        # Clear existing handlers (closing files left open by a previous setup)
+        for handler in logger.handlers:
+            handler.close()
         logger.handlers.clear()
         
         # File handler with rotation
@@ -0,0 +1,79 @@
+"""
+Luminance Module
+Cheap brightness measurements on JPEG frames (reduced-scale decode, no full image)
+"""
+
+import io
+
+from PIL import Image, ImageStat
+
+
+# Decode target; JPEG DCT scaling reaches it at 1/8 scale for most resolutions
+PROBE_SIZE = (160, 120)
+
+
+def decode_gray(frame, size=PROBE_SIZE):
+    """
+    Decode only the luma plane of a JPEG, scaled down in the DCT domain
+    
+    Args:
+        frame: JPEG bytes
+        size: Smallest size the decoder may scale down to
+        
+    Returns:
+        PIL.Image: 'L' image, or None if the frame can't be decoded
+    """
+    try:
+        image = Image.open(io.BytesIO(frame))
+        image.draft('L', size)
+        return image.convert('L')
+    except Exception:
+        return None
+
+
+def mean_luminance(frame, size=PROBE_SIZE):
+    """
+    Mean luma (0-255) of a JPEG frame
+    
+    Args:
+        frame: JPEG bytes
+        size: Smallest size the decoder may scale down to
+        
+    Returns:
+        float: Mean luminance, or None if the frame can't be decoded
+    """
+    image = decode_gray(frame, size)
+    if image is None:
+        return None
+    return ImageStat.Stat(image).mean[0]
+
+
+def frame_statistics(frame, size=PROBE_SIZE, dark_level=16, bright_level=240):
+    """
+    Luminance histogram statistics of a JPEG frame
+    The 256-bin histogram is built in C; everything else works on the bins
+    
+    Args:
+        frame: JPEG bytes
+        size: Smallest size the decoder may scale down to
+        dark_level: Luma at or below which a pixel counts as crushed black
+        bright_level: Luma at or above which a pixel counts as clipped white
+        
+    Returns:
+        dict: mean, stddev, dark_fraction, bright_fraction, or None if the
+              frame can't be decoded
+    """
+    image = decode_gray(frame, size)
+    if image is None:
+        return None
+    
+    histogram = image.histogram()
+    pixels = sum(histogram)
+    stat = ImageStat.Stat(histogram)
+    
+    return {
+        'mean': stat.mean[0],
+        'stddev': stat.stddev[0],
+        'dark_fraction': sum(histogram[:dark_level + 1]) / pixels,
+        'bright_fraction': sum(histogram[bright_level:]) / pixels
+    }
@@ -0,0 +1,320 @@
+"""
+Ring Store Module
+Preallocated memory-mapped circular frame log (storage engine for FileManager)
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections import namedtuple
+
+
+RingEntry = namedtuple('RingEntry', ['seq', 'timestamp', 'length', 'crc', 'name'])
+
+
+class RingStore:
+    """
+    Fixed-size file holding the last N frames in fixed-size slots
+    
+    Layout (all offsets page aligned):
+        header  magic, version, geometry
+        index   one 64-byte entry per slot: seq, timestamp, length, data crc,
+                name, entry crc
+        data    slots x slot_size bytes
+        
+    Append order makes a crash at any point leave either the old state or
+    the new frame: the slot's entry is cleared, the data written, then the
+    entry written last with its own checksum. A torn entry fails its
+    checksum and a frame whose pages never reached disk fails the data crc.
+    """
+    
+    MAGIC = b'PCRS'
+    VERSION = 1
+    
+    HEADER = struct.Struct('<4sHHII')
+    ENTRY = struct.Struct('<QdII36sI')
+    ENTRY_BODY = struct.Struct('<QdII36s')
+    NAME_SIZE = 36
+    
+    def __init__(self, path, slots, slot_size, sync=False, readonly=False):
+        """
+        Open (or create and preallocate) a ring store
+        
+        Args:
+            path: Ring file path
+            slots: Number of frames kept
+            slot_size: Maximum bytes per frame
+            sync: msync data and index on every append (survives power loss)
+            readonly: Open an existing ring for reading only (geometry from the file)
+            
+        Raises:
+            ValueError: If an existing file is not a ring or has different geometry
+        """
+        self.path = path
+        self.sync = sync
+        self.readonly = readonly
+        
+        exists = os.path.exists(path) and os.path.getsize(path) > 0
+        
+        if readonly:
+            self._file = open(path, 'rb')
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            slots, slot_size = self._read_header()
+        else:
+            if not exists:
+                self._create(path, slots, slot_size)
+            self._file = open(path, 'r+b')
+            self._map = mmap.mmap(self._file.fileno(), 0)
+            
+            stored = self._read_header()
+            if stored != (slots, slot_size):
+                self.close()
+                raise ValueError(
+                    f"Ring {path} has {stored[0]} slots x {stored[1]} bytes, config asks for "
+                    f"{slots} x {slot_size}; export and remove it to change geometry"
+                )
+        
+        self.slots = slots
+        self.slot_size = slot_size
+        self.index_offset = mmap.PAGESIZE
+        self.data_offset = self._align(self.index_offset + slots * self.ENTRY.size)
+        
+        # Recover the write position from the highest valid entry
+        self.head_seq = max((entry.seq for entry in self._scan()), default=0)
+    
+    @staticmethod
+    def _align(offset):
+        """Round up to the next page boundary"""
+        return -(-offset // mmap.PAGESIZE) * mmap.PAGESIZE
+    
+    @classmethod
+    def _create(cls, path, slots, slot_size):
+        """Create and preallocate a new ring file"""
+        data_offset = cls._align(mmap.PAGESIZE + slots * cls.ENTRY.size)
+        size = data_offset + slots * slot_size
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            # Reserve the blocks now so appends never allocate or hit ENOSPC
+            if hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(f.fileno(), 0, size)
+            else:
+                f.truncate(size)
+            
+            f.seek(0)
+            f.write(cls.HEADER.pack(cls.MAGIC, cls.VERSION, cls.ENTRY.size, slots, slot_size))
+            f.flush()
+            os.fsync(f.fileno())
+        
+        os.replace(temp_path, path)
+    
+    def _read_header(self):
+        """
+        Read and check the header
+        
+        Returns:
+            tuple: (slots, slot_size)
+        """
+        magic, version, entry_size, slots, slot_size = self.HEADER.unpack_from(self._map, 0)
+        
+        if magic != self.MAGIC or version != self.VERSION or entry_size != self.ENTRY.size:
+            self.close()
+            raise ValueError(f"{self.path} is not a version {self.VERSION} ring store")
+        
+        return slots, slot_size
+    
+    def _entry_offset(self, slot):
+        return self.index_offset + slot * self.ENTRY.size
+    
+    def _read_entry(self, slot):
+        """
+        Read one index entry
+        
+        Returns:
+            RingEntry: Entry, or None if empty or torn
+        """
+        seq, timestamp, length, crc, name, entry_crc = self.ENTRY.unpack_from(
+            self._map, self._entry_offset(slot)
+        )
+        
+        if seq == 0:
+            return None
+        
+        body = self._map[self._entry_offset(slot):self._entry_offset(slot) + self.ENTRY_BODY.size]
+        if zlib.crc32(body) != entry_crc:
+            return None
+        
+        return RingEntry(seq, timestamp, length, crc, name.rstrip(b'\0').decode('utf-8', 'replace'))
+    
+    def _scan(self):
+        """Yield every valid index entry (unordered)"""
+        for slot in range(self.slots):
+            entry = self._read_entry(slot)
+            if entry is not None:
+                yield entry
+    
+    def _flush(self, offset, length):
+        """msync a byte range (start rounded down to a page boundary)"""
+        start = offset - offset % mmap.PAGESIZE
+        self._map.flush(start, offset + length - start)
+    
+    def append(self, data, name='', timestamp=None):
+        """
+        Write a frame into the next slot, overwriting the oldest
+        
+        Args:
+            data: Frame bytes
+            name: Original filename (truncated to 36 bytes)
+            timestamp: Capture time (default: now)
+            
+        Returns:
+            int: Sequence number of the stored frame
+            
+        Raises:
+            ValueError: If the frame does not fit in a slot
+        """
+        if len(data) > self.slot_size:
+            raise ValueError(f"Frame of {len(data)} bytes exceeds slot size {self.slot_size}")
+        
+        seq = self.head_seq + 1
+        slot = seq % self.slots
+        entry_offset = self._entry_offset(slot)
+        data_offset = self.data_offset + slot * self.slot_size
+        
+        # 1. Invalidate the slot so a crash mid-write can't expose mixed data
+        self._map[entry_offset:entry_offset + self.ENTRY.size] = bytes(self.ENTRY.size)
+        
+        # 2. Frame data
+        self._map[data_offset:data_offset + len(data)] = data
+        if self.sync:
+            self._flush(data_offset, len(data))
+        
+        # 3. Entry last, self-checksummed
+        body = self.ENTRY_BODY.pack(
+            seq,
+            time.time() if timestamp is None else timestamp,
+            len(data),
+            zlib.crc32(data),
+            name.encode('utf-8')[:self.NAME_SIZE]
+        )
+        self._map[entry_offset:entry_offset + self.ENTRY.size] = body + struct.pack('<I', zlib.crc32(body))
+        if self.sync:
+            self._flush(entry_offset, self.ENTRY.size)
+        
+        self.head_seq = seq
+        return seq
+    
+    def get(self, seq):
+        """
+        Read one frame by sequence number
+        
+        Args:
+            seq: Sequence number
+            
+        Returns:
+            tuple: (RingEntry, bytes) or None if overwritten, missing or corrupt
+        """
+        slot = seq % self.slots
+        entry = self._read_entry(slot)
+        if entry is None or entry.seq != seq:
+            return None
+        
+        offset = self.data_offset + slot * self.slot_size
+        data = self._map[offset:offset + entry.length]
+        
+        # A concurrent writer may have reused the slot while we copied
+        if self._read_entry(slot) != entry or zlib.crc32(data) != entry.crc:
+            return None
+        
+        return entry, data
+    
+    def entries(self, start_time=None, end_time=None):
+        """
+        List stored frames, oldest first
+        
+        Args:
+            start_time: Only frames at or after this Unix time
+            end_time: Only frames at or before this Unix time
+            
+        Returns:
+            list: RingEntry tuples sorted by sequence number
+        """
+        result = [
+            entry for entry in self._scan()
+            if (start_time is None or entry.timestamp >= start_time)
+            and (end_time is None or entry.timestamp <= end_time)
+        ]
+        result.sort()
+        return result
+    
+    def latest(self):
+        """
+        Read the newest frame
+        
+        Returns:
+            tuple: (RingEntry, bytes) or None if empty
+        """
+        return self.get(self.head_seq) if self.head_seq else None
+    
+    def export(self, seq, output_dir):
+        """
+        Write a stored frame out as an ordinary file
+        
+        Args:
+            seq: Sequence number
+            output_dir: Destination directory
+            
+        Returns:
+            str: Written path, or None if the frame is gone
+        """
+        result = self.get(seq)
+        if result is None:
+            return None
+        
+        entry, data = result
+        path = os.path.join(output_dir, entry.name or f"frame_{entry.seq:010d}.jpg")
+        
+        # Several frames can share a second-resolution name
+        if os.path.exists(path):
+            stem, ext = os.path.splitext(path)
+            path = f"{stem}_{entry.seq}{ext}"
+        
+        with open(path, 'wb') as f:
+            f.write(data)
+        os.utime(path, (entry.timestamp, entry.timestamp))
+        return path
+    
+    def get_stats(self):
+        """
+        Get ring statistics
+        
+        Returns:
+            dict: Geometry, stored frame count and sizes
+        """
+        entries = list(self._scan())
+        return {
+            'slots': self.slots,
+            'slot_size': self.slot_size,
+            'frames': len(entries),
+            'head_seq': self.head_seq,
+            'stored_bytes': sum(entry.length for entry in entries),
+            'file_bytes': len(self._map)
+        }
+    
+    def close(self):
+        """Flush and release the mapping"""
+        if getattr(self, '_map', None) is not None:
+            if not self.readonly:
+                self._map.flush()
+            self._map.close()
+            self._map = None
+        
+        if getattr(self, '_file', None) is not None:
+            self._file.close()
+            self._file = None